@@ -4,13 +4,16 @@ import logging
 import logging.config
 import os
 
-from .log_config import logging_dict_config
+from .log_config import logging_dict_config, queue_handlers
 
 logging.config.dictConfig(logging_dict_config)
 
 log = logging.getLogger("api_logger")
+queue_handlers(log)
 log.debug("Logging is configured.")
 
 PRODUCTION = os.environ.get("PRODUCTION", False)
 LIVE_MODEL = os.environ.get("LIVE_MODEL", False)
 log.debug("Using Live Model" if LIVE_MODEL else "Using Pre-Set Data")
+LAZY_STARTUP = os.environ.get("LAZY_STARTUP", False)
+log.debug("Deferring resources until first use" if LAZY_STARTUP else "Eager startup")
@@ -1,9 +1,16 @@
 """Sets up the server for the Dash app."""
 
+import time
+from uuid import uuid4
+
 import dash  # type: ignore
 from dash import Dash, Input, Output, State, callback, dcc, html  # type: ignore
+from flask import Response, abort, request
+
+from . import export, log, metrics, svg
+from .scheduler import renders_figures
 
-from . import log
+RENDER_TIMEOUT = 5.0  # seconds to wait for figures before moving on regardless
 
 app = Dash(__package__, use_pages=True, update_title=None)
 
@@ -15,6 +22,8 @@ app.layout = html.Div(
     children=[
         dash.page_container,
         dcc.Store(id="figure_interval", data=0),
+        dcc.Store(id="rendered_interval", data=None),
+        dcc.Store(id="sync_state", data=None),
         dcc.Interval(id="sync_interval", interval=100),
     ],
 )
@@ -23,34 +32,123 @@ server = app.server
 log.info("Gridlington Visualisation System is running...")
 
 
+@server.after_request
+def record_response_size(response: Response) -> Response:
+    """Records the size of the responses to Dash callbacks.
+
+    Args:
+        response (Response): The response to a request
+
+    Returns:
+        Response: The unchanged response
+    """
+    if request.path.endswith("/_dash-update-component") and not response.is_streamed:
+        body = request.get_json(silent=True) or {}
+        metrics.RESPONSE_SIZE.observe(
+            len(response.get_data()), output=str(body.get("output", ""))
+        )
+    return response
+
+
+@server.route("/metrics")
+def metrics_endpoint() -> Response:
+    """Serves the metrics in the Prometheus text exposition format.
+
+    Returns:
+        Response: The metrics as plain text
+    """
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@server.route("/export/<source>")
+def export_endpoint(source: str) -> Response:
+    """Streams the OPAL, WESIM or DSR data held by the app as a file download.
+
+    Args:
+        source (str): Name of the data source
+
+    Returns:
+        Response: The data as CSV or Parquet, streamed in chunks
+    """
+    return export.export(source, request.args)
+
+
+@server.route(f"{svg.SVG_ROUTE}<name>")
+def svg_endpoint(name: str) -> Response:
+    """Serves a published SVG, to be cached by the browser for good.
+
+    Args:
+        name (str): File name of the SVG, named by the hash of its content
+
+    Returns:
+        Response: The SVG
+    """
+    published = svg.published(name)
+    if published is None:
+        abort(404)
+    return Response(
+        published.raw,
+        mimetype="image/svg+xml",
+        headers={"Cache-Control": svg.CACHE_CONTROL},
+    )
+
+
 @callback(
-    [Output("figure_interval", "data")],
+    [Output("figure_interval", "data"), Output("sync_state", "data")],
     [Input("sync_interval", "n_intervals")],
-    [State("figure_interval", "data")],
+    [
+        State("figure_interval", "data"),
+        State("rendered_interval", "data"),
+        State("sync_state", "data"),
+        State("_pages_location", "pathname"),
+    ],
 )
 def update_figure_interval(
     n_intervals_sync: int,
     n_intervals_figures: int,
-) -> tuple[int]:
+    n_intervals_rendered: int | None,
+    sync_state: dict[str, str | float] | None,
+    pathname: str | None,
+) -> tuple[int, dict[str, str | float]]:
     """Callback to synchronise figure_interval with data_interval.
 
     This pulls in N_INTERVALS_DATA (number of times the data has updated) from
-        the data module and increments figure_interval accordingly.
+        the data module and moves figure_interval straight to it, skipping any
+        updates in between. On pages with figures it waits until the figures of
+        the current figure_interval have been rendered, or RENDER_TIMEOUT has
+        passed, so that a client that renders slower than the data updates only
+        renders the latest data rather than falling behind. The skipped updates
+        are counted as dropped frames of the client.
 
     Args:
         n_intervals_sync (int): Number of times this callback has run
         n_intervals_figures (int): Number of times the figures have updated
+        n_intervals_rendered (int, optional): The figure_interval last rendered
+        sync_state (dict, optional): Id of the client and time figure_interval
+            last changed
+        pathname (str, optional): Path of the page shown by the client
 
     Returns:
-        N_INTERVALS_DATA (int): Number of times the data has updated
+        tuple[int, dict]: N_INTERVALS_DATA (number of times the data has updated)
+            and the new sync state
     """
     from .data import N_INTERVALS_DATA
 
-    return (
-        dash.no_update
-        if n_intervals_figures == N_INTERVALS_DATA
-        else (N_INTERVALS_DATA,)
-    )
+    if n_intervals_figures == N_INTERVALS_DATA:
+        return dash.no_update
+    first = sync_state is None
+    sync_state = sync_state or {"client": uuid4().hex[:8], "time": 0.0}
+    if (
+        n_intervals_rendered != n_intervals_figures
+        and time.time() - float(sync_state["time"]) < RENDER_TIMEOUT
+        and renders_figures(pathname)
+    ):
+        return dash.no_update
+
+    dropped = N_INTERVALS_DATA - n_intervals_figures - 1
+    if dropped > 0 and not first:
+        metrics.DROPPED_FRAMES.inc(dropped, client=str(sync_state["client"]))
+    return N_INTERVALS_DATA, {**sync_state, "time": time.time()}
 
 
 if __name__ == "__main__":
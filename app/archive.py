@@ -0,0 +1,272 @@
+"""Append-only on-disk archive of the live OPAL data.
+
+Each run of the live model is archived to its own directory under ARCHIVE_DIR
+when the ARCHIVE environment variable is set. The data is stored by column, one
+raw binary file per column, so that every tick appends the new rows to the end
+of each file and a reader can memory-map any column. The directory holds:
+
+- meta.json: the column names and dtypes, the number of complete rows and the
+  number of rows per chunk of the index.
+- <position>.bin: the values of each column, in the column order of meta.json.
+- index.bin: the time of the first row of each chunk of CHUNK_ROWS rows, so
+  that the row of a time is found by searching the index and then one chunk.
+
+The rows are written by a background thread fed from a queue, so archiving a
+tick costs the data callback no more than putting the frame on the queue.
+
+An archived run is replayed in place of the pre-set data by pointing the
+REPLAY_RUN environment variable at its directory. The run is memory-mapped rather
+than loaded, so the snapshot at any timestep is available straight away.
+
+An archived run pointed at by REFERENCE_RUN is overlaid on the time series
+figures. It is mapped once per process and shared by every client and page.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import log
+
+ARCHIVE = os.environ.get("ARCHIVE", False)
+ARCHIVE_DIR = Path(os.environ.get("ARCHIVE_DIR", "data/archive"))
+CHUNK_ROWS = 1024  # rows per entry of the time index
+REPLAY_RUN = os.environ.get("REPLAY_RUN")
+REFERENCE_RUN = os.environ.get("REFERENCE_RUN")
+
+INDEX_FILE = "index.bin"
+META_FILE = "meta.json"
+
+
+class ArchiveWriter:
+    """Appends the new rows of each OPAL frame to an archive directory."""
+
+    def __init__(self, directory: Path, chunk_rows: int = CHUNK_ROWS) -> None:
+        """Initialise the writer and start its thread.
+
+        Args:
+            directory (Path): Directory of the archive, created on the first write.
+            chunk_rows (int, optional): Rows per entry of the time index. Defaults
+                to CHUNK_ROWS.
+        """
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self.columns: list[str] = []
+        self.dtypes: list[np.dtype] = []  # type: ignore[type-arg]
+        self._queue: queue.SimpleQueue[pd.DataFrame | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="archive", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def append(self, df: pd.DataFrame) -> None:
+        """Queue a frame to have its rows beyond those already archived written.
+
+        Args:
+            df (pd.DataFrame): OPAL data of the run so far. It must not be
+                modified afterwards.
+        """
+        self._queue.put(df)
+
+    def close(self) -> None:
+        """Write the queued frames and stop the thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        """Write the queued frames until the writer is closed."""
+        while (df := self._queue.get()) is not None:
+            try:
+                self.write(df)
+            except (OSError, ValueError) as err:
+                log.error(f"Failed to archive OPAL data: {err}")
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Append the rows of a frame beyond those already archived.
+
+        Args:
+            df (pd.DataFrame): OPAL data of the run so far.
+
+        Raises:
+            ValueError: If the columns differ from those already archived.
+        """
+        new = df.iloc[self.rows :]
+        if new.empty:
+            return
+        if not self.columns:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.columns = [str(column) for column in df.columns]
+            self.dtypes = [np.dtype(dtype) for dtype in df.dtypes]
+        elif list(df.columns) != self.columns:
+            raise ValueError("The OPAL columns differ from those archived")
+
+        for position, (column, dtype) in enumerate(zip(self.columns, self.dtypes)):
+            with open(self.directory / f"{position}.bin", "ab") as f:
+                new[column].to_numpy(dtype=dtype).tofile(f)
+
+        first = -(-self.rows // self.chunk_rows) * self.chunk_rows
+        starts = range(first - self.rows, len(new), self.chunk_rows)
+        if starts:
+            with open(self.directory / INDEX_FILE, "ab") as f:
+                new["Time"].to_numpy(dtype="datetime64[ns]")[starts].tofile(f)
+
+        self.rows += len(new)
+        self._write_meta()
+
+    def _write_meta(self) -> None:
+        """Replace the metadata, which marks the rows written so far as complete."""
+        meta = {
+            "columns": self.columns,
+            "dtypes": [dtype.str for dtype in self.dtypes],
+            "rows": self.rows,
+            "chunk_rows": self.chunk_rows,
+        }
+        path = self.directory / META_FILE
+        path.with_suffix(".tmp").write_text(json.dumps(meta))
+        path.with_suffix(".tmp").replace(path)
+
+
+_writer: ArchiveWriter | None = None
+_rows = 0  # rows of the last archived frame
+
+
+def archive(df: pd.DataFrame) -> None:
+    """Archive the live OPAL data.
+
+    A new run is started on the first call and whenever the data has fewer rows
+    than before, i.e. when the model has been restarted.
+
+    Args:
+        df (pd.DataFrame): OPAL data of the run so far.
+    """
+    global _writer, _rows
+
+    if _writer is None or len(df) < _rows:
+        if _writer is not None:
+            _writer.close()
+        run = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        _writer = ArchiveWriter(ARCHIVE_DIR / run)
+        log.info(f"Archiving OPAL data to {_writer.directory}")
+    _rows = len(df)
+    _writer.append(df)
+
+
+class ArchiveReader:
+    """Memory-mapped view of an archived run."""
+
+    def __init__(self, directory: Path) -> None:
+        """Map the complete rows of an archive.
+
+        Args:
+            directory (Path): Directory of the archive.
+
+        Raises:
+            ValueError: If the archive has no rows.
+        """
+        meta = json.loads((directory / META_FILE).read_text())
+        self.directory = directory
+        self.columns: list[str] = meta["columns"]
+        self.rows: int = meta["rows"]
+        self.chunk_rows: int = meta["chunk_rows"]
+        if not self.rows:
+            raise ValueError(f"The archive {directory} has no rows")
+
+        self._values = [
+            np.memmap(
+                directory / f"{position}.bin", dtype=dtype, mode="r", shape=self.rows
+            )
+            for position, dtype in enumerate(meta["dtypes"])
+        ]
+        chunks = -(-self.rows // self.chunk_rows)
+        self._index = np.fromfile(directory / INDEX_FILE, dtype="datetime64[ns]")
+        self._index = self._index[:chunks]
+        self.start = pd.Timestamp(self._index[0])
+
+    def snapshot(self, n: int) -> pd.DataFrame:
+        """Get the data of the run up to a timestep without reading it.
+
+        Args:
+            n (int): Number of rows.
+
+        Returns:
+            pd.DataFrame: The first n rows, backed by the mapped files.
+        """
+        return pd.DataFrame(
+            {column: values[:n] for column, values in zip(self.columns, self._values)},
+            copy=False,
+        )
+
+    def row(self, time: pd.Timestamp) -> int:
+        """Find the last row at or before a time.
+
+        Args:
+            time (pd.Timestamp): The time.
+
+        Returns:
+            int: Position of the row, or -1 if the time is before the run.
+        """
+        target = np.datetime64(time, "ns")
+        chunk = max(int(np.searchsorted(self._index, target, side="right")) - 1, 0)
+        start = chunk * self.chunk_rows
+        times = self._values[self.columns.index("Time")][
+            start : start + self.chunk_rows
+        ]
+        return start + int(np.searchsorted(times, target, side="right")) - 1
+
+
+@cache
+def replay_reader() -> ArchiveReader:
+    """Get the reader of the replayed run, which is only opened once.
+
+    Returns:
+        ArchiveReader: The run at REPLAY_RUN.
+    """
+    reader = ArchiveReader(Path(str(REPLAY_RUN)))
+    log.info(f"Replaying {reader.rows} rows of OPAL data from {REPLAY_RUN}")
+    return reader
+
+
+@cache
+def reference_reader() -> ArchiveReader:
+    """Get the reader of the reference run, which is only opened once.
+
+    Returns:
+        ArchiveReader: The run at REFERENCE_RUN.
+    """
+    reader = ArchiveReader(Path(str(REFERENCE_RUN)))
+    log.info(f"Comparing with {reader.rows} rows of OPAL data from {REFERENCE_RUN}")
+    return reader
+
+
+def reference(df: pd.DataFrame) -> pd.DataFrame | None:
+    """Get the reference run up to the same point as some OPAL data.
+
+    The runs are aligned on the time since their start, and the times of the
+    reference run are shifted onto those of the data.
+
+    Args:
+        df (pd.DataFrame): OPAL data.
+
+    Returns:
+        pd.DataFrame | None: The rows of the reference run up to the time elapsed
+            in the data, or None if there is no reference run or no data.
+    """
+    if not REFERENCE_RUN or "Time" not in df.columns or df.empty:
+        return None
+
+    reader = reference_reader()
+    offset = df["Time"].iloc[0] - reader.start
+    rows = reader.row(df["Time"].iloc[-1] - offset) + 1
+    if not rows:
+        return None
+    ref = reader.snapshot(rows)
+    return ref.assign(Time=ref["Time"] + offset) if offset else ref
@@ -3,6 +3,7 @@
 import json
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 
@@ -14,6 +15,15 @@ Constants for API URLs.
 API_URL = os.environ.get("API_URL", "http://127.0.0.1:8080")
 PLOT_URL = os.environ.get("PLOT_URL", "http://127.0.0.1:8050")
 
+"""
+Overall deadline (seconds) for OVE to become ready when bootstrapping.
+"""
+OVE_TIMEOUT = float(os.environ.get("OVE_TIMEOUT", 300))
+
+
+class OVETimeoutError(requests.exceptions.ConnectionError):
+    """Exception for when OVE is not ready before the bootstrap deadline."""
+
 
 def html(page: str) -> dict[str, str | dict[str, str | dict[str, str]]]:
     """App specification for a html app.
@@ -46,22 +56,78 @@ INIT_SECTIONS = {
 }
 
 
-def wait_for_ove() -> None:
-    """Function to wait for the OVE Core API to be available after startup."""
+def wait_for_ove(
+    timeout: float | None = None,
+    initial_delay: float = 0.5,
+    max_delay: float = 8.0,
+) -> None:
+    """Function to wait for the OVE Core API to be available after startup.
+
+    Polls the html app with an exponential backoff between attempts.
+
+    Args:
+        timeout (float, optional): Overall deadline in seconds. Defaults to None,
+            which waits indefinitely.
+        initial_delay (float, optional): Delay before the first retry in seconds.
+            Defaults to 0.5.
+        max_delay (float, optional): Upper bound on the delay between retries in
+            seconds. Defaults to 8.
+
+    Raises:
+        OVETimeoutError: Raised if OVE is not ready before the deadline.
+    """
     log.info("Waiting for OVE Core and Apps to be ready...")
-    while requests.get(f"{API_URL}/app/html").status_code != requests.codes.OK:
-        time.sleep(5)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    delay = initial_delay
+    while True:
+        try:
+            response = requests.get(f"{API_URL}/app/html", timeout=max_delay)
+            if response.status_code == requests.codes.OK:
+                return
+        except requests.exceptions.RequestException:
+            pass
+
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise OVETimeoutError(f"OVE was not ready within {timeout} seconds")
+            delay = min(delay, remaining)
+        time.sleep(delay)
+        delay = min(delay * 2, max_delay)
+
+
+def create_section(name: str, spaces: dict[str, list[dict[str, int]]]) -> None:
+    """Function for creating a single initial section.
 
+    Args:
+        name (str): Name of the section in INIT_SECTIONS.
+        spaces (dict): Space geometries returned by the OVE Core API.
+    """
+    section = INIT_SECTIONS[name]
+    space = str(section["space"])
+    data = spaces[space][0] | section
+    response = requests.post(f"{API_URL}/section", json=data)
+    log.info(f"Created section in space '{space}' with: {response.text}")
+
+
+def create_all(timeout: float | None = None) -> None:
+    """Function for creating all initial sections.
 
-def create_all() -> None:
-    """Function for creating all initial sections."""
-    wait_for_ove()
+    The sections are created concurrently once OVE is ready.
+
+    Args:
+        timeout (float, optional): Overall deadline in seconds for OVE to become
+            ready. Defaults to None, which waits indefinitely.
+    """
+    wait_for_ove(timeout)
     log.info("Creating OVE Sections...")
     spaces = requests.get(f"{API_URL}/spaces").json()
-    for section in INIT_SECTIONS.values():
-        data = spaces[section["space"]][0] | section
-        response = requests.post(f"{API_URL}/section", json=data)
-        log.info(f"Created section in space '{section['space']}' with: {response.text}")
+    with ThreadPoolExecutor(max_workers=len(INIT_SECTIONS)) as executor:
+        futures = [
+            executor.submit(create_section, name, spaces) for name in INIT_SECTIONS
+        ]
+    for future in futures:
+        future.result()
 
 
 def assign_sections(new_sections: dict[str, str]) -> str:
@@ -164,4 +230,8 @@ def delete_all() -> None:
 
 
 if __name__ == "__main__":
-    create_all()
+    try:
+        create_all(timeout=OVE_TIMEOUT)
+    except OVETimeoutError as err:
+        log.error(str(err))
+        raise SystemExit(1)
@@ -1,65 +1,196 @@
 """Calls the Datahub to update data."""
 
+import time
+from functools import cache
+from typing import Literal
+
+import numpy as np
 import pandas as pd
 from dash import Input, Output, callback, dcc  # type: ignore
 from dash.exceptions import PreventUpdate  # type: ignore
 
-from . import LIVE_MODEL, PRODUCTION, log
+from . import LAZY_STARTUP, LIVE_MODEL, PRODUCTION, archive, log, profiling, scheduler
 from .datahub_api import get_opal_data, get_wesim_data  # , get_dsr_data
+from .derived import DERIVED_COLUMNS
+from .metrics import CALLBACK_DURATION
+from .playback import PLAYBACK
 
-N_INTERVALS_DATA = 0
+N_INTERVALS_DATA = 0  # number of data updates
+TICK_TIME: float | None = None  # wall clock time of the last data update
 
 DF_OPAL = pd.DataFrame({"Col": [0]})
+DF_DSR = pd.DataFrame({"Col": [0]})  # TODO: replace with DSR data when available
 
+OPAL_START_DATE = "2035-01-22 04:00"  # corresponding to minute 0
 WESIM_START_DATE = "2035-01-22 00:00"  # corresponding to hour 0 TODO: check
 
-if PRODUCTION:
-    WESIM = {key: pd.DataFrame(**item) for key, item in get_wesim_data().items()}
-    for df in WESIM.values():
+COUNT_PREFIXES = ("Household Activity", "Ev Status")  # columns counting agents
+
+
+def parse_time(
+    time: "pd.Series[float] | pd.Series[str]",
+    start: str,
+    unit: Literal["m", "h"] = "m",
+) -> "pd.Series[pd.Timestamp]":
+    """Convert a time column to datetimes.
+
+    Args:
+        time (pd.Series): Offsets from the start in the given unit, or dates.
+        start (str): Date at offset zero.
+        unit (str, optional): Unit of the offsets. Defaults to "m" (minutes).
+
+    Returns:
+        pd.Series: The times as datetime64.
+
+    >>> parse_time(pd.Series([0, 90]), OPAL_START_DATE).dt.strftime("%H:%M").tolist()
+    ['04:00', '05:30']
+    """
+    if pd.api.types.is_numeric_dtype(time):
+        return pd.Timestamp(start) + pd.to_timedelta(time, unit=unit)
+    return pd.to_datetime(time)
+
+
+def opal_dtypes(df: pd.DataFrame) -> dict[str, str]:
+    """Compact dtype of each numeric OPAL column.
+
+    Agent counts are stored as unsigned integers of the smallest width that holds
+    them, and measurements as float32, which keeps about 7 significant digits,
+    i.e. better than 0.01 MW below 100 GW and 1e-5 Hz for the frequency. Counts
+    with missing values are stored as float32.
+
+    Args:
+        df (pd.DataFrame): OPAL data.
+
+    Returns:
+        dict[str, str]: Dtype of each column other than the time.
+
+    >>> opal_dtypes(pd.DataFrame({"Ev Status (Idle)": [7e4], "Pv Generation": [1.5]}))
+    {'Ev Status (Idle)': 'uint32', 'Pv Generation': 'float32'}
+    """
+    dtypes = {}
+    for column in df.columns.drop("Time", errors="ignore"):
+        values = df[column]
+        if not pd.api.types.is_numeric_dtype(values):
+            continue
+        if str(column).startswith(COUNT_PREFIXES) and not values.isna().any():
+            fits = values.max() <= np.iinfo(np.uint16).max
+            dtypes[column] = "uint16" if fits else "uint32"
+        else:
+            dtypes[column] = "float32"
+    return dtypes
+
+
+def compact_opal(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert OPAL data to the compact dtypes of opal_dtypes.
+
+    Args:
+        df (pd.DataFrame): OPAL data.
+
+    Returns:
+        pd.DataFrame: The data with compact dtypes.
+    """
+    return df.astype(opal_dtypes(df))
+
+
+@cache
+def load_wesim() -> dict[str, pd.DataFrame]:
+    """Function to get the WESIM data, which is only requested once.
+
+    Returns:
+        dict[str, pd.DataFrame]: WESIM data from the DataHub in production,
+            otherwise a placeholder.
+    """
+    if not PRODUCTION:
+        return {"df": pd.DataFrame({"Col": [0]})}
+
+    wesim = {key: pd.DataFrame(**item) for key, item in get_wesim_data().items()}
+    for df in wesim.values():
         if "Hour" in df.columns:
-            df["Time"] = (
-                pd.Timestamp(WESIM_START_DATE) + pd.to_timedelta(df["Hour"], unit="h")
-            ).astype(str)
-else:
-    WESIM = {"df": pd.DataFrame({"Col": [0]})}
+            df["Time"] = parse_time(df["Hour"], WESIM_START_DATE, unit="h")
+    return wesim
+
+
+def __getattr__(name: str) -> dict[str, pd.DataFrame]:
+    """Load WESIM on first access when startup is lazy."""
+    if name == "WESIM":
+        return load_wesim()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if not LAZY_STARTUP:
+    WESIM = load_wesim()
 
 data_interval = dcc.Interval(id="data_interval")
 
 
+def data_rows() -> int:
+    """Get the number of timesteps of the replayed or pre-set data.
+
+    Returns:
+        int: Number of rows that update_data steps through.
+    """
+    if archive.REPLAY_RUN:
+        return archive.replay_reader().rows
+
+    from .pre_set_data import OPAL_DATA
+
+    return len(OPAL_DATA)
+
+
 @callback(
     [Output("data_interval", "disabled")],
     [Input("data_interval", "n_intervals")],
 )
+@profiling.profiled("update_data")
 def update_data(n_intervals: int) -> tuple[bool,]:
     """Function to update OPAL data.
 
+    The pre-set and replayed data are shown up to the row of the playback.
+
     Args:
-        n_intervals (int): The number of times the data has updated.
-            indexes by 1 every interval.
+        n_intervals (int): The number of times the data interval has fired.
 
     Returns:
         tuple[bool,]: Boolean that specifies whether the iterator should
             terminate
 
     """
-    global DF_OPAL, N_INTERVALS_DATA
+    global DF_OPAL, N_INTERVALS_DATA, TICK_TIME
 
     if n_intervals is None:
         raise PreventUpdate
 
     data_ended = False
-    if LIVE_MODEL:
-        log.debug("Updating data from live model")
-        data_opal = get_opal_data()
-        DF_OPAL = pd.DataFrame(**data_opal)  # type: ignore[call-overload]
-    else:
-        from .pre_set_data import OPAL_DATA
-
-        log.debug("Updating pre-set data")
-        DF_OPAL = OPAL_DATA.loc[:n_intervals]
-        if n_intervals == len(OPAL_DATA):
-            log.debug("Reached end of pre-set data")
-            data_ended = True
-
-    N_INTERVALS_DATA = n_intervals
+    with CALLBACK_DURATION.time(callback="update_data"):
+        if LIVE_MODEL:
+            log.debug("Updating data from live model")
+            data_opal = get_opal_data()
+            DF_OPAL = pd.DataFrame(**data_opal)  # type: ignore[call-overload]
+            DF_OPAL["Time"] = parse_time(DF_OPAL["Time"], OPAL_START_DATE)
+            DF_OPAL = compact_opal(DF_OPAL)
+            if archive.ARCHIVE:
+                archive.archive(DF_OPAL)
+        elif archive.REPLAY_RUN:
+            log.debug("Updating replayed data")
+            reader = archive.replay_reader()
+            row = PLAYBACK.advance(reader.rows)
+            DF_OPAL = reader.snapshot(row + 1)
+            if row + 1 >= reader.rows:
+                log.debug("Reached end of replayed data")
+                data_ended = True
+        else:
+            from .pre_set_data import OPAL_DATA
+
+            log.debug("Updating pre-set data")
+            row = PLAYBACK.advance(len(OPAL_DATA))
+            DF_OPAL = OPAL_DATA.iloc[: row + 1]
+            if row + 1 >= len(OPAL_DATA):
+                log.debug("Reached end of pre-set data")
+                data_ended = True
+
+        DF_OPAL = DERIVED_COLUMNS.extend(DF_OPAL)
+        scheduler.prerender()
+
+    N_INTERVALS_DATA += 1
+    TICK_TIME = time.time()
     return (data_ended,)
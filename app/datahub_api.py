@@ -5,6 +5,7 @@ import os
 import requests
 
 from . import log
+from .metrics import DATAHUB_DURATION
 
 """
 Constant for API URLs.
@@ -39,7 +40,8 @@ def request_datahub(
     """
     try:
         log.info(f"Requesting {data_source.upper()} data from the DataHub")
-        req = requests.get(f"{DH_URL}/{data_source}", params=payload)
+        with DATAHUB_DURATION.time(source=data_source):
+            req = requests.get(f"{DH_URL}/{data_source}", params=payload)
     except requests.exceptions.ConnectionError as err:
         raise DataHubConnectionError(err)
 
@@ -0,0 +1,184 @@
+"""Derived OPAL columns computed once per tick.
+
+Each derived column is computed only for the rows that have arrived since the
+last tick and is stored next to the raw columns of the OPAL data, so that the
+figures read it like any other column. Figures given data without the derived
+columns, e.g. a reference run, compute them with `column`.
+
+The 15 minute rolling mean, minimum and maximum of the total generation and
+demand are derived columns too. They are updated by streaming windows in O(1)
+per row rather than by rolling over the whole history.
+"""
+
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+from .rolling import RollingWindow
+
+ROLLING_WINDOW = np.timedelta64(15, "m")
+ROLLING_COLUMNS = ["Total Generation", "Total Demand"]
+STATISTICS = ("mean", "min", "max")
+
+DERIVED: dict[str, Callable[[pd.DataFrame], "pd.Series[float]"]] = {
+    "Energy Deficit": lambda df: (
+        df["Exp. Offshore Wind Generation"] - df["Real Offshore Wind Generation"]
+    ),
+    "Ev Demand Delta": lambda df: (
+        df["Real Ev Charging Power"] - df["Expected Ev Charging Power"]
+    ),
+    "Agent Demand Delta": lambda df: (
+        df["Real Gridlington Demand"]
+        - df["Expected Gridlington Demand"]
+        + df["Real Ev Charging Power"]
+        - df["Expected Ev Charging Power"]
+    ),
+}
+
+
+def rolling_name(column: str, statistic: str) -> str:
+    """Get the name of a rolling aggregate of a column.
+
+    Args:
+        column (str): Name of the aggregated column.
+        statistic (str): One of STATISTICS.
+
+    Returns:
+        str: Name of the derived column.
+
+    >>> rolling_name("Total Demand", "mean")
+    'Total Demand (15 min mean)'
+    """
+    minutes = ROLLING_WINDOW.astype("timedelta64[m]").astype(int)
+    return f"{column} ({minutes} min {statistic})"
+
+
+def rolling(
+    column: str, statistic: str
+) -> Callable[[pd.DataFrame], "pd.Series[float]"]:
+    """Rolling aggregate of a column over the whole data, computed by pandas.
+
+    Args:
+        column (str): Name of the aggregated column.
+        statistic (str): One of STATISTICS.
+
+    Returns:
+        Callable: Function computing the aggregate from OPAL data.
+    """
+
+    def func(df: pd.DataFrame) -> "pd.Series[float]":
+        values = pd.Series(df[column].to_numpy(), index=df["Time"].to_numpy())
+        window = values.rolling(pd.Timedelta(ROLLING_WINDOW))
+        return pd.Series(getattr(window, statistic)().to_numpy(), index=df.index)
+
+    return func
+
+
+ROLLING = {
+    rolling_name(column, statistic): rolling(column, statistic)
+    for column in ROLLING_COLUMNS
+    for statistic in STATISTICS
+}
+
+
+def column(df: pd.DataFrame, name: str) -> "pd.Series[float]":
+    """Get a derived column, computing it if the data does not include it.
+
+    Args:
+        df (pd.DataFrame): OPAL data.
+        name (str): Name of the derived column.
+
+    Returns:
+        pd.Series: The derived values.
+    """
+    if name in df.columns:
+        return df[name]
+    return (DERIVED | ROLLING)[name](df)
+
+
+def frame(df: pd.DataFrame, names: list[str]) -> pd.DataFrame:
+    """Get derived columns as a frame, computing those the data does not include.
+
+    Args:
+        df (pd.DataFrame): OPAL data.
+        names (list[str]): Names of the derived columns.
+
+    Returns:
+        pd.DataFrame: The derived values, with the index of the data.
+    """
+    return pd.DataFrame({name: column(df, name) for name in names}, copy=False)
+
+
+class DerivedColumns:
+    """Derived columns of the OPAL data, extended by the rows of each tick."""
+
+    def __init__(self) -> None:
+        """Initialise without any rows."""
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop the computed rows.
+
+        New buffers are allocated, as frames from earlier ticks may still be in
+        use by the figures.
+        """
+        self.rows = 0
+        self._values: dict[str, NDArray[np.float32]] = {
+            name: np.empty(0, dtype=np.float32) for name in DERIVED | ROLLING
+        }
+        self._windows = {
+            column: RollingWindow(ROLLING_WINDOW) for column in ROLLING_COLUMNS
+        }
+
+    def extend(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Add the derived columns to the OPAL data.
+
+        The rows already computed are reused, so the data must extend the data of
+        the previous call. Data with fewer rows, e.g. after a restart or a seek
+        back, is computed again from the start.
+
+        Args:
+            df (pd.DataFrame): OPAL data.
+
+        Returns:
+            pd.DataFrame: The data with the derived columns, sharing the memory of
+                the raw columns. Data without the inputs is returned unchanged.
+        """
+        if len(df) < self.rows:
+            self.reset()
+        rows = df.iloc[self.rows :]
+        try:
+            new = {
+                name: func(rows).to_numpy(dtype=np.float32)
+                for name, func in DERIVED.items()
+            }
+            times = df["Time"].to_numpy()[self.rows :]
+            inputs = {c: df[c].to_numpy()[self.rows :] for c in ROLLING_COLUMNS}
+        except KeyError:
+            return df
+
+        for column, values in inputs.items():
+            window = self._windows[column]
+            stats = np.array(
+                [window.push(t, float(v)) for t, v in zip(times, values)],
+                dtype=np.float32,
+            ).reshape(-1, len(STATISTICS))
+            for i, statistic in enumerate(STATISTICS):
+                new[rolling_name(column, statistic)] = stats[:, i]
+
+        for name, values in new.items():
+            buffer = self._values[name]
+            if len(df) > len(buffer):  # grow the buffer geometrically
+                buffer = np.resize(buffer, max(len(df), 2 * len(buffer)))
+                self._values[name] = buffer
+            buffer[self.rows : len(df)] = values
+        self.rows = len(df)
+
+        columns = {name: df[name].to_numpy() for name in df.columns}
+        derived = {name: values[: self.rows] for name, values in self._values.items()}
+        return pd.DataFrame(columns | derived, index=df.index, copy=False)
+
+
+DERIVED_COLUMNS = DerivedColumns()
@@ -0,0 +1,223 @@
+"""Streams the data held by the app as CSV or Parquet.
+
+The export of a frame is written and sent in chunks of EXPORT_CHUNK_ROWS rows,
+so no more than one chunk of the export is held in memory at a time. Columns and
+a time range are selected without copying the frame, which makes it safe to
+export the OPAL data during a live run, or an archived run larger than memory.
+"""
+
+import io
+import re
+from collections.abc import Iterator, Mapping
+from importlib.util import find_spec
+
+import numpy as np
+import pandas as pd
+from flask import Response, abort
+
+from .archive import ARCHIVE_DIR, ArchiveReader
+
+EXPORT_CHUNK_ROWS = 10_000
+MIMETYPES = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+def select(
+    df: pd.DataFrame,
+    columns: list[str] | None = None,
+    start: str | None = None,
+    end: str | None = None,
+) -> pd.DataFrame:
+    """Select columns and a time range of a frame without copying its data.
+
+    Args:
+        df (pd.DataFrame): The frame, sorted by its Time column.
+        columns (list[str], optional): Columns to keep. Defaults to all.
+        start (str, optional): Earliest time to keep. Defaults to the first.
+        end (str, optional): Latest time to keep. Defaults to the last.
+
+    Raises:
+        ValueError: If a column is missing or a time range is given for data
+            without times.
+
+    Returns:
+        pd.DataFrame: The selection, sharing the memory of the frame.
+    """
+    if start or end:
+        if "Time" not in df.columns:
+            raise ValueError("The data has no Time column to select a range of")
+        times = df["Time"].to_numpy()
+        first, last = 0, len(df)
+        if start:
+            first = int(np.searchsorted(times, pd.Timestamp(start).to_datetime64()))
+        if end:
+            stop = pd.Timestamp(end).to_datetime64()
+            last = int(np.searchsorted(times, stop, side="right"))
+        df = df.iloc[first:last]
+    if columns:
+        missing = [column for column in columns if column not in df.columns]
+        if missing:
+            raise ValueError(f"Unknown columns: {', '.join(missing)}")
+        df = pd.DataFrame({c: df[c].to_numpy() for c in columns}, copy=False)
+    return df
+
+
+def chunks(df: pd.DataFrame, rows: int = EXPORT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Split a frame into chunks of rows.
+
+    Args:
+        df (pd.DataFrame): The frame.
+        rows (int, optional): Rows per chunk. Defaults to EXPORT_CHUNK_ROWS.
+
+    Yields:
+        pd.DataFrame: Each chunk, sharing the memory of the frame.
+    """
+    for start in range(0, len(df), rows):
+        yield df.iloc[start : start + rows]
+
+
+def csv_chunks(df: pd.DataFrame) -> Iterator[str]:
+    r"""Write a frame as CSV, one chunk at a time.
+
+    Args:
+        df (pd.DataFrame): The frame.
+
+    Yields:
+        str: The header, then the CSV rows of each chunk.
+
+    >>> list(csv_chunks(pd.DataFrame({"a": [1, 2]})))
+    ['a\n', '1\n2\n']
+    """
+    yield df.iloc[:0].to_csv(index=False)
+    for chunk in chunks(df):
+        yield chunk.to_csv(header=False, index=False)
+
+
+class ChunkSink(io.RawIOBase):
+    """Write-only file that hands over what has been written since the last take."""
+
+    def __init__(self) -> None:
+        """Initialise an empty sink."""
+        self._parts: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        """Return whether the sink is writable, which it always is."""
+        return True
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        """Keep the written bytes until the next take."""
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        """Return the number of bytes written in total."""
+        return self._position
+
+    def take(self) -> bytes:
+        """Return the bytes written since the last take."""
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def parquet_chunks(df: pd.DataFrame) -> Iterator[bytes]:
+    """Write a frame as Parquet with one row group per chunk.
+
+    Requires pyarrow.
+
+    Args:
+        df (pd.DataFrame): The frame.
+
+    Yields:
+        bytes: The file, written a row group at a time.
+    """
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+
+    sink = ChunkSink()
+    schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in chunks(df):
+            writer.write_table(
+                pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            )
+            yield sink.take()
+    yield sink.take()
+
+
+def source_data(source: str, args: Mapping[str, str]) -> pd.DataFrame:
+    """Get the data to export.
+
+    Args:
+        source (str): "opal", "wesim" or "dsr".
+        args (Mapping[str, str]): Query parameters. "run" exports an archived
+            OPAL run instead of the current data, and "table" names the WESIM
+            table, which defaults to "Regions".
+
+    Returns:
+        pd.DataFrame: The data.
+    """
+    if source == "opal":
+        run = args.get("run")
+        if not run:
+            from . import data
+
+            return data.DF_OPAL
+        if not re.fullmatch(r"[\w.-]+", run) or not (ARCHIVE_DIR / run).is_dir():
+            abort(404, f"No archived run {run}")
+        reader = ArchiveReader(ARCHIVE_DIR / run)
+        return reader.snapshot(reader.rows)
+
+    if source == "wesim":
+        from .data import load_wesim
+
+        table = args.get("table", "Regions")
+        wesim = load_wesim()
+        if table not in wesim:
+            abort(404, f"No WESIM table {table}, choose from {', '.join(wesim)}")
+        return wesim[table]
+
+    if source == "dsr":
+        abort(404, "No DSR data is held by the app")
+
+    abort(404, f"Unknown data source {source}")
+
+
+def export(source: str, args: Mapping[str, str]) -> Response:
+    """Stream the data of a source as a file download.
+
+    Args:
+        source (str): "opal", "wesim" or "dsr".
+        args (Mapping[str, str]): Query parameters: "format" is "csv" (default)
+            or "parquet", "columns" is a comma separated list of columns, and
+            "start" and "end" bound the times, as well as those of source_data.
+
+    Returns:
+        Response: The streamed file.
+    """
+    fmt = args.get("format", "csv")
+    if fmt not in MIMETYPES:
+        abort(400, f"Unknown format {fmt}, choose from {', '.join(MIMETYPES)}")
+    if fmt == "parquet" and find_spec("pyarrow") is None:
+        abort(501, "Exporting Parquet requires pyarrow to be installed")
+
+    columns = args.get("columns")
+    try:
+        df = select(
+            source_data(source, args),
+            columns.split(",") if columns else None,
+            args.get("start"),
+            args.get("end"),
+        )
+    except ValueError as err:
+        abort(400, str(err))
+
+    body: Iterator[str] | Iterator[bytes] = (
+        csv_chunks(df) if fmt == "csv" else parquet_chunks(df)
+    )
+    return Response(
+        body,
+        mimetype=MIMETYPES[fmt],
+        headers={"Content-Disposition": f"attachment; filename={source}.{fmt}"},
+    )
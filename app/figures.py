@@ -1,15 +1,16 @@
 """Functions for generating plotly figures."""
 
 from functools import wraps
-from typing import Callable, Union
+from typing import Callable
 
 import numpy as np
 import pandas as pd
-import plotly.express as px  # type: ignore
 import plotly.graph_objects as go  # type: ignore
-from plotly.colors import DEFAULT_PLOTLY_COLORS  # type: ignore
-from plotly.subplots import make_subplots  # type: ignore
+from plotly.colors import DEFAULT_PLOTLY_COLORS, hex_to_rgb, qualitative  # type: ignore
 
+from . import archive, derived
+from .metrics import FIGURE_DURATION
+from .schema import get_schema, power_sources
 from .svg import (
     generate_map_location_svg,
     generate_sld_location_svg,
@@ -17,13 +18,27 @@ from .svg import (
     get_agent_sld_coordinates,
     get_ev_map_coordinates,
     get_ev_sld_coordinates,
-    svg_map,
-    svg_sld,
+    load_svg,
 )
 
 time_range = ["2035-01-22 04:00", "2035-01-22 11:00"]
 
 
+def time_ms(time: "pd.Series[pd.Timestamp]") -> "pd.Series[int]":
+    """Serialise times compactly as milliseconds since the epoch.
+
+    Plotly reads numbers on date axes as milliseconds since the epoch, which are
+    smaller to send and quicker to encode and parse than date strings.
+
+    Args:
+        time (pd.Series): Datetimes
+
+    Returns:
+        pd.Series: Milliseconds since the epoch with the same index
+    """
+    return time.astype("datetime64[ms]").astype("int64")
+
+
 def figure(title: str, title_size: float = 30) -> Callable:  # type: ignore[type-arg]
     """Decorator for common formatting of all figures.
 
@@ -37,8 +52,9 @@ def figure(title: str, title_size: float = 30) -> Callable:  # type: ignore[type
 
     def decorator(func: Callable) -> Callable:  # type: ignore[type-arg]
         @wraps(func)
-        def wrapper(df: pd.DataFrame) -> Union[px.pie, px.line, go.Figure]:
-            fig = func(df)
+        def wrapper(df: pd.DataFrame) -> go.Figure:
+            with FIGURE_DURATION.time(figure=func.__name__):
+                fig = func(df)
             fig.update_layout(
                 title_text=title,
                 title={"font": {"size": title_size}},
@@ -88,7 +104,7 @@ def axes(
 
     def decorator(func: Callable) -> Callable:  # type: ignore[type-arg]
         @wraps(func)
-        def wrapper(df: pd.DataFrame) -> Union[px.pie, px.line, go.Figure]:
+        def wrapper(df: pd.DataFrame) -> go.Figure:
             fig = func(df)
 
             # X axis
@@ -133,12 +149,12 @@ def timestamp(
 
     def decorator(func: Callable) -> Callable:  # type: ignore[type-arg]
         @wraps(func)
-        def wrapper(df: pd.DataFrame) -> Union[px.pie, px.line, go.Figure]:
+        def wrapper(df: pd.DataFrame) -> go.Figure:
             fig = func(df)
 
             if not len(df.columns) == 1:
                 fig.add_annotation(
-                    text=df.iloc[-1]["Time"],
+                    text=str(df["Time"].iloc[-1]),
                     x=x,
                     y=y,
                     xref="paper",
@@ -184,7 +200,7 @@ def legend(
 
     def decorator(func: Callable) -> Callable:  # type: ignore[type-arg]
         @wraps(func)
-        def wrapper(df: pd.DataFrame) -> Union[px.pie, go.Figure]:
+        def wrapper(df: pd.DataFrame) -> go.Figure:
             fig = func(df)
 
             # Legend
@@ -207,6 +223,75 @@ def legend(
     return decorator
 
 
+def reference_overlay() -> Callable:  # type: ignore[type-arg]
+    """Decorator to overlay the same figure of the reference run, if there is one.
+
+    The traces of the reference run are dashed, grouped in the legend and named
+    after the traces of the data with " (reference)" appended.
+
+    Returns:
+        Callable: Decorated function
+    """
+
+    def decorator(func: Callable) -> Callable:  # type: ignore[type-arg]
+        @wraps(func)
+        def wrapper(df: pd.DataFrame) -> go.Figure:
+            fig = func(df)
+
+            ref = archive.reference(df)
+            if ref is not None:
+                for trace in func(ref).data:
+                    trace.update(
+                        name=f"{trace.name} (reference)" if trace.name else "Reference",
+                        legendgroup="reference",
+                        line_dash="dash",
+                        opacity=0.6,
+                    )
+                    fig.add_trace(trace)
+
+            return fig
+
+        return wrapper
+
+    return decorator
+
+
+def add_rolling_band(fig: go.Figure, df: pd.DataFrame, column: str, color: str) -> None:
+    """Add the rolling mean of a column with its min/max band to a figure.
+
+    Args:
+        fig (go.Figure): The figure.
+        df (pd.DataFrame): Opal data DataFrame
+        column (str): Name of the column, one of derived.ROLLING_COLUMNS
+        color (str): Hex color of the mean, also used for the band.
+    """
+    x = time_ms(df["Time"])
+    name = derived.rolling_name
+    band = dict(mode="lines", line=dict(width=0), hoverinfo="skip")
+    fig.add_traces(
+        [
+            go.Scatter(
+                x=x, y=derived.column(df, name(column, "max")), showlegend=False, **band
+            ),
+            go.Scatter(
+                x=x,
+                y=derived.column(df, name(column, "min")),
+                name=name(column, "min/max"),
+                fill="tonexty",
+                fillcolor="rgba({}, {}, {}, 0.2)".format(*hex_to_rgb(color)),
+                **band,
+            ),
+            go.Scatter(
+                x=x,
+                y=derived.column(df, name(column, "mean")),
+                name=name(column, "mean"),
+                mode="lines",
+                line=dict(color=color, dash="dot"),
+            ),
+        ]
+    )
+
+
 def combine_left_right_subplots(fig_left: go.Figure, fig_right: go.Figure) -> go.Figure:
     """Assembles two go.Figure objects into left-right subplots.
 
@@ -220,6 +305,8 @@ def combine_left_right_subplots(fig_left: go.Figure, fig_right: go.Figure) -> go
     Returns:
         go.Figure: Combined figure
     """
+    from plotly.subplots import make_subplots  # type: ignore
+
     fig = make_subplots(rows=1, cols=2)
 
     # Transfer data from original figures
@@ -237,19 +324,6 @@ def combine_left_right_subplots(fig_left: go.Figure, fig_right: go.Figure) -> go
     return fig
 
 
-power_sources = [
-    "Battery Generation",
-    "Interconnector Power",
-    "Offshore Wind Generation",
-    "Onshore Wind Generation",
-    "Other Generation",
-    "Pump Generation",
-    "Pv Generation",
-    "Nuclear Generation",
-    "Hydro Generation",
-    "Gas Generation",
-]
-
 power_sources_colors = {
     s: c for s, c in zip(power_sources, DEFAULT_PLOTLY_COLORS[: len(power_sources)])
 }
@@ -258,7 +332,7 @@ power_sources_colors = {
 @figure("Generation Split")
 @legend()
 @timestamp(y=0, x=1)
-def generate_gen_split_fig(df: pd.DataFrame) -> px.pie:
+def generate_gen_split_fig(df: pd.DataFrame) -> go.Figure:
     """Creates Plotly figure for Generation Split graph.
 
     Args:
@@ -271,12 +345,13 @@ def generate_gen_split_fig(df: pd.DataFrame) -> px.pie:
         fig = go.Figure(go.Pie())
     else:
         # Data
-        values = df.iloc[-1].loc[power_sources]
+        sources = get_schema(df).power_sources
+        values = sources.last(df)
         values_negative, names_negative = zip(
-            *[(val, name) for val, name in zip(values, power_sources) if val < 0]
+            *[(val, name) for val, name in zip(values, sources.names) if val < 0]
         )
         values_positive, names_positive = zip(
-            *[(val, name) for val, name in zip(values, power_sources) if val >= 0]
+            *[(val, name) for val, name in zip(values, sources.names) if val >= 0]
         )
         sum_negative = -sum(values_negative)
         sum_positive = sum(values_positive)
@@ -349,7 +424,8 @@ def generate_gen_split_fig(df: pd.DataFrame) -> px.pie:
 @figure("Generation Total")
 @legend()
 @axes(ylabel="Power Generation (GW)", yrange=[-5, 70])
-def generate_total_gen_fig(df: pd.DataFrame) -> px.line:
+@reference_overlay()
+def generate_total_gen_fig(df: pd.DataFrame) -> go.Figure:
     """Creates Plotly figure for Total Generation graph.
 
     Args:
@@ -358,15 +434,19 @@ def generate_total_gen_fig(df: pd.DataFrame) -> px.line:
     Returns:
         Plotly express figure
     """
+    import plotly.express as px  # type: ignore
+
     if len(df.columns) == 1:
         total_gen_fig = px.line()
     else:
         total_gen_fig = px.line(
             df,
-            x="Time",
+            x=time_ms(df["Time"]),
+            labels={"x": "Time"},
             y=["Total Generation"] + power_sources,
             color_discrete_map={**power_sources_colors, "Total Generation": "black"},
         )
+        add_rolling_band(total_gen_fig, df, "Total Generation", "#000000")
 
     return total_gen_fig
 
@@ -374,7 +454,8 @@ def generate_total_gen_fig(df: pd.DataFrame) -> px.line:
 @figure("Demand Total")
 @legend(show_legend=False)
 @axes(ylabel="Total Demand (GW)", yrange=[-5, 70])
-def generate_total_dem_fig(df: pd.DataFrame) -> px.line:
+@reference_overlay()
+def generate_total_dem_fig(df: pd.DataFrame) -> go.Figure:
     """Creates Plotly figure for Total Demand graph.
 
     Args:
@@ -383,23 +464,28 @@ def generate_total_dem_fig(df: pd.DataFrame) -> px.line:
     Returns:
         Plotly express figure
     """
+    import plotly.express as px  # type: ignore
+
     if len(df.columns) == 1:
         total_dem_fig = px.line()
     else:
         total_dem_fig = px.line(
             df,
-            x="Time",
+            x=time_ms(df["Time"]),
+            labels={"x": "Time"},
             y=[
                 "Total Demand",
             ],
         )
+        add_rolling_band(total_dem_fig, df, "Total Demand", qualitative.Plotly[0])
     return total_dem_fig
 
 
 @figure("System Frequency")
 @legend()
 @axes(ylabel="Hz", yrange=[30, 70])
-def generate_system_freq_fig(df: pd.DataFrame) -> px.line:
+@reference_overlay()
+def generate_system_freq_fig(df: pd.DataFrame) -> go.Figure:
     """Creates Plotly figure for System Frequency graph.
 
     TODO: This is using placeholder data. Update when data is available
@@ -411,17 +497,22 @@ def generate_system_freq_fig(df: pd.DataFrame) -> px.line:
     Returns:
         Plotly express figure
     """
+    import plotly.express as px  # type: ignore
+
     if len(df.columns) == 1:
         system_freq_fig = px.line()
     else:
         system_freq_fig = px.line(
             df,
-            x="Time",
+            x=time_ms(df["Time"]),
+            labels={"x": "Time"},
             y=[
                 "Total Generation",
                 "Total Demand",
             ],
         )
+        add_rolling_band(system_freq_fig, df, "Total Generation", qualitative.Plotly[0])
+        add_rolling_band(system_freq_fig, df, "Total Demand", qualitative.Plotly[1])
 
     return system_freq_fig
 
@@ -447,7 +538,7 @@ def generate_intraday_market_sys_fig_left(df: pd.DataFrame) -> go.Figure:
         intraday_market_sys_fig_left = go.Figure(
             [
                 go.Scatter(
-                    x=df["Time"],
+                    x=time_ms(df["Time"]),
                     y=df[c],
                     mode="lines",
                     name=c,
@@ -460,21 +551,21 @@ def generate_intraday_market_sys_fig_left(df: pd.DataFrame) -> go.Figure:
 
 
 @axes(ylabel="Intra-Day Market Value (£/MW)", yrange=[-10000, 10000], xdomain=[0.57, 1])
-def generate_intraday_market_sys_fig_right(df: pd.DataFrame) -> px.line:
+def generate_intraday_market_sys_fig_right(df: pd.DataFrame) -> go.Figure:
     """Generate right panel of Intraday Market System figure.
 
     Args:
         df (pd.DataFrame): Opal dataframe
 
     Returns:
-        px.line: Plotly figure
+        go.Figure: Plotly figure
     """
     if len(df.columns) == 1:
         intraday_market_sys_fig_right = go.Figure(go.Scatter())
     else:
         intraday_market_sys_fig_right = go.Figure(
             go.Scatter(
-                x=df["Time"],
+                x=time_ms(df["Time"]),
                 y=df["Intra-Day Market Value"],
                 mode="lines",
                 showlegend=False,
@@ -523,7 +614,7 @@ def generate_balancing_market_fig_left(df: pd.DataFrame) -> go.Figure:
         balancing_market_fig_left = go.Figure(
             [
                 go.Scatter(
-                    x=df["Time"],
+                    x=time_ms(df["Time"]),
                     y=df[c],
                     mode="lines",
                     name=c,
@@ -552,7 +643,7 @@ def generate_balancing_market_fig_right(df: pd.DataFrame) -> go.Figure:
     else:
         balancing_market_fig_right = go.Figure(
             go.Scatter(
-                x=df["Time"],
+                x=time_ms(df["Time"]),
                 y=df["Balancing Mechanism Value"],
                 mode="lines",
                 showlegend=False,
@@ -582,7 +673,8 @@ def generate_balancing_market_fig(df: pd.DataFrame) -> go.Figure:
 
 @figure("Energy Deficit")
 @axes(ylabel="Energy Deficit (MW)", yrange=[-600, 600])
-def generate_energy_deficit_fig(df: pd.DataFrame) -> px.line:
+@reference_overlay()
+def generate_energy_deficit_fig(df: pd.DataFrame) -> go.Figure:
     """Creates Plotly figure for Energy Deficit graph.
 
     Args:
@@ -591,13 +683,16 @@ def generate_energy_deficit_fig(df: pd.DataFrame) -> px.line:
     Returns:
         Plotly express figure
     """
+    import plotly.express as px  # type: ignore
+
     if len(df.columns) == 1:
         energy_deficit_fig = px.line()
     else:
         energy_deficit_fig = px.line(
             df,
-            x="Time",
-            y=df["Exp. Offshore Wind Generation"] - df["Real Offshore Wind Generation"],
+            x=time_ms(df["Time"]),
+            labels={"x": "Time"},
+            y=derived.column(df, "Energy Deficit"),
         )
 
     return energy_deficit_fig
@@ -660,7 +755,7 @@ def generate_dsr_fig_left(df: pd.DataFrame) -> go.Figure:
         dsr_fig_left = go.Figure(
             [
                 go.Scatter(
-                    x=df["Time"],
+                    x=time_ms(df["Time"]),
                     y=df[c],
                     mode="lines",
                     name=c,
@@ -689,7 +784,7 @@ def generate_dsr_fig_right(df: pd.DataFrame) -> go.Figure:
     else:
         dsr_fig_right = go.Figure(
             go.Scatter(
-                x=df["Time"],
+                x=time_ms(df["Time"]),
                 y=df["Cost"],
                 mode="lines",
                 showlegend=False,
@@ -719,7 +814,8 @@ def generate_dsr_fig(df: pd.DataFrame) -> go.Figure:
 
 @figure("DSR Commands to Agents")
 @axes(ylabel="MW", yrange=[-8, 8])
-def generate_dsr_commands_fig(df: pd.DataFrame) -> px.line:
+@reference_overlay()
+def generate_dsr_commands_fig(df: pd.DataFrame) -> go.Figure:
     """Creates Plotly figure for DSR Commands to Agents graph.
 
     Args:
@@ -728,27 +824,17 @@ def generate_dsr_commands_fig(df: pd.DataFrame) -> px.line:
     Returns:
         Plotly express figure
     """
+    import plotly.express as px  # type: ignore
+
     if len(df.columns) == 1:
         dsr_commands_fig = px.line()
     else:
-        figure_data = df[
-            [
-                "Time",
-            ]
-        ].copy()
-        figure_data["Name"] = (  # TODO: Give this column an appropriate name
-            df["Real Gridlington Demand"] - df["Expected Gridlington Demand"]
-        ) + (df["Real Ev Charging Power"] - df["Expected Ev Charging Power"])
-        figure_data["Name2"] = (  # TODO: Give this column an appropriate name
-            df["Real Ev Charging Power"] - df["Expected Ev Charging Power"]
-        )
+        figure_data = derived.frame(df, ["Agent Demand Delta", "Ev Demand Delta"])
         dsr_commands_fig = px.line(
             figure_data,
-            x="Time",
-            y=[
-                "Name",
-                "Name2",
-            ],
+            x=time_ms(df["Time"]),
+            labels={"x": "Time"},
+            y=figure_data.columns,
         )
 
     dsr_commands_fig.update_layout(
@@ -926,14 +1012,10 @@ def generate_agent_activity_breakdown_fig(df: pd.DataFrame) -> go.Figure:
     if len(df.columns) == 1:
         agent_activity_breakdown_fig = go.Figure()
     else:
-        household_activities = [
-            c for c in df.columns.values.tolist() if "Household Activity" in c
-        ]
-        categories = [h.split("(")[1].split(")")[0] for h in household_activities]
-        counts = [int(df[h].iloc[-1]) for h in household_activities]
+        household_activities = get_schema(df).household_activities
         agent_activity_breakdown_fig = create_waffle_chart(
-            categories=categories,
-            counts=counts,
+            categories=household_activities.labels,
+            counts=[int(c) for c in household_activities.last(df)],
             label="agent",
             squares=546,  # for consistency with EV chart (below)
             gap=1,
@@ -960,12 +1042,10 @@ def generate_ev_charging_breakdown_fig(df: pd.DataFrame) -> go.Figure:
     if len(df.columns) == 1:
         ev_charging_breakdown_fig = go.Figure()
     else:
-        ev_states = [c for c in df.columns.values.tolist() if "Ev Status" in c]
-        categories = [h.split("(")[1].split(")")[0] for h in ev_states]
-        counts = [int(df[h].iloc[-1]) for h in ev_states]  # sum(counts) = 546
+        ev_states = get_schema(df).ev_statuses
         ev_charging_breakdown_fig = create_waffle_chart(
-            categories=categories,
-            counts=counts,
+            categories=ev_states.labels,
+            counts=[int(c) for c in ev_states.last(df)],  # sum(counts) = 546
             label="EV",
             gap=1,
             rows=21,  # -> 26 columns
@@ -1036,7 +1116,7 @@ def generate_weather_fig(wesim_data: dict[str, pd.DataFrame]) -> go.Figure:
             for o in table_df["Onshore wind"].to_list()
         ]
 
-        columns = table_df["Time"]
+        columns = table_df["Time"].astype(str)
         data = list(zip(table_solar_labels, table_wind_labels))
 
         weather_fig = go.Figure(
@@ -1066,6 +1146,8 @@ def generate_reserve_generation_fig(wesim_data: dict[str, pd.DataFrame]) -> go.F
     Returns:
         Plotly express line graph
     """
+    import plotly.express as px  # type: ignore
+
     if len(wesim_data) == 1:
         reserve_generation_fig = px.line()
     else:
@@ -1079,6 +1161,7 @@ def generate_reserve_generation_fig(wesim_data: dict[str, pd.DataFrame]) -> go.F
         wesim_regions_total.loc[:, "Solar Reserve"] = wesim_regions_total.apply(
             lambda x: solar_capacity - x["Solar PV"], axis=1
         )
+        wesim_regions_total["Time"] = time_ms(wesim_regions_total["Time"])
 
         reserve_generation_fig = px.line(
             wesim_regions_total,
@@ -1105,7 +1188,7 @@ def generate_map_fig(df: pd.DataFrame) -> go.Figure:
 
     map_fig = go.Figure()
     args = {"x": 0, "y": 1, "xref": "paper", "yref": "paper", "sizex": 1, "sizey": 1}
-    map_fig.add_layout_image(source=svg_map.url, **args)
+    map_fig.add_layout_image(source=load_svg("map").static_url, **args)
     map_fig.add_layout_image(source=agent_svg.url, **args)
     map_fig.add_layout_image(source=ev_svg.url, **args)
     map_fig.update_layout(yaxis=dict(scaleanchor="x"), plot_bgcolor="rgba(0,0,0,0)")
@@ -1133,7 +1216,7 @@ def generate_sld_fig(df: pd.DataFrame) -> go.Figure:
 
     sld_fig = go.Figure()
     args = {"x": 0, "y": 1, "xref": "paper", "yref": "paper", "sizex": 1, "sizey": 1}
-    sld_fig.add_layout_image(source=svg_sld.url, **args)
+    sld_fig.add_layout_image(source=load_svg("sld").static_url, **args)
     sld_fig.add_layout_image(source=agent_svg.url, **args)
     sld_fig.add_layout_image(source=ev_svg.url, **args)
     sld_fig.update_layout(yaxis=dict(scaleanchor="x"), plot_bgcolor="rgba(0,0,0,0)")
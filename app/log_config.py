@@ -1,9 +1,90 @@
 """Dict configuration for formal logging."""
 
+import atexit
+import logging
 import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 
 LOG_LEVEL: str = os.environ.get("LOG_LEVEL", "DEBUG")
+LOG_RATE_LIMIT: float = float(os.environ.get("LOG_RATE_LIMIT", 10))
 FORMAT: str = "[%(levelname)s] %(asctime)s | %(message)s"
+
+
+class RateLimitFilter(logging.Filter):
+    """Filter that lets through one record per call site in each interval.
+
+    Only records below a given level are limited, so that the messages logged on
+    every data tick or page update are sampled while warnings and errors are
+    always kept. The first record let through after others were dropped notes how
+    many were dropped.
+    """
+
+    def __init__(self, interval: float = LOG_RATE_LIMIT, level: str = "INFO") -> None:
+        """Initialise the filter.
+
+        Args:
+            interval (float, optional): Minimum number of seconds between records
+                from the same call site. Defaults to LOG_RATE_LIMIT.
+            level (str, optional): Records at this level and above are never
+                limited. Defaults to "INFO".
+        """
+        super().__init__()
+        self.interval = interval
+        self.level = logging.getLevelName(level)
+        self._last: dict[tuple[str, int], float] = {}
+        self._dropped: dict[tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Decide whether to log a record.
+
+        Args:
+            record (logging.LogRecord): The record to be logged.
+
+        Returns:
+            bool: Whether the record should be logged.
+        """
+        if record.levelno >= self.level:
+            return True
+        site = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last.get(site, -self.interval) < self.interval:
+                self._dropped[site] = self._dropped.get(site, 0) + 1
+                return False
+            self._last[site] = now
+            dropped = self._dropped.pop(site, 0)
+        if dropped:
+            record.msg = f"{record.getMessage()} ({dropped} similar messages dropped)"
+            record.args = None
+        return True
+
+
+def queue_handlers(logger: logging.Logger) -> QueueListener:
+    """Move the handlers of a logger onto a background thread.
+
+    The handlers are replaced by a single handler that puts the records on a queue,
+    so that the caller never waits for a record to be written. The records are
+    written by the handlers in a listener thread, which is stopped at exit after
+    the queue has been emptied.
+
+    Args:
+        logger (logging.Logger): The logger whose handlers to move.
+
+    Returns:
+        QueueListener: The listener writing the records.
+    """
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+    logger.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
 logging_dict_config = {
     "version": 1,
     "formatters": {
@@ -15,6 +96,9 @@ logging_dict_config = {
             "format": FORMAT,
         },
     },
+    "filters": {
+        "rate_limit": {"()": RateLimitFilter},
+    },
     "handlers": {
         "default": {
             "formatter": "default",
@@ -38,6 +122,7 @@ logging_dict_config = {
         "gunicorn": {"handlers": ["default", "file"], "level": "INFO"},
         "api_logger": {
             "handlers": ["console", "file"],
+            "filters": ["rate_limit"],
             "level": LOG_LEVEL,
         },
     },
@@ -0,0 +1,254 @@
+"""Records timings and sizes and renders them for the metrics endpoint.
+
+The metrics are kept in memory by each worker process and rendered in the
+Prometheus text exposition format, so that a local scraper can read them.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 3e5, 1e6, 3e6, 1e7)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def format_labels(labels: Labels, extra: str = "") -> str:
+    """Format labels as a Prometheus label set.
+
+    Args:
+        labels (Labels): Sorted pairs of label names and values.
+        extra (str, optional): Preformatted label to append. Defaults to "".
+
+    Returns:
+        str: The label set, or an empty string if there are no labels.
+
+    >>> format_labels((("page", "map"),), 'le="0.5"')
+    '{page="map",le="0.5"}'
+    """
+    pairs = [
+        '{}="{}"'.format(
+            name,
+            value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in labels
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    """Base class for a named metric with a series per set of labels."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str) -> None:
+        """Initialise the metric and add it to the registry.
+
+        Args:
+            name (str): Name of the metric.
+            description (str): Help text of the metric.
+        """
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def samples(self) -> list[str]:
+        """Sample lines of the metric in the text exposition format."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Render the metric in the text exposition format."""
+        return "\n".join(
+            [
+                f"# HELP {self.name} {self.description}",
+                f"# TYPE {self.name} {self.kind}",
+                *self.samples(),
+            ]
+        )
+
+
+class Histogram(Metric):
+    """Metric that counts observations in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: tuple[float, ...] = DURATION_BUCKETS,
+    ) -> None:
+        """Initialise the histogram.
+
+        Args:
+            name (str): Name of the metric.
+            description (str): Help text of the metric.
+            buckets (tuple[float, ...], optional): Upper bounds of the buckets.
+                Defaults to DURATION_BUCKETS.
+        """
+        super().__init__(name, description)
+        self.buckets = buckets
+        self._counts: dict[Labels, list[int]] = {}
+        self._sums: dict[Labels, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record an observation.
+
+        Args:
+            value (float): The observed value.
+            labels: Labels of the series to record the value in.
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[bisect_left(self.buckets, value)] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Context manager that observes the duration of its body in seconds.
+
+        Args:
+            labels: Labels of the series to record the duration in.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> list[str]:
+        """Sample lines of the histogram in the text exposition format."""
+        lines = []
+        with self._lock:
+            for key, counts in self._counts.items():
+                cumulative = 0
+                for bound, count in zip((*self.buckets, "+Inf"), counts):
+                    cumulative += count
+                    le = format_labels(key, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                lines.append(f"{self.name}_sum{format_labels(key)} {self._sums[key]}")
+                lines.append(f"{self.name}_count{format_labels(key)} {cumulative}")
+        return lines
+
+
+class Counter(Metric):
+    """Metric that counts events."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str) -> None:
+        """Initialise the counter.
+
+        Args:
+            name (str): Name of the metric.
+            description (str): Help text of the metric.
+        """
+        super().__init__(name, description)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increase the count.
+
+        Args:
+            amount (float, optional): Number of events. Defaults to 1.
+            labels: Labels of the series to count the events in.
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> list[str]:
+        """Sample lines of the counter in the text exposition format."""
+        with self._lock:
+            return [
+                f"{self.name}{format_labels(key)} {value}"
+                for key, value in self._values.items()
+            ]
+
+
+class ProcessCPU(Metric):
+    """CPU time used by the worker process."""
+
+    kind = "counter"
+
+    def samples(self) -> list[str]:
+        """Sample lines of the CPU time in the text exposition format."""
+        return [f"{self.name} {time.process_time()}"]
+
+
+REGISTRY: list[Metric] = []
+
+CALLBACK_DURATION = Histogram(
+    "vis_callback_duration_seconds", "Duration of the Dash callbacks."
+)
+FIGURE_DURATION = Histogram(
+    "vis_figure_duration_seconds", "Duration of the figure generating functions."
+)
+RESPONSE_SIZE = Histogram(
+    "vis_callback_response_size_bytes",
+    "Size of the responses to Dash callbacks.",
+    SIZE_BUCKETS,
+)
+DATAHUB_DURATION = Histogram(
+    "vis_datahub_request_duration_seconds", "Duration of requests to the DataHub."
+)
+TICK_LAG = Histogram(
+    "vis_data_tick_lag_seconds",
+    "Time from a data update to the figures of a page being rendered with it.",
+)
+DROPPED_FRAMES = Counter(
+    "vis_dropped_frames_total",
+    "Data updates skipped by a client to render the latest data.",
+)
+RENDER_CACHE_REQUESTS = Counter(
+    "vis_render_cache_requests_total",
+    "Figures asked for by the page callbacks, by whether they were cached.",
+)
+PROCESS_CPU = ProcessCPU("process_cpu_seconds_total", "CPU time of the process.")
+
+
+def timed_callback(name: str) -> Callable:  # type: ignore[type-arg]
+    """Decorator recording the duration and tick lag of a page callback.
+
+    The decorated callback must take the figure interval as its first argument.
+    The tick lag is only recorded when the callback renders the latest data.
+
+    Args:
+        name (str): Name of the callback used as the metric label
+
+    Returns:
+        Callable: Decorated function
+    """
+
+    def decorator(func: Callable) -> Callable:  # type: ignore[type-arg]
+        @wraps(func)
+        def wrapper(n_intervals: int, *args: object) -> object:
+            from . import data
+
+            with CALLBACK_DURATION.time(callback=name):
+                result = func(n_intervals, *args)
+            if n_intervals == data.N_INTERVALS_DATA and data.TICK_TIME is not None:
+                TICK_LAG.observe(time.time() - data.TICK_TIME, callback=name)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def render() -> str:
+    """Render all metrics in the Prometheus text exposition format.
+
+    Returns:
+        str: The metrics, one sample per line.
+    """
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
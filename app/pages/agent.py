@@ -9,12 +9,10 @@ Five plots:
 """
 
 import dash  # type: ignore
-import pandas as pd
-import plotly.express as px  # type: ignore
 import plotly.graph_objects as go  # type: ignore
-from dash import Input, Output, callback, dcc  # type: ignore
+from dash import Input, Output, State, callback, dcc, html  # type: ignore
 
-from .. import log
+from .. import log, metrics, profiling
 from ..figures import (
     generate_agent_activity_breakdown_fig,
     generate_dsr_commands_fig,
@@ -23,64 +21,81 @@ from ..figures import (
     generate_sld_fig,
 )
 from ..layout import GridBuilder
+from ..scheduler import SLOW_REFRESH, Refresh, Refreshed, Schedule
 
 dash.register_page(__name__)
 
-df = pd.DataFrame({"Col": [0]})
-
-sld_fig = generate_sld_fig(df)
-map_fig = generate_map_fig(df)
-agent_activity_breakdown_fig = generate_agent_activity_breakdown_fig(df)
-ev_charging_breakdown_fig = generate_ev_charging_breakdown_fig(df)
-dsr_commands_fig = generate_dsr_commands_fig(df)
-
-grid = GridBuilder(rows=2, cols=3)
-grid.add_element(
-    dcc.Graph(
-        id="map_fig",
-        figure=map_fig,
-        style={"height": "100%", "width": "100%"},
-    ),
-    row=0,
-    col=1,
-)
-grid.add_element(
-    dcc.Graph(
-        id="sld_fig",
-        figure=sld_fig,
-        style={"height": "100%", "width": "100%"},
+SCHEDULE = Schedule(
+    "agent",
+    Refresh(generate_map_fig),
+    Refresh(generate_sld_fig, min_interval=SLOW_REFRESH),
+    Refresh(
+        generate_agent_activity_breakdown_fig,
+        columns=("Time", "Household Activity"),
+        history=False,
     ),
-    row=0,
-    col=0,
-)
-grid.add_element(
-    dcc.Graph(
-        id="agent_activity_breakdown_fig",
-        figure=agent_activity_breakdown_fig,
-        style={"height": "100%", "width": "100%"},
-    ),
-    row=1,
-    col=0,
-)
-grid.add_element(
-    dcc.Graph(
-        id="ev_charging_breakdown_fig",
-        figure=ev_charging_breakdown_fig,
-        style={"height": "100%", "width": "100%"},
+    Refresh(
+        generate_ev_charging_breakdown_fig,
+        columns=("Time", "Ev Status"),
+        history=False,
     ),
-    row=1,
-    col=1,
+    Refresh(generate_dsr_commands_fig, columns=("Time", "Agent", "Ev Demand")),
 )
-grid.add_element(
-    dcc.Graph(
-        id="dsr_commands_fig",
-        figure=dsr_commands_fig,
-        style={"height": "100%", "width": "100%"},
-    ),
-    row=1,
-    col=2,
-)
-layout = grid.layout
+
+
+def layout(**kwargs: str) -> html.Div:
+    """Builds the page layout with empty figures.
+
+    The figures are filled in by the first call of update_figures.
+
+    Args:
+        kwargs: Query parameters of the page URL (unused)
+
+    Returns:
+        html.Div: The page layout
+    """
+    grid = GridBuilder(rows=2, cols=3)
+    grid.add_element(
+        dcc.Graph(
+            id="map_fig",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=0,
+        col=1,
+    )
+    grid.add_element(
+        dcc.Graph(
+            id="sld_fig",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=0,
+        col=0,
+    )
+    grid.add_element(
+        dcc.Graph(
+            id="agent_activity_breakdown_fig",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=1,
+        col=0,
+    )
+    grid.add_element(
+        dcc.Graph(
+            id="ev_charging_breakdown_fig",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=1,
+        col=1,
+    )
+    grid.add_element(
+        dcc.Graph(
+            id="dsr_commands_fig",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=1,
+        col=2,
+    )
+    return html.Div([grid.layout, *SCHEDULE.components()])
 
 
 @callback(
@@ -90,35 +105,38 @@ layout = grid.layout
         Output("agent_activity_breakdown_fig", "figure"),
         Output("ev_charging_breakdown_fig", "figure"),
         Output("dsr_commands_fig", "figure"),
+        Output(SCHEDULE.store_id, "data"),
+        Output("rendered_interval", "data", allow_duplicate=True),
     ],
-    [Input("figure_interval", "data")],
+    [Input("figure_interval", "data"), Input(SCHEDULE.interval_id, "n_intervals")],
+    [State(SCHEDULE.store_id, "data")],
+    prevent_initial_call="initial_duplicate",
 )
+@metrics.timed_callback("agent")
+@profiling.profiled("agent")
 def update_figures(
     n_intervals: int,
-) -> tuple[go.Figure, go.Figure, go.Figure, go.Figure, px.line]:
-    """Function to update the plots in this page.
+    n_refreshes: int | None,
+    refreshed: Refreshed | None,
+) -> tuple[go.Figure | Refreshed | int, ...]:
+    """Function to update the plots in this page whose inputs have changed.
+
+    The figures always show the latest data, even if newer than n_intervals.
 
     Args:
         n_intervals (int): The number of times this page has updated.
             indexes by 1 every interval.
+        n_refreshes (int, optional): The number of times the refresh interval
+            has fired, which shows rate limited figures left out on the last
+            update.
+        refreshed (Refreshed, optional): Version and time of the last refresh
+            of each figure sent to this client.
 
     Returns:
-        tuple[go.Figure, go.Figure, go.Figure, go.Figure, px.line]:
-            The new figures.
+        tuple[go.Figure, go.Figure, go.Figure, go.Figure, go.Figure, Refreshed, int]:
+            The new figures, or dash.no_update for those left unchanged, the
+            versions sent and the figure interval rendered.
     """
-    from ..data import DF_OPAL
-
-    # TODO: ensure each figure is using the correct dataframe
-    map_fig = generate_map_fig(DF_OPAL)
-    sld_fig = generate_sld_fig(DF_OPAL)
-    agent_activity_breakdown_fig = generate_agent_activity_breakdown_fig(DF_OPAL)
-    ev_charging_breakdown_fig = generate_ev_charging_breakdown_fig(DF_OPAL)
-    dsr_commands_fig = generate_dsr_commands_fig(DF_OPAL)
+    figures, refreshed = SCHEDULE.update(refreshed)
     log.debug("Updating figures on Agent page")
-    return (
-        map_fig,
-        sld_fig,
-        agent_activity_breakdown_fig,
-        ev_charging_breakdown_fig,
-        dsr_commands_fig,
-    )
+    return (*figures, refreshed, n_intervals)
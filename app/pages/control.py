@@ -5,16 +5,19 @@ import requests
 from dash import Input, Output, State, callback, dcc, html  # type: ignore
 from dash_iconify import DashIconify  # type: ignore
 
-from .. import LIVE_MODEL, log
+from .. import LIVE_MODEL, log, profiling
 from .. import core_api as core
-from ..data import data_interval
+from ..data import data_interval, data_rows
 from ..datahub_api import start_model, stop_model
+from ..playback import PLAYBACK, SPEEDS
 
 dash.register_page(__name__)
 
 
 options = [key for key in core.INIT_SECTIONS.keys() if key != "Control"]
 
+PROFILE_INVOCATIONS = 10  # number of updates profiled by the profile button
+
 
 def get_default(space: str) -> str:
     """Function to get default option for dropdown.
@@ -125,101 +128,170 @@ def get_button(func: str, icon: str) -> html.Button:
     return button
 
 
-layout = html.Div(
-    style={
-        "height": "96vh",
-        "display": "flex",
-        "flex-direction": "column",
-        "justify-content": "space-around",
-    },
-    children=[
-        html.Div(
-            style={"padding": "20px 0", "flex": "1"},
-            children=[
-                html.Div(
-                    style={
-                        "display": "flex",
-                        "justify-content": "space-around",
-                        "padding": "6px 0",
-                    },
-                    children=[
-                        get_dropdown("Hub01"),
-                        get_dropdown("Hub02"),
-                    ],
-                ),
-                html.Div(
-                    style={
-                        "display": "flex",
-                        "justify-content": "space-around",
-                        "padding": "6px 0",
-                    },
-                    children=[
-                        get_pc_dropdown("PC01"),
-                        get_pc_dropdown("PC02"),
-                    ],
-                ),
-            ],
-        ),
-        html.Div(
-            id="message",
-            style={"text-align": "center"},
-            children=["No buttons pressed yet..."],
-        ),
-        html.Div(
-            style={"padding": "20px 0", "flex": "1"},
-            children=[
-                html.Div(
-                    style={
-                        "display": "flex",
-                        "justify-content": "space-around",
-                        "padding": "10px",
-                    },
-                    children=[
-                        get_button("update", "mdi:tick"),
-                        html.Div(
-                            children=[
-                                html.Div(
-                                    dcc.Slider(
-                                        id="update-interval-slider",
-                                        min=2,
-                                        max=10,
-                                        step=1,
-                                        value=7,
+def get_seek_slider() -> html.Div:
+    """Function to generate the slider for jumping to a timestep of the data.
+
+    Returns:
+        Div containing the slider, hidden when the data comes from the live model
+    """
+    div = html.Div(
+        style={
+            "padding": "10px 40px",
+            "flex-direction": "column",
+            "display": "none" if LIVE_MODEL else "flex",
+        },
+        children=[
+            dcc.Slider(
+                id="seek-slider",
+                min=0,
+                max=1 if LIVE_MODEL else data_rows() - 1,
+                step=1,
+                value=0,
+                marks=None,
+                tooltip={"placement": "bottom"},
+            ),
+            html.Label("Timestep", style={"text-align": "center"}),
+        ],
+    )
+    return div
+
+
+def get_speed_dropdown() -> html.Div:
+    """Function to generate the dropdown for the playback speed.
+
+    Returns:
+        Div containing the dropdown, hidden when the data comes from the live model
+    """
+    div = html.Div(
+        style={
+            "padding": "10px 40px",
+            "flex-direction": "column",
+            "align-items": "center",
+            "display": "none" if LIVE_MODEL else "flex",
+        },
+        children=[
+            dcc.Dropdown(
+                id="speed-dropdown",
+                options=[{"label": f"{speed}×", "value": speed} for speed in SPEEDS],
+                value=SPEEDS[0],
+                clearable=False,
+                style={"width": "120px"},
+            ),
+            html.Label("Playback Speed", style={"text-align": "center"}),
+        ],
+    )
+    return div
+
+
+def layout(**kwargs: str) -> html.Div:
+    """Builds the page layout.
+
+    The seek slider spans the data available when the page is loaded.
+
+    Args:
+        kwargs: Query parameters of the page URL (unused)
+
+    Returns:
+        html.Div: The page layout
+    """
+    return html.Div(
+        style={
+            "height": "96vh",
+            "display": "flex",
+            "flex-direction": "column",
+            "justify-content": "space-around",
+        },
+        children=[
+            html.Div(
+                style={"padding": "20px 0", "flex": "1"},
+                children=[
+                    html.Div(
+                        style={
+                            "display": "flex",
+                            "justify-content": "space-around",
+                            "padding": "6px 0",
+                        },
+                        children=[
+                            get_dropdown("Hub01"),
+                            get_dropdown("Hub02"),
+                        ],
+                    ),
+                    html.Div(
+                        style={
+                            "display": "flex",
+                            "justify-content": "space-around",
+                            "padding": "6px 0",
+                        },
+                        children=[
+                            get_pc_dropdown("PC01"),
+                            get_pc_dropdown("PC02"),
+                        ],
+                    ),
+                ],
+            ),
+            html.Div(
+                id="message",
+                style={"text-align": "center"},
+                children=["No buttons pressed yet..."],
+            ),
+            html.Div(
+                style={"padding": "20px 0", "flex": "1"},
+                children=[
+                    html.Div(
+                        style={
+                            "display": "flex",
+                            "justify-content": "space-around",
+                            "padding": "10px",
+                        },
+                        children=[
+                            get_button("update", "mdi:tick"),
+                            html.Div(
+                                children=[
+                                    html.Div(
+                                        dcc.Slider(
+                                            id="update-interval-slider",
+                                            min=2,
+                                            max=10,
+                                            step=1,
+                                            value=7,
+                                        ),
+                                        style={"width": "100%"},
                                     ),
-                                    style={"width": "100%"},
-                                ),
-                                html.Label(
-                                    "Update Interval (s)",
-                                    style={"text-align": "center"},
-                                ),
-                            ],
-                            style={
-                                "width": "40%",
-                                "flex-direction": "column",
-                                "justify-content": "center",
-                                "display": "none" if LIVE_MODEL else "flex",
-                            },
-                        ),
-                        get_button("default", "iconoir:undo"),
-                    ],
-                ),
-                html.Div(
-                    style={
-                        "display": "flex",
-                        "justify-content": "space-around",
-                        "padding": "10px",
-                    },
-                    children=[
-                        get_button("start", "ph:play-fill"),
-                        get_button("stop", "ri:stop-fill"),
-                        get_button("restart", "solar:refresh-bold"),
-                    ],
-                ),
-            ],
-        ),
-        data_interval,
-    ],
-)
+                                    html.Label(
+                                        "Update Interval (s)",
+                                        style={"text-align": "center"},
+                                    ),
+                                ],
+                                style={
+                                    "width": "40%",
+                                    "flex-direction": "column",
+                                    "justify-content": "center",
+                                    "display": "none" if LIVE_MODEL else "flex",
+                                },
+                            ),
+                            get_button("default", "iconoir:undo"),
+                        ],
+                    ),
+                    html.Div(
+                        style={
+                            "display": "flex",
+                            "justify-content": "space-around",
+                            "padding": "10px",
+                        },
+                        children=[
+                            get_button("start", "ph:play-fill"),
+                            get_button("stop", "ri:stop-fill"),
+                            get_button("restart", "solar:refresh-bold"),
+                            get_button("profile", "mdi:timer-outline"),
+                        ],
+                    ),
+                    get_seek_slider(),
+                    get_speed_dropdown(),
+                ],
+            ),
+            data_interval,
+        ],
+    )
 
 
 @callback(
@@ -319,7 +391,11 @@ def start_button_click(n_clicks: int | None) -> tuple[str, bool]:
         str: Message to display on the control app
         bool: Whether to disable data updates
     """
-    message = start_model() if LIVE_MODEL else "Playback started"
+    if LIVE_MODEL:
+        message = start_model()
+    else:
+        PLAYBACK.play()
+        message = "Playback started"
     log.debug(message)
     return message, False
 
@@ -342,7 +418,11 @@ def stop_button_click(n_clicks: int | None) -> tuple[str, bool]:
         str: Message to display on the control app
         bool: Whether to disable data updates
     """
-    message = stop_model() if LIVE_MODEL else "Playback stopped"
+    if LIVE_MODEL:
+        message = stop_model()
+    else:
+        PLAYBACK.pause()
+        message = "Playback stopped"
     log.debug(message)
     return message, True
 
@@ -350,7 +430,7 @@ def stop_button_click(n_clicks: int | None) -> tuple[str, bool]:
 @callback(
     [
         Output("message", "children", allow_duplicate=True),
-        Output("data_interval", "n_intervals"),
+        Output("data_interval", "n_intervals", allow_duplicate=True),
         Output("data_interval", "disabled", allow_duplicate=True),
     ],
     [Input("button_restart", "n_clicks")],
@@ -370,6 +450,7 @@ def restart_button_click(n_clicks: int | None) -> tuple[str, int, bool]:
         bool: False (re-)enables data updates
     """
     log.debug("Clicked Restart Button!")
+    PLAYBACK.seek(0)
     try:
         core.refresh_sections()
     except requests.exceptions.ConnectionError:
@@ -377,10 +458,75 @@ def restart_button_click(n_clicks: int | None) -> tuple[str, int, bool]:
     return "Clicked Restart Button!", 0, False
 
 
+@callback(
+    Output("message", "children", allow_duplicate=True),
+    [Input("button_profile", "n_clicks")],
+    prevent_initial_call=True,
+)
+def profile_button_click(n_clicks: int | None) -> list[str]:
+    """Function for profile button.
+
+    Switches on profiling of the next updates of each page and of the data.
+
+    Args:
+        n_clicks (int | None): Number of times the button has been clicked
+
+    Returns:
+        list[str]: Message to display on the control app
+    """
+    profiling.arm(PROFILE_INVOCATIONS)
+    return [f"Profiling the next {PROFILE_INVOCATIONS} updates to logs/"]
+
+
+@callback(
+    [
+        Output("message", "children", allow_duplicate=True),
+        Output("data_interval", "n_intervals", allow_duplicate=True),
+    ],
+    [Input("seek-slider", "value")],
+    prevent_initial_call=True,
+)
+def seek_slider_change(value: int) -> tuple[str, int]:
+    """Function for the seek slider.
+
+    Jumps the data to the chosen timestep, from which the updates continue.
+
+    Args:
+        value (int): The chosen timestep
+
+    Returns:
+        str: Message to display on the control app
+        int: Data interval of the timestep
+    """
+    log.debug(f"Seeking to timestep {value}")
+    PLAYBACK.seek(value)
+    return f"Jumped to timestep {value}", value
+
+
 @callback(
     [Output("data_interval", "interval")], [Input("update-interval-slider", "value")]
 )
 def update_data_interval(value: int) -> tuple[int]:
-    """Callback to update the data interval."""
+    """Callback to update the data interval, which is the time per row at 1x."""
     log.debug(f"Update interval set to {value} seconds.")
+    PLAYBACK.set_interval(value)
     return (value * 1000,)
+
+
+@callback(
+    Output("message", "children", allow_duplicate=True),
+    [Input("speed-dropdown", "value")],
+    prevent_initial_call=True,
+)
+def speed_dropdown_change(value: int) -> list[str]:
+    """Function for the playback speed dropdown.
+
+    Args:
+        value (int): Rows of data to advance per update interval
+
+    Returns:
+        list[str]: Message to display on the control app
+    """
+    log.debug(f"Playback speed set to {value}x")
+    PLAYBACK.set_speed(value)
+    return [f"Playback speed set to {value}×"]
@@ -6,57 +6,75 @@ One plots:
 """
 
 import dash  # type: ignore
-import pandas as pd
 import plotly.graph_objects as go  # type: ignore
-from dash import Input, Output, callback, dcc  # type: ignore
+from dash import Input, Output, State, callback, dcc, html  # type: ignore
 
-from .. import log
+from .. import log, metrics, profiling
 from ..figures import (
     generate_map_fig,
 )
 from ..layout import GridBuilder
+from ..scheduler import Refresh, Refreshed, Schedule
 
 dash.register_page(__name__)
 
-df = pd.DataFrame({"Col": [0]})
+SCHEDULE = Schedule("map", Refresh(generate_map_fig))
 
-map_fig = generate_map_fig(df)
 
-grid = GridBuilder(rows=1, cols=1)
-grid.add_element(
-    dcc.Graph(
-        id="big_map_fig",
-        figure=map_fig,
-        style={"height": "100%", "width": "100%"},
-    ),
-    row=0,
-    col=0,
-)
-layout = grid.layout
+def layout(**kwargs: str) -> html.Div:
+    """Builds the page layout with empty figures.
+
+    The figures are filled in by the first call of update_figures.
+
+    Args:
+        kwargs: Query parameters of the page URL (unused)
+
+    Returns:
+        html.Div: The page layout
+    """
+    grid = GridBuilder(rows=1, cols=1)
+    grid.add_element(
+        dcc.Graph(
+            id="big_map_fig",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=0,
+        col=0,
+    )
+    return html.Div([grid.layout, *SCHEDULE.components()])
 
 
 @callback(
     [
         Output("big_map_fig", "figure"),
+        Output(SCHEDULE.store_id, "data"),
+        Output("rendered_interval", "data", allow_duplicate=True),
     ],
     [Input("figure_interval", "data")],
+    [State(SCHEDULE.store_id, "data")],
+    prevent_initial_call="initial_duplicate",
 )
+@metrics.timed_callback("map")
+@profiling.profiled("map")
 def update_figures(
     n_intervals: int,
-) -> tuple[go.Figure]:
-    """Function to update the plots in this page.
+    refreshed: Refreshed | None,
+) -> tuple[go.Figure | Refreshed | int, ...]:
+    """Function to update the plots in this page whose inputs have changed.
+
+    The figures always show the latest data, even if newer than n_intervals.
 
     Args:
         n_intervals (int): The number of times this page has updated.
             indexes by 1 every interval.
+        refreshed (Refreshed, optional): Version and time of the last refresh
+            of each figure sent to this client.
 
     Returns:
-        tuple[go.Figure, go.Figure, go.Figure, go.Figure, px.line]:
-            The new figures.
+        tuple[go.Figure, Refreshed, int]:
+            The new figures, or dash.no_update for those left unchanged, the
+            versions sent and the figure interval rendered.
     """
-    from ..data import DF_OPAL
-
-    # TODO: ensure each figure is using the correct dataframe
-    map_fig = generate_map_fig(DF_OPAL)
+    figures, refreshed = SCHEDULE.update(refreshed)
     log.debug("Updating figures on Map page")
-    return (map_fig,)
+    return (*figures, refreshed, n_intervals)
@@ -8,12 +8,10 @@ Four plots (2x2):
 """
 
 import dash  # type: ignore
-import pandas as pd
-import plotly.express as px  # type: ignore
-from dash import Input, Output, callback, dcc  # type: ignore
+from dash import Input, Output, State, callback, dcc, html  # type: ignore
 from plotly import graph_objects as go  # type: ignore
 
-from .. import log
+from .. import log, metrics, profiling
 from ..figures import (
     generate_dsr_commands_fig,
     generate_dsr_fig,
@@ -21,55 +19,64 @@ from ..figures import (
     generate_intraday_market_bids_fig,
 )
 from ..layout import GridBuilder
+from ..scheduler import Refresh, Refreshed, Schedule
 
 dash.register_page(__name__)
 
-df = pd.DataFrame({"Col": [0]})
+SCHEDULE = Schedule(
+    "market",
+    Refresh(generate_energy_deficit_fig, columns=("Time", "Energy Deficit")),
+    Refresh(generate_intraday_market_bids_fig, history=False),
+    Refresh(generate_dsr_fig, source="dsr"),
+    Refresh(generate_dsr_commands_fig, columns=("Time", "Agent", "Ev Demand")),
+)
 
-energy_deficit_fig = generate_energy_deficit_fig(df)
-intraday_market_bids_fig = generate_intraday_market_bids_fig(df)
-dsr_fig = generate_dsr_fig(df)
-dsr_commands_fig = generate_dsr_commands_fig(df)
 
+def layout(**kwargs: str) -> html.Div:
+    """Builds the page layout with empty figures.
 
-grid = GridBuilder(rows=2, cols=2)
-grid.add_element(
-    dcc.Graph(
-        id="graph-energy-deficit",
-        figure=energy_deficit_fig,
-        style={"height": "100%", "width": "100%"},
-    ),
-    row=0,
-    col=0,
-)
-grid.add_element(
-    dcc.Graph(
-        id="table-intraday-market-bids",
-        figure=intraday_market_bids_fig,
-        style={"height": "100%", "width": "100%"},
-    ),
-    row=0,
-    col=1,
-)
-grid.add_element(
-    dcc.Graph(
-        id="graph-dsr",
-        figure=dsr_fig,
-        style={"height": "100%", "width": "100%"},
-    ),
-    row=1,
-    col=0,
-)
-grid.add_element(
-    dcc.Graph(
-        id="graph-dsr-commands",
-        figure=dsr_commands_fig,
-        style={"height": "100%", "width": "100%"},
-    ),
-    row=1,
-    col=1,
-)
-layout = grid.layout
+    The figures are filled in by the first call of update_figures.
+
+    Args:
+        kwargs: Query parameters of the page URL (unused)
+
+    Returns:
+        html.Div: The page layout
+    """
+    grid = GridBuilder(rows=2, cols=2)
+    grid.add_element(
+        dcc.Graph(
+            id="graph-energy-deficit",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=0,
+        col=0,
+    )
+    grid.add_element(
+        dcc.Graph(
+            id="table-intraday-market-bids",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=0,
+        col=1,
+    )
+    grid.add_element(
+        dcc.Graph(
+            id="graph-dsr",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=1,
+        col=0,
+    )
+    grid.add_element(
+        dcc.Graph(
+            id="graph-dsr-commands",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=1,
+        col=1,
+    )
+    return html.Div([grid.layout, *SCHEDULE.components()])
 
 
 @callback(
@@ -78,32 +85,34 @@ layout = grid.layout
         Output("table-intraday-market-bids", "figure"),
         Output("graph-dsr", "figure"),
         Output("graph-dsr-commands", "figure"),
+        Output(SCHEDULE.store_id, "data"),
+        Output("rendered_interval", "data", allow_duplicate=True),
     ],
     [Input("figure_interval", "data")],
+    [State(SCHEDULE.store_id, "data")],
+    prevent_initial_call="initial_duplicate",
 )
+@metrics.timed_callback("market")
+@profiling.profiled("market")
 def update_figures(
     n_intervals: int,
-) -> tuple[px.line, go.Figure, go.Figure, px.line]:
-    """Function to update the plots in this page.
+    refreshed: Refreshed | None,
+) -> tuple[go.Figure | Refreshed | int, ...]:
+    """Function to update the plots in this page whose inputs have changed.
+
+    The figures always show the latest data, even if newer than n_intervals.
 
     Args:
         n_intervals (int): The number of times this page has updated.
             indexes by 1 every interval.
+        refreshed (Refreshed, optional): Version and time of the last refresh
+            of each figure sent to this client.
 
     Returns:
-        tuple[px.line, go.Figure, go.Figure, px.line]:
-            The new figures.
+        tuple[go.Figure, go.Figure, go.Figure, go.Figure, Refreshed, int]:
+            The new figures, or dash.no_update for those left unchanged, the
+            versions sent and the figure interval rendered.
     """
-    from ..data import DF_OPAL
-
-    energy_deficit_fig = generate_energy_deficit_fig(DF_OPAL)
-    intraday_market_bids_fig = generate_intraday_market_bids_fig(DF_OPAL)
-    dsr_fig = generate_dsr_fig(df)  # TODO: replace with df_dsr when available
-    dsr_commands_fig = generate_dsr_commands_fig(DF_OPAL)
+    figures, refreshed = SCHEDULE.update(refreshed)
     log.debug("Updating figures on Market page")
-    return (
-        energy_deficit_fig,
-        intraday_market_bids_fig,
-        dsr_fig,
-        dsr_commands_fig,
-    )
+    return (*figures, refreshed, n_intervals)
@@ -8,12 +8,10 @@ Four plots (2x2):
 """
 
 import dash  # type: ignore
-import pandas as pd
-from dash import Input, Output, callback, dcc  # type: ignore
+from dash import Input, Output, State, callback, dcc, html  # type: ignore
 from plotly import graph_objects as go  # type: ignore
 
-from .. import log
-from ..data import WESIM
+from .. import log, metrics, profiling
 from ..figures import (
     generate_balancing_market_fig,
     generate_intraday_market_sys_fig,
@@ -21,81 +19,112 @@ from ..figures import (
     generate_weather_fig,
 )
 from ..layout import GridBuilder
+from ..scheduler import SLOW_REFRESH, Refresh, Refreshed, Schedule
 
 dash.register_page(__name__)
 
-df = pd.DataFrame({"Col": [0]})
-
-weather_fig = generate_weather_fig(WESIM)
-balancing_market_fig = generate_balancing_market_fig(df)
-intraday_market_sys_fig = generate_intraday_market_sys_fig(df)
-reserve_generation_fig = generate_reserve_generation_fig(WESIM)
-
-grid = GridBuilder(rows=2, cols=2)
-grid.add_element(
-    dcc.Graph(
-        id="weather_fig",
-        figure=weather_fig,
-        style={"height": "100%", "width": "100%"},
-    ),
-    row=0,
-    col=0,
-)
-grid.add_element(
-    dcc.Graph(
-        id="balancing_market_fig",
-        figure=balancing_market_fig,
-        style={"height": "100%", "width": "100%"},
+SCHEDULE = Schedule(
+    "marketsreserve",
+    Refresh(generate_weather_fig, source="wesim"),
+    Refresh(
+        generate_balancing_market_fig,
+        columns=("Time", "Balancing Mechanism"),
+        min_interval=SLOW_REFRESH,
     ),
-    row=0,
-    col=1,
-)
-grid.add_element(
-    dcc.Graph(
-        id="intraday_market_sys_fig",
-        figure=intraday_market_sys_fig,
-        style={"height": "100%", "width": "100%"},
+    Refresh(
+        generate_intraday_market_sys_fig,
+        columns=("Time", "Intra-Day Market"),
+        min_interval=SLOW_REFRESH,
     ),
-    row=1,
-    col=0,
+    Refresh(generate_reserve_generation_fig, source="wesim"),
 )
-grid.add_element(
-    dcc.Graph(
-        id="reserve_generation_fig",
-        figure=reserve_generation_fig,
-        style={"height": "100%", "width": "100%"},
-    ),
-    row=1,
-    col=1,
-)
-layout = grid.layout
+
+
+def layout(**kwargs: str) -> html.Div:
+    """Builds the page layout with empty figures.
+
+    The figures are filled in by the first call of update_figures.
+
+    Args:
+        kwargs: Query parameters of the page URL (unused)
+
+    Returns:
+        html.Div: The page layout
+    """
+    grid = GridBuilder(rows=2, cols=2)
+    grid.add_element(
+        dcc.Graph(
+            id="weather_fig",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=0,
+        col=0,
+    )
+    grid.add_element(
+        dcc.Graph(
+            id="balancing_market_fig",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=0,
+        col=1,
+    )
+    grid.add_element(
+        dcc.Graph(
+            id="intraday_market_sys_fig",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=1,
+        col=0,
+    )
+    grid.add_element(
+        dcc.Graph(
+            id="reserve_generation_fig",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=1,
+        col=1,
+    )
+    return html.Div([grid.layout, *SCHEDULE.components()])
 
 
 @callback(
     [
+        Output("weather_fig", "figure"),
         Output("balancing_market_fig", "figure"),
         Output("intraday_market_sys_fig", "figure"),
+        Output("reserve_generation_fig", "figure"),
+        Output(SCHEDULE.store_id, "data"),
+        Output("rendered_interval", "data", allow_duplicate=True),
     ],
-    [Input("figure_interval", "data")],
+    [Input("figure_interval", "data"), Input(SCHEDULE.interval_id, "n_intervals")],
+    [State(SCHEDULE.store_id, "data")],
+    prevent_initial_call="initial_duplicate",
 )
+@metrics.timed_callback("marketsreserve")
+@profiling.profiled("marketsreserve")
 def update_figures(
     n_intervals: int,
-) -> tuple[go.Figure, go.Figure]:
-    """Function to update the plots in this page.
+    n_refreshes: int | None,
+    refreshed: Refreshed | None,
+) -> tuple[go.Figure | Refreshed | int, ...]:
+    """Function to update the plots in this page whose inputs have changed.
+
+    The figures always show the latest data, even if newer than n_intervals.
 
     Args:
         n_intervals (int): The number of times this page has updated.
             indexes by 1 every interval.
+        n_refreshes (int, optional): The number of times the refresh interval
+            has fired, which shows rate limited figures left out on the last
+            update.
+        refreshed (Refreshed, optional): Version and time of the last refresh
+            of each figure sent to this client.
 
     Returns:
-        tuple[go.Figure, go.Figure]: The new figures.
+        tuple[go.Figure, go.Figure, go.Figure, go.Figure, Refreshed, int]:
+            The new figures, or dash.no_update for those left unchanged, the
+            versions sent and the figure interval rendered.
     """
-    from ..data import DF_OPAL
-
-    balancing_market_fig = generate_balancing_market_fig(DF_OPAL)
-    intraday_market_sys_fig = generate_intraday_market_sys_fig(DF_OPAL)
-    log.debug("Updating figures of Markets and Reserve page")
-    return (
-        balancing_market_fig,
-        intraday_market_sys_fig,
-    )
+    figures, refreshed = SCHEDULE.update(refreshed)
+    log.debug("Updating figures on Markets and Reserve page")
+    return (*figures, refreshed, n_intervals)
@@ -8,11 +8,10 @@ Four plots (2x2):
 """
 
 import dash  # type: ignore
-import pandas as pd
-import plotly.express as px  # type: ignore
-from dash import Input, Output, callback, dcc  # type: ignore
+from dash import Input, Output, State, callback, dcc, html  # type: ignore
+from plotly import graph_objects as go  # type: ignore
 
-from .. import log
+from .. import log, metrics, profiling
 from ..figures import (
     generate_gen_split_fig,
     generate_system_freq_fig,
@@ -20,54 +19,65 @@ from ..figures import (
     generate_total_gen_fig,
 )
 from ..layout import GridBuilder
+from ..scheduler import Refresh, Refreshed, Schedule
+from ..schema import power_sources
 
 dash.register_page(__name__)
 
-df = pd.DataFrame({"Col": [0]})
+SCHEDULE = Schedule(
+    "supplydemand",
+    Refresh(generate_gen_split_fig, columns=("Time", *power_sources), history=False),
+    Refresh(generate_total_gen_fig, columns=("Time", "Total Generation")),
+    Refresh(generate_total_dem_fig, columns=("Time", "Total Demand")),
+    Refresh(generate_system_freq_fig, columns=("Time", "Total")),
+)
 
-gen_split_fig = generate_gen_split_fig(df)
-total_gen_fig = generate_total_gen_fig(df)
-total_dem_fig = generate_total_dem_fig(df)
-system_freq_fig = generate_system_freq_fig(df)
 
-grid = GridBuilder(rows=2, cols=2)
-grid.add_element(
-    dcc.Graph(
-        id="graph-gen-split",
-        figure=gen_split_fig,
-        style={"height": "100%", "width": "100%"},
-    ),
-    row=0,
-    col=0,
-)
-grid.add_element(
-    dcc.Graph(
-        id="graph-gen-total",
-        figure=total_gen_fig,
-        style={"height": "100%", "width": "100%"},
-    ),
-    row=0,
-    col=1,
-)
-grid.add_element(
-    dcc.Graph(
-        id="graph-demand",
-        figure=total_dem_fig,
-        style={"height": "100%", "width": "100%"},
-    ),
-    row=1,
-    col=0,
-)
-grid.add_element(
-    dcc.Graph(
-        id="graph-freq",
-        figure=system_freq_fig,
-        style={"height": "100%", "width": "100%"},
-    ),
-    row=1,
-    col=1,
-)
-layout = grid.layout
+def layout(**kwargs: str) -> html.Div:
+    """Builds the page layout with empty figures.
+
+    The figures are filled in by the first call of update_figures.
+
+    Args:
+        kwargs: Query parameters of the page URL (unused)
+
+    Returns:
+        html.Div: The page layout
+    """
+    grid = GridBuilder(rows=2, cols=2)
+    grid.add_element(
+        dcc.Graph(
+            id="graph-gen-split",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=0,
+        col=0,
+    )
+    grid.add_element(
+        dcc.Graph(
+            id="graph-gen-total",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=0,
+        col=1,
+    )
+    grid.add_element(
+        dcc.Graph(
+            id="graph-demand",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=1,
+        col=0,
+    )
+    grid.add_element(
+        dcc.Graph(
+            id="graph-freq",
+            style={"height": "100%", "width": "100%"},
+        ),
+        row=1,
+        col=1,
+    )
+    return html.Div([grid.layout, *SCHEDULE.components()])
 
 
 @callback(
@@ -76,26 +86,34 @@ layout = grid.layout
         Output("graph-gen-total", "figure"),
         Output("graph-demand", "figure"),
         Output("graph-freq", "figure"),
+        Output(SCHEDULE.store_id, "data"),
+        Output("rendered_interval", "data", allow_duplicate=True),
     ],
     [Input("figure_interval", "data")],
+    [State(SCHEDULE.store_id, "data")],
+    prevent_initial_call="initial_duplicate",
 )
+@metrics.timed_callback("supplydemand")
+@profiling.profiled("supplydemand")
 def update_figures(
     n_intervals: int,
-) -> tuple[px.pie, px.line, px.line, px.line]:
-    """Function to update the plots in this page.
+    refreshed: Refreshed | None,
+) -> tuple[go.Figure | Refreshed | int, ...]:
+    """Function to update the plots in this page whose inputs have changed.
+
+    The figures always show the latest data, even if newer than n_intervals.
 
     Args:
         n_intervals (int): The number of times this page has updated.
             indexes by 1 every interval.
+        refreshed (Refreshed, optional): Version and time of the last refresh
+            of each figure sent to this client.
 
     Returns:
-        tuple[px.pie, px.line, px.line, px.line]: The new figures.
+        tuple[go.Figure, go.Figure, go.Figure, go.Figure, Refreshed, int]:
+            The new figures, or dash.no_update for those left unchanged, the
+            versions sent and the figure interval rendered.
     """
-    from ..data import DF_OPAL
-
-    gen_split_fig = generate_gen_split_fig(DF_OPAL)
-    total_gen_fig = generate_total_gen_fig(DF_OPAL)
-    total_dem_fig = generate_total_dem_fig(DF_OPAL)
-    system_freq_fig = generate_system_freq_fig(DF_OPAL)
+    figures, refreshed = SCHEDULE.update(refreshed)
     log.debug("Updating figures on Supply & Demand page")
-    return gen_split_fig, total_gen_fig, total_dem_fig, system_freq_fig
+    return (*figures, refreshed, n_intervals)
@@ -0,0 +1,116 @@
+"""Playback of the pre-set or replayed OPAL data at a chosen speed.
+
+The row shown is worked out from the wall clock rather than counted in data
+updates: at 1x the data advances one row per update interval, and at 10x ten
+rows. Every data update renders the latest row only, so the rows in between are
+skipped rather than rendered and the cost of rendering does not grow with the
+speed. Late data updates skip rows too, so the playback keeps to the wall clock
+when rendering falls behind.
+"""
+
+import time
+
+SPEEDS = (1, 10, 60)  # rows per update interval offered on the control page
+
+
+class Playback:
+    """Position in the data, advanced by the wall clock while playing."""
+
+    def __init__(self, interval: float = 1.0) -> None:
+        """Initialise the playback at the first row.
+
+        The clock starts with the first call of advance.
+
+        Args:
+            interval (float, optional): Seconds per row at 1x. Defaults to 1.
+        """
+        self.interval = interval
+        self.speed = 1.0
+        self.playing = True
+        self._row = 0.0
+        self._time: float | None = None
+
+    def position(self, now: float | None = None) -> float:
+        """Get the current position.
+
+        Args:
+            now (float, optional): Monotonic time. Defaults to the current time.
+
+        Returns:
+            float: Row at the time, including the fraction towards the next.
+        """
+        if not self.playing or self._time is None:
+            return self._row
+        now = time.monotonic() if now is None else now
+        return self._row + (now - self._time) * self.speed / self.interval
+
+    def _rebase(self, row: float | None = None) -> None:
+        """Restart the clock from a row, by default the current position."""
+        now = time.monotonic()
+        self._row = self.position(now) if row is None else row
+        self._time = now if self._time is not None else None
+
+    def advance(self, rows: int) -> int:
+        """Get the row to show on a data update, starting the clock if needed.
+
+        The playback is paused when it reaches the last row.
+
+        Args:
+            rows (int): Number of rows of the data.
+
+        Returns:
+            int: The row to show.
+
+        >>> playback = Playback()
+        >>> playback.advance(100), playback.seek(99), playback.advance(100)
+        (0, None, 99)
+        >>> playback.playing
+        False
+        """
+        if self._time is None:
+            self._time = time.monotonic()
+        row = min(round(self.position()), rows - 1)
+        if row == rows - 1:
+            self.pause()
+            self._row = row
+        return row
+
+    def play(self) -> None:
+        """Continue playing from the current position."""
+        self._rebase()
+        self.playing = True
+
+    def pause(self) -> None:
+        """Stop the position at its current value."""
+        self._rebase()
+        self.playing = False
+
+    def seek(self, row: int) -> None:
+        """Jump to a row and continue playing from it.
+
+        Args:
+            row (int): The row.
+        """
+        self._rebase(row)
+        self.playing = True
+
+    def set_speed(self, speed: float) -> None:
+        """Change the speed from the current position onwards.
+
+        Args:
+            speed (float): Rows per interval.
+        """
+        self._rebase()
+        self.speed = speed
+
+    def set_interval(self, interval: float) -> None:
+        """Change the interval from the current position onwards.
+
+        Args:
+            interval (float): Seconds per row at 1x.
+        """
+        self._rebase()
+        self.interval = interval
+
+
+PLAYBACK = Playback()
@@ -1,27 +1,33 @@
 """Contains the logic for processing the pre-set data."""
 
+import os
 from glob import glob
+from pathlib import Path
 
 import pandas as pd
 
 from . import log
+from .data import OPAL_START_DATE, compact_opal, parse_time
 from .datahub_api import DataHubConnectionError, DataHubRequestError, get_opal_data
 
-OPAL_START_DATE = "2035-01-22 04:00"
+PRE_SET_DATA_PATH = Path(os.environ.get("PRE_SET_DATA_PATH", "data/opal"))
 
 
-def read_opal_data() -> pd.DataFrame:
-    """Function to get the pre-set opal data.
+def read_opal_csv(path: Path) -> pd.DataFrame:
+    """Function to read pre-set opal data with one CSV file per timestep.
 
     Note - this function still calls the datahub - just to get the column names.
     This requires the datahub to be running. For a fully independent solution, the
     data will need to come with the columns pre-defined.
 
+    Args:
+        path (Path): Directory of the CSV files.
+
     Returns:
         pd.DataFrame: Opal data with each row being the data at a certain time.
     """
     df = pd.DataFrame()
-    for index, file in enumerate(glob("data/opal/*.csv")):
+    for index, file in enumerate(glob(f"{path}/*.csv")):
         log.debug(f"Reading file: {file}")
         df[index] = pd.read_csv(file, header=0, index_col=0)
     df = (
@@ -39,15 +45,31 @@ def read_opal_data() -> pd.DataFrame:
         columns = pd.read_csv("data/opal_headers.csv").columns
 
     df.columns = columns[: df.shape[1]]
-    df = df.reindex(columns=columns)
+    return df.reindex(columns=columns)
+
+
+def read_opal_data(path: Path = PRE_SET_DATA_PATH) -> pd.DataFrame:
+    """Function to get the pre-set opal data.
+
+    Args:
+        path (Path, optional): Directory of CSV files with one file per timestep,
+            or a pickled frame with the columns already named (.pkl). Defaults to
+            PRE_SET_DATA_PATH.
+
+    Returns:
+        pd.DataFrame: Opal data with each row being the data at a certain time.
+    """
+    if path.suffix == ".pkl":
+        log.debug(f"Reading file: {path}")
+        df = pd.read_pickle(path)
+    else:
+        df = read_opal_csv(path)
 
-    df["Time"] = (
-        pd.Timestamp(OPAL_START_DATE) + pd.to_timedelta(df["Time"], unit="m")
-    ).astype(str)
+    df["Time"] = parse_time(df["Time"], OPAL_START_DATE)
 
-    return df
+    return compact_opal(df)
 
 
 OPAL_DATA = read_opal_data()
 
-log.debug(OPAL_DATA)
+log.debug(f"Read pre-set OPAL data with {len(OPAL_DATA)} rows")
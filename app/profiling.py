@@ -0,0 +1,82 @@
+"""Profiles the figure and data callbacks on demand.
+
+Profiling is switched on for the next N invocations of each wrapped callback,
+either at startup with the PROFILE_CALLBACKS environment variable or from the
+control page. Each profile is written to logs/ as a cProfile stats file that can
+be read with pstats or snakeviz. The state is kept per worker process.
+"""
+
+import cProfile
+import os
+import threading
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Callable
+
+from . import log
+
+PROFILE_DIR = Path("./logs")
+PROFILE_CALLBACKS = int(os.environ.get("PROFILE_CALLBACKS", 0))
+
+_remaining: dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def arm(invocations: int) -> None:
+    """Profile the next invocations of every wrapped callback.
+
+    Args:
+        invocations (int): Number of invocations of each callback to profile.
+    """
+    with _lock:
+        for name in _remaining:
+            _remaining[name] = invocations
+    log.info(f"Profiling the next {invocations} invocations of each callback")
+
+
+def _take(name: str) -> bool:
+    """Use up one of the profiled invocations of a callback, if any are left.
+
+    Args:
+        name (str): Name of the callback.
+
+    Returns:
+        bool: Whether this invocation should be profiled.
+    """
+    with _lock:
+        if _remaining[name] <= 0:
+            return False
+        _remaining[name] -= 1
+        return True
+
+
+def profiled(name: str) -> Callable:  # type: ignore[type-arg]
+    """Decorator that profiles a callback while profiling is switched on.
+
+    Args:
+        name (str): Name of the callback used in the profile file names
+
+    Returns:
+        Callable: Decorated function
+    """
+    _remaining[name] = PROFILE_CALLBACKS
+
+    def decorator(func: Callable) -> Callable:  # type: ignore[type-arg]
+        @wraps(func)
+        def wrapper(*args: object) -> object:
+            if not _take(name):
+                return func(*args)
+
+            profile = cProfile.Profile()
+            try:
+                return profile.runcall(func, *args)
+            finally:
+                timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+                path = PROFILE_DIR / f"profile_{name}_{timestamp}.prof"
+                profile.dump_stats(path)
+                log.info(f"Wrote profile of {name} to {path}")
+
+        return wrapper
+
+    return decorator
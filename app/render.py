@@ -0,0 +1,129 @@
+"""Cache of the latest figures, rendered in the background on each data update.
+
+Every data update submits the figures of all pages to a pool of RENDER_WORKERS
+processes, so that they are rendered once, in parallel, rather than by the first
+client to ask for them. Processes are used rather than threads because plotly
+express shares its default template between threads without locking it. The
+data is sent to the processes with each figure, and each figure is sent back as
+its plotly JSON, which is what the callbacks send to the browser, as building a
+figure again from JSON is slow. The figure durations of the processes are not
+recorded by their metrics. The page callbacks then read the figures from the cache,
+and a figure asked for before its render has finished is waited for rather than
+rendered again. Setting RENDER_WORKERS to 0 renders each figure in the callback
+that first asks for it, which is still shared by all other clients.
+
+Only the latest version of each figure is kept, and a figure is not submitted
+again while its previous render is still running, so that the work queued never
+grows beyond one render per figure when rendering is slower than the data.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable
+
+import pandas as pd
+from plotly import graph_objects as go  # type: ignore
+
+from .metrics import RENDER_CACHE_REQUESTS
+
+RENDER_WORKERS = int(os.environ.get("RENDER_WORKERS", 4))
+
+Data = pd.DataFrame | dict[str, pd.DataFrame]
+Render = Callable[[Data], go.Figure]
+
+
+def render(func: Render, data: Data) -> dict[str, object]:
+    """Render a figure as its plotly JSON, in a process of the pool.
+
+    Args:
+        func (Render): Function generating the figure from the data.
+        data (Data): The data, a frame or a dict of frames.
+
+    Returns:
+        dict[str, object]: The figure as plotly JSON.
+    """
+    figure: dict[str, object] = func(data).to_plotly_json()
+    return figure
+
+
+class RenderCache:
+    """The latest version of each figure, rendered once for all clients."""
+
+    def __init__(self, workers: int = RENDER_WORKERS) -> None:
+        """Initialise an empty cache.
+
+        Args:
+            workers (int, optional): Processes rendering in the background, or 0
+                to only render on request. Defaults to RENDER_WORKERS.
+        """
+        self._pool = (
+            ProcessPoolExecutor(workers, multiprocessing.get_context("spawn"))
+            if workers
+            else None
+        )
+        self._lock = threading.Lock()
+        self._entries: dict[Render, tuple[str, float, Future[go.Figure]]] = {}
+
+    def submit(
+        self,
+        func: Render,
+        data: Data,
+        version: str,
+        min_interval: float = 0.0,
+    ) -> None:
+        """Render a figure in the background unless it is cached or rendering.
+
+        Args:
+            func (Render): Function generating the figure from the data.
+            data (Data): The data, a frame or a dict of frames.
+            version (str): Version of the inputs of the figure.
+            min_interval (float, optional): Minimum seconds between background
+                renders of the figure. Defaults to 0.
+        """
+        if self._pool is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(func)
+            if entry and (
+                entry[0] == version
+                or not entry[2].done()
+                or now - entry[1] < min_interval
+            ):
+                return
+            future = self._pool.submit(render, func, data)
+            self._entries[func] = (version, now, future)
+
+    def figure(self, func: Render, data: Data, version: str) -> go.Figure:
+        """Get a figure, rendering it if it is neither cached nor rendering.
+
+        Args:
+            func (Render): Function generating the figure from the data.
+            data (Data): The data, a frame or a dict of frames.
+            version (str): Version of the inputs of the figure.
+
+        Returns:
+            go.Figure: The figure, or its plotly JSON if rendered in the background.
+        """
+        with self._lock:
+            entry = self._entries.get(func)
+            cached = entry is not None and entry[0] == version
+            if entry is not None and cached:
+                future = entry[2]
+            else:
+                future = Future()
+                self._entries[func] = (version, time.monotonic(), future)
+        RENDER_CACHE_REQUESTS.inc(result="hit" if cached else "miss")
+
+        if not cached:
+            try:
+                future.set_result(func(data))
+            except Exception as err:  # raised to every client waiting for it
+                future.set_exception(err)
+        return future.result()
+
+
+RENDER_CACHE = RenderCache()
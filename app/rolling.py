@@ -0,0 +1,62 @@
+"""Streaming aggregates over a sliding time window."""
+
+from collections import deque
+
+import numpy as np
+
+
+class RollingWindow:
+    """Mean, minimum and maximum of the values in a sliding time window.
+
+    The window holds the values with times in (t - window, t] for the latest time
+    t, like pandas' time-based rolling. Each value is added and removed once, and
+    the minimum and maximum are kept at the front of monotonic queues, so each
+    update costs O(1) amortised regardless of the size of the window.
+
+    >>> window = RollingWindow(np.timedelta64(2, "m"))
+    >>> minutes = np.datetime64("2035-01-22T04:00") + np.arange(4).astype("m8[m]")
+    >>> [window.push(t, v) for t, v in zip(minutes, [3.0, 1.0, 2.0, 5.0])]
+    [(3.0, 3.0, 3.0), (2.0, 1.0, 3.0), (1.5, 1.0, 2.0), (3.5, 2.0, 5.0)]
+    """
+
+    def __init__(self, window: np.timedelta64) -> None:
+        """Initialise an empty window.
+
+        Args:
+            window (np.timedelta64): Length of the window.
+        """
+        self.window = window
+        self._values: deque[tuple[np.datetime64, float]] = deque()
+        self._min: deque[tuple[np.datetime64, float]] = deque()
+        self._max: deque[tuple[np.datetime64, float]] = deque()
+        self._sum = 0.0
+
+    def push(self, time: np.datetime64, value: float) -> tuple[float, float, float]:
+        """Add the value at a later time than the previous values.
+
+        Args:
+            time (np.datetime64): Time of the value.
+            value (float): The value.
+
+        Returns:
+            tuple[float, float, float]: Mean, minimum and maximum of the window
+                ending at the time.
+        """
+        self._values.append((time, value))
+        self._sum += value
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((time, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((time, value))
+
+        start = time - self.window
+        while self._values[0][0] <= start:
+            self._sum -= self._values.popleft()[1]
+        while self._min[0][0] <= start:
+            self._min.popleft()
+        while self._max[0][0] <= start:
+            self._max.popleft()
+
+        return self._sum / len(self._values), self._min[0][1], self._max[0][1]
@@ -0,0 +1,247 @@
+"""Refreshes the figures of a page only when the data they read has changed.
+
+Each figure of a page is registered with the data source it reads, the columns
+it shows and whether it shows their history or only the latest values. On every
+tick the version of those inputs is compared with the version last sent to the
+client, which is kept in a store of the page, and figures with unchanged inputs
+are not regenerated or sent again. The WESIM data is loaded once, so the figures
+showing it are only sent on the first tick.
+
+Expensive figures may also be limited to one refresh every SLOW_REFRESH seconds
+per client. Pages with such figures add a refresh interval of that period to
+their inputs, so that the latest data is shown after the data stops changing.
+
+The figures are read from the render cache, to which the figures of every page
+are submitted by prerender on each data update, so that each version of a figure
+is only rendered once for all clients.
+
+Each page callback also reports the figure interval it has rendered, which holds
+back the sync callback of app.app from moving a client on to newer data until
+the figures of the previous data have been rendered.
+"""
+
+import hashlib
+import os
+import time
+from functools import cache
+from typing import Callable
+
+import dash  # type: ignore
+from dash import dcc  # type: ignore
+from plotly import graph_objects as go  # type: ignore
+
+from .render import RENDER_CACHE, Data
+
+SLOW_REFRESH = float(os.environ.get("SLOW_REFRESH", 5))  # seconds
+
+Refreshed = dict[str, tuple[str, float]]  # version and time sent of each figure
+
+
+def source_data(source: str) -> Data:
+    """Get the current data of a source.
+
+    Args:
+        source (str): "opal", "wesim" or "dsr".
+
+    Returns:
+        Data: The data, a frame or a dict of frames.
+    """
+    from . import data
+
+    if source == "opal":
+        return data.DF_OPAL
+    if source == "wesim":
+        return data.WESIM
+    if source == "dsr":
+        return data.DF_DSR
+    raise ValueError(f"Unknown data source {source}")
+
+
+@cache
+def matching(columns: tuple[str, ...], prefixes: tuple[str, ...]) -> list[str]:
+    """Get the columns starting with any of some prefixes.
+
+    Args:
+        columns (tuple[str, ...]): Columns of the frame.
+        prefixes (tuple[str, ...]): Column names or prefixes.
+
+    Returns:
+        list[str]: The matching columns.
+
+    >>> matching(("Time", "Ev Status (Idle)", "Pv Generation"), ("Ev Status",))
+    ['Ev Status (Idle)']
+    """
+    return [column for column in columns if column.startswith(prefixes)]
+
+
+def version(
+    data: Data,
+    columns: tuple[str, ...],
+    history: bool = True,
+) -> str:
+    """Get a version of the inputs of a figure that changes when they change.
+
+    Args:
+        data (Data): Data of the source, a frame or a dict of frames.
+        columns (tuple[str, ...]): Names or prefixes of the columns shown.
+        history (bool, optional): Whether all rows are shown rather than only the
+            last. Defaults to True.
+
+    Returns:
+        str: Hash of the number of columns and rows, the first time and the last
+            values shown.
+
+    >>> import pandas as pd
+    >>> df = pd.DataFrame({"Time": [0, 1], "Pv Generation": [2.0, 2.0]})
+    >>> version(df.iloc[:1], ("Pv",), history=False) == version(df, ("Pv",), False)
+    True
+    >>> version(df.iloc[:1], ("Pv",)) == version(df, ("Pv",))
+    False
+    """
+    key: list[object]
+    if isinstance(data, dict):
+        key = [(name, df.shape) for name, df in data.items()]
+    else:
+        key = [len(data.columns), len(data) if history else None]
+        if len(data):
+            if history and "Time" in data.columns:
+                key.append(data["Time"].array[0])
+            names = matching(tuple(map(str, data.columns)), columns)
+            key.extend(data[name].array[-1] for name in names)
+    return hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()
+
+
+class Refresh:
+    """A figure of a page and the inputs it is refreshed on."""
+
+    def __init__(
+        self,
+        func: Callable[[Data], go.Figure],
+        source: str = "opal",
+        columns: tuple[str, ...] = (),
+        history: bool = True,
+        min_interval: float = 0.0,
+    ) -> None:
+        """Initialise the refresh.
+
+        Args:
+            func (Callable): Function generating the figure from the data.
+            source (str, optional): Data source read by the figure, one of
+                "opal", "wesim" and "dsr". Defaults to "opal".
+            columns (tuple[str, ...], optional): Names or prefixes of the columns
+                shown. Defaults to none, i.e. only the number of rows.
+            history (bool, optional): Whether all rows are shown rather than only
+                the last. Defaults to True.
+            min_interval (float, optional): Minimum seconds between refreshes for
+                a client. Defaults to 0.
+        """
+        self.func = func
+        self.name = func.__name__
+        self.source = source
+        self.columns = columns
+        self.history = history
+        self.min_interval = min_interval
+
+
+class Schedule:
+    """The figures of a page, refreshed when their inputs change."""
+
+    def __init__(self, page: str, *refreshes: Refresh) -> None:
+        """Initialise the schedule and register it as that of the page.
+
+        Args:
+            page (str): Name of the page module, used in the ids of its
+                components.
+            refreshes (Refresh): The figures of the page in output order.
+        """
+        self.page = page
+        self.refreshes = refreshes
+        self.store_id = f"{page}-refreshed"
+        self.interval_id = f"{page}-refresh-interval"
+        SCHEDULES[page] = self
+
+    @property
+    def rate_limited(self) -> bool:
+        """Whether any figure has a minimum interval between refreshes."""
+        return any(refresh.min_interval for refresh in self.refreshes)
+
+    def components(self) -> list[dcc.Store | dcc.Interval]:
+        """Build the components holding the state of the schedule for a client.
+
+        Returns:
+            list: Store of the versions sent, and the refresh interval if any
+                figure is rate limited.
+        """
+        components = [dcc.Store(id=self.store_id, data={})]
+        if self.rate_limited:
+            interval = max(refresh.min_interval for refresh in self.refreshes)
+            components.append(
+                dcc.Interval(id=self.interval_id, interval=interval * 1e3)
+            )
+        return components
+
+    def update(self, refreshed: Refreshed | None) -> tuple[list[go.Figure], Refreshed]:
+        """Generate the figures whose inputs have changed since they were sent.
+
+        Args:
+            refreshed (Refreshed, optional): Version and time of the last refresh
+                of each figure sent to the client.
+
+        Returns:
+            tuple[list[go.Figure], Refreshed]: Each figure or
+                dash.no_update, and the new state of the store, or dash.no_update
+                if no figure was refreshed.
+        """
+        now = time.time()
+        refreshed = dict(refreshed or {})
+        figures = []
+        data: dict[str, Data] = {}
+        for refresh in self.refreshes:
+            if refresh.source not in data:
+                data[refresh.source] = source_data(refresh.source)
+            current = version(data[refresh.source], refresh.columns, refresh.history)
+            last = refreshed.get(refresh.name)
+            if last and (last[0] == current or now - last[1] < refresh.min_interval):
+                figures.append(dash.no_update)
+                continue
+            figures.append(
+                RENDER_CACHE.figure(refresh.func, data[refresh.source], current)
+            )
+            refreshed[refresh.name] = (current, now)
+
+        if all(figure is dash.no_update for figure in figures):
+            return figures, dash.no_update
+        return figures, refreshed
+
+
+SCHEDULES: dict[str, Schedule] = {}  # schedule of each page module with figures
+
+
+def prerender() -> None:
+    """Render the figures of every page in the background for the latest data."""
+    data: dict[str, Data] = {}
+    for schedule in SCHEDULES.values():
+        for refresh in schedule.refreshes:
+            if refresh.source not in data:
+                data[refresh.source] = source_data(refresh.source)
+            RENDER_CACHE.submit(
+                refresh.func,
+                data[refresh.source],
+                version(data[refresh.source], refresh.columns, refresh.history),
+                refresh.min_interval,
+            )
+
+
+def renders_figures(pathname: str | None) -> bool:
+    """Whether the page at a path renders figures on every data update.
+
+    Args:
+        pathname (str, optional): Path of the page in the browser.
+
+    Returns:
+        bool: True if the page has a schedule.
+    """
+    for page in dash.page_registry.values():
+        if page["relative_path"] == pathname:
+            return str(page["module"]).rsplit(".", 1)[-1] in SCHEDULES
+    return False
@@ -0,0 +1,113 @@
+"""Column groups of the OPAL data used by the figures, with their labels."""
+
+from functools import cache
+
+import pandas as pd
+
+power_sources = [
+    "Battery Generation",
+    "Interconnector Power",
+    "Offshore Wind Generation",
+    "Onshore Wind Generation",
+    "Other Generation",
+    "Pump Generation",
+    "Pv Generation",
+    "Nuclear Generation",
+    "Hydro Generation",
+    "Gas Generation",
+]
+
+
+def bracketed(column: str) -> str:
+    """Get the category name in the brackets of a column name.
+
+    Args:
+        column (str): Column name, e.g. "Ev Status (Idle)"
+
+    Returns:
+        str: The text between the brackets
+
+    >>> bracketed("Household Activity (Home Care)")
+    'Home Care'
+    """
+    return column.split("(")[1].split(")")[0]
+
+
+class ColumnGroup:
+    """Columns shown together by a figure, with their display labels."""
+
+    def __init__(self, names: list[str], labels: list[str]) -> None:
+        """Initialise the group.
+
+        Args:
+            names (list[str]): Columns of the group, in display order.
+            labels (list[str]): Display label of each column of the group.
+        """
+        self.names = names
+        self.labels = labels
+
+    @classmethod
+    def matching(cls, columns: tuple[str, ...], prefix: str) -> "ColumnGroup":
+        """Group the columns named with a prefix and a category in brackets.
+
+        Args:
+            columns (tuple[str, ...]): Columns of the frame.
+            prefix (str): Text the column names contain, e.g. "Ev Status".
+
+        Returns:
+            ColumnGroup: The matching columns labelled by their category.
+        """
+        names = [c for c in columns if prefix in c]
+        return cls(names, [bracketed(c) for c in names])
+
+    def last(self, df: pd.DataFrame) -> list[float]:
+        """Get the values of the group in the last row of a frame.
+
+        Args:
+            df (pd.DataFrame): Frame with the columns the group was built from.
+
+        Returns:
+            list[float]: Value of each column of the group.
+        """
+        # Columns looked up by name come from the frame's column cache, which is
+        # faster than positional indexing across the blocks of a mixed-dtype frame
+        return [df[name].array[-1] for name in self.names]
+
+
+class OpalSchema:
+    """Column groups of an OPAL frame."""
+
+    def __init__(self, columns: tuple[str, ...]) -> None:
+        """Initialise the schema.
+
+        Args:
+            columns (tuple[str, ...]): Columns of the frame.
+        """
+        self.household_activities = ColumnGroup.matching(columns, "Household Activity")
+        self.ev_statuses = ColumnGroup.matching(columns, "Ev Status")
+        self.power_sources = ColumnGroup(power_sources, power_sources)
+
+
+@cache
+def opal_schema(columns: tuple[str, ...]) -> OpalSchema:
+    """Get the schema of a set of columns, which is only built once.
+
+    Args:
+        columns (tuple[str, ...]): Columns of the frame.
+
+    Returns:
+        OpalSchema: The column groups.
+    """
+    return OpalSchema(columns)
+
+
+def get_schema(df: pd.DataFrame) -> OpalSchema:
+    """Get the schema of an OPAL frame.
+
+    Args:
+        df (pd.DataFrame): OPAL data.
+
+    Returns:
+        OpalSchema: The column groups of its columns.
+    """
+    return opal_schema(tuple(df.columns))
@@ -1,12 +1,26 @@
-"""Module for handling and displaying SVGs."""
+"""Module for handling and displaying SVGs.
+
+The static backgrounds are published at URLs named by the hash of their content,
+so that browsers cache them for good and the figures sent on every tick only
+reference them. The overlays change with every tick and stay inline.
+"""
 
 import base64
+import hashlib
 import math
+from functools import cache, cached_property
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 
+from . import LAZY_STARTUP
+
+SVG_ROUTE = "/svg/"
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+PUBLISHED: dict[str, "SVG"] = {}  # published SVGs by file name
+
 
 class SVG:
     """Class to format SVGs for display."""
@@ -32,17 +46,77 @@ class SVG:
         ]
         self.aspect_ratio = self.width / self.height
 
-        # Encode
+    @cached_property
+    def url(self) -> str:
+        """Data URI of the SVG, encoded on first use."""
         encoded = base64.b64encode(bytes(self.raw, "utf-8"))
-        self.url = f"data:image/svg+xml;base64,{encoded.decode()}"
+        return f"data:image/svg+xml;base64,{encoded.decode()}"
+
+    @cached_property
+    def digest(self) -> str:
+        """Hash of the content of the SVG.
+
+        >>> SVG('<svg width="10px" height="10px" ></svg>').digest
+        '1a8083a27c69c515'
+        """
+        return hashlib.sha256(self.raw.encode("utf-8")).hexdigest()[:16]
 
+    @cached_property
+    def static_url(self) -> str:
+        """URL the SVG is published at, which is served with SVG_ROUTE.
+
+        The URL changes whenever the content does, so it can be cached forever.
+        """
+        name = f"{self.digest}.svg"
+        PUBLISHED[name] = self
+        return f"{SVG_ROUTE}{name}"
+
+
+@cache
+def load_svg(name: str) -> SVG:
+    """Load one of the SVGs shipped with the app.
+
+    The file is only read the first time it is requested.
+
+    Args:
+        name (str): Name of the SVG file without extension, i.e. "map" or "sld"
+
+    Returns:
+        SVG: The loaded SVG
+    """
+    with open(Path(__file__).parent / f"{name}.svg", "rt", encoding="utf-8") as f:
+        return SVG(f.read())
+
+
+def __getattr__(name: str) -> SVG:
+    """Provide the background SVGs as svg_map and svg_sld module attributes."""
+    if name in ("svg_map", "svg_sld"):
+        return load_svg(name.removeprefix("svg_"))
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def published(name: str) -> SVG | None:
+    """Get a published SVG by its file name.
+
+    The backgrounds are published on first use, as the figures referencing them
+    may have been rendered by another process.
+
+    Args:
+        name (str): File name of the SVG, i.e. "<hash>.svg"
+
+    Returns:
+        SVG | None: The SVG, or None if no SVG is published under the name
+    """
+    if name not in PUBLISHED:
+        for background in ("map", "sld"):
+            load_svg(background).static_url
+    return PUBLISHED.get(name)
 
-"""Load SVGs"""
-with open(Path(__file__).parent / "map.svg", "rt", encoding="utf-8") as f:
-    svg_map = SVG(f.read())
 
-with open(Path(__file__).parent / "sld.svg", "rt", encoding="utf-8") as f:
-    svg_sld = SVG(f.read())
+if not LAZY_STARTUP:
+    # Load and encode the backgrounds up front rather than in the first figure
+    load_svg("map").static_url
+    load_svg("sld").static_url
 
 
 def write_agents_sld(
@@ -125,7 +199,7 @@ def get_agent_sld_coordinates(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: A dataframe agent counts at each x/y coordinate
     """
-    nodes = svg_sld.raw.split("<circle")[1:]
+    nodes = load_svg("sld").raw.split("<circle")[1:]
     x_coordinates = [float(c.split('cx="')[1].split('"')[0]) for c in nodes]
     y_coordinates = [float(c.split('cy="')[1].split('"')[0]) for c in nodes]
     counts = np.random.randint(0, 100, len(x_coordinates))
@@ -152,7 +226,7 @@ def get_ev_sld_coordinates(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: A dataframe EV counts at each x/y coordinate
     """
-    nodes = svg_sld.raw.split("<circle")[1:]
+    nodes = load_svg("sld").raw.split("<circle")[1:]
     x_coordinates = [float(c.split('cx="')[1].split('"')[0]) for c in nodes]
     y_coordinates = [float(c.split('cy="')[1].split('"')[0]) for c in nodes]
     counts = np.random.randint(0, 100, len(x_coordinates))
@@ -178,8 +252,8 @@ def get_agent_map_coordinates(df: pd.DataFrame) -> tuple[list[float], list[float
     Returns:
         tuple[list[float], list[float]]: lists of x and y coordinates
     """
-    x_coordinates = np.random.uniform(0, svg_map.width, 1000).tolist()
-    y_coordinates = np.random.uniform(0, svg_map.height, 1000).tolist()
+    x_coordinates = np.random.uniform(0, load_svg("map").width, 1000).tolist()
+    y_coordinates = np.random.uniform(0, load_svg("map").height, 1000).tolist()
     return x_coordinates, y_coordinates
 
 
@@ -199,8 +273,8 @@ def get_ev_map_coordinates(df: pd.DataFrame) -> tuple[list[float], list[float]]:
     Returns:
         tuple[list[float], list[float]]: lists of x and y coordinates
     """
-    x_coordinates = np.random.uniform(0, svg_map.width, 1000).tolist()
-    y_coordinates = np.random.uniform(0, svg_map.height, 1000).tolist()
+    x_coordinates = np.random.uniform(0, load_svg("map").width, 1000).tolist()
+    y_coordinates = np.random.uniform(0, load_svg("map").height, 1000).tolist()
     return x_coordinates, y_coordinates
 
 
@@ -218,7 +292,7 @@ def generate_sld_location_svg(
     Returns:
         SVG: SVG of EV/agent locations for placement over SLD
     """
-    svg = svg_sld.header
+    svg = load_svg("sld").header
     for _, row in location_data.iterrows():
         svg += write_agents_sld(
             centre_x=row["x"],
@@ -248,7 +322,7 @@ def generate_map_location_svg(
     Returns:
         SVG: SVG of EV/agent locations for placement over map
     """
-    svg = svg_map.header
+    svg = load_svg("map").header
     for x, y in zip(x_coordinates, y_coordinates):
         svg += (
             f'<circle fill="{colour}" '
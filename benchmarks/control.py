@@ -0,0 +1,118 @@
+"""Benchmark of the control page actions against the OVE Core stand-in.
+
+Measures the end-to-end latency of the update, swap and restart actions, e.g.
+
+    python -m benchmarks.control --latency 0.02 --iterations 50
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+import requests
+
+import app.app  # noqa: F401 - the Dash app must exist before its pages are imported
+from app import core_api as core
+from app.pages.control import get_default, restart_button_click, update_button_click
+
+from .ove_core import OVECoreStub
+from .timing import format_table, summarise
+
+SPACES = [
+    "Hub01",
+    "Hub02",
+    "PC01-Top",
+    "PC01-Left",
+    "PC01-Right",
+    "PC02-Top",
+    "PC02-Left",
+    "PC02-Right",
+]
+
+
+def time_action(
+    action: Callable[[int], object], iterations: int
+) -> tuple[list[float], int]:
+    """Time repeated calls of an action.
+
+    Args:
+        action (Callable): Function called with the iteration number.
+        iterations (int): Number of calls.
+
+    Returns:
+        tuple[list[float], int]: Duration of each call in seconds and the number
+            of calls that raised an error.
+    """
+    durations = []
+    errors = 0
+    for i in range(iterations):
+        start = time.perf_counter()
+        try:
+            action(i)
+        except (requests.exceptions.RequestException, ValueError, KeyError):
+            errors += 1
+        durations.append(time.perf_counter() - start)
+    return durations, errors
+
+
+def run(
+    iterations: int = 20,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    failure_rate: float = 0.0,
+) -> dict[str, dict[str, float]]:
+    """Run the control path benchmark.
+
+    Args:
+        iterations (int, optional): Number of calls per action. Defaults to 20.
+        latency (float, optional): Latency of the stand-in in seconds.
+            Defaults to 0.
+        jitter (float, optional): Jitter of the stand-in in seconds. Defaults to 0.
+        failure_rate (float, optional): Failure rate of the stand-in.
+            Defaults to 0.
+
+    Returns:
+        dict[str, dict[str, float]]: Timing summary for each action.
+    """
+    defaults = [get_default(space) for space in SPACES]
+    # Rotating the views makes every update change the app of each section
+    rotated = defaults[1:] + defaults[:1]
+
+    with OVECoreStub(latency=latency, jitter=jitter) as ove:
+        api_url = core.API_URL
+        core.API_URL = ove.url
+        try:
+            core.create_all(timeout=10)
+            ids = sorted(ove.sections)
+            ove.failure_rate = failure_rate
+
+            def update(i: int) -> None:
+                update_button_click(i, *(rotated if i % 2 else defaults))
+
+            def swap(i: int) -> None:
+                core.swap_sections(ids[1], ids[2])
+
+            results = {
+                "update": time_action(update, iterations),
+                "swap": time_action(swap, iterations),
+                "restart": time_action(restart_button_click, iterations),
+            }
+        finally:
+            core.API_URL = api_url
+
+    return {
+        action: summarise(durations) | {"errors": errors}
+        for action, (durations, errors) in results.items()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    print(
+        format_table(run(args.iterations, args.latency, args.jitter, args.failure_rate))
+    )
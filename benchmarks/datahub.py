@@ -0,0 +1,133 @@
+"""In-process stand-in for the DataHub API.
+
+Serves generated OPAL and WESIM data on the endpoints used by `app.datahub_api`.
+The OPAL data grows by one row every tick, like a running model. Run this module
+to serve it on the default DH_URL port for local development without the
+DataHub, e.g.
+
+    python -m benchmarks.datahub --timesteps 1440 --tick 2
+"""
+
+import argparse
+import json
+import threading
+import time
+
+import pandas as pd
+from flask import Response, jsonify, request
+
+from .scenario import generate_opal, generate_wesim
+from .stub import StubServer
+
+Split = dict[str, list[object]]
+
+
+def split(df: pd.DataFrame) -> Split:
+    """Convert a frame to the format in which the DataHub sends it.
+
+    Args:
+        df (pd.DataFrame): The frame.
+
+    Returns:
+        Split: The columns, index and data of the frame.
+    """
+    return df.to_dict(orient="split")  # type: ignore[return-value]
+
+
+class DataHubStub(StubServer):
+    """Stand-in for the DataHub API with a model producing one row per tick."""
+
+    def __init__(
+        self,
+        opal: pd.DataFrame | None = None,
+        wesim: dict[str, pd.DataFrame] | None = None,
+        tick: float = 0.0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialise the stand-in.
+
+        Args:
+            opal (pd.DataFrame, optional): OPAL data of the whole run with the time
+                in minutes, as from generate_opal. Defaults to a generated hour.
+            wesim (dict[str, pd.DataFrame], optional): WESIM data. Defaults to a
+                generated day of data.
+            tick (float, optional): Seconds between OPAL rows once the model is
+                running. Defaults to 0, which serves every row straight away.
+            latency (float, optional): Delay added to every request in seconds.
+                Defaults to 0.
+            jitter (float, optional): Upper bound of a uniformly distributed extra
+                delay in seconds. Defaults to 0.
+            failure_rate (float, optional): Probability that a request fails with
+                a 500 error. Defaults to 0.
+            seed (int, optional): Seed for the random delays and failures.
+                Defaults to None.
+        """
+        super().__init__(__name__, latency, jitter, failure_rate, seed)
+        self.opal = generate_opal() if opal is None else opal
+        self.wesim = {
+            key: split(df)
+            for key, df in (generate_wesim() if wesim is None else wesim).items()
+        }
+        self.tick = tick
+        self.started: float | None = time.monotonic()
+        self._cache: tuple[tuple[int, int], str] | None = None
+        self._state_lock = threading.Lock()
+
+        route = self.flask.route
+        route("/opal")(self.get_opal)
+        route("/wesim")(self.get_wesim)
+        route("/start")(self.is_running)
+        route("/stop")(self.is_stopped)
+        route("/set_model_signals", methods=["POST"])(self.set_model_signals)
+
+    @property
+    def rows(self) -> int:
+        """Number of OPAL rows produced by the model so far."""
+        if self.started is None or not self.tick:
+            return len(self.opal)
+        return min(
+            len(self.opal), 1 + int((time.monotonic() - self.started) / self.tick)
+        )
+
+    def get_opal(self) -> Response:
+        """Return the OPAL rows produced so far, optionally filtered by index."""
+        start = request.args.get("start", 0, type=int)
+        end = min(request.args.get("end", self.rows, type=int), self.rows)
+        with self._state_lock:
+            if self._cache is None or self._cache[0] != (start, end):
+                body = json.dumps({"data": split(self.opal.iloc[start:end])})
+                self._cache = ((start, end), body)
+            return Response(self._cache[1], mimetype="application/json")
+
+    def get_wesim(self) -> Response:
+        """Return the WESIM data."""
+        return jsonify({"data": self.wesim})
+
+    def is_running(self) -> Response:
+        """Return whether the model is already running."""
+        return jsonify(self.started is not None)
+
+    def is_stopped(self) -> Response:
+        """Return whether the model is already stopped."""
+        return jsonify(self.started is None)
+
+    def set_model_signals(self) -> str:
+        """Start or stop the model."""
+        start = request.args.get("start") == "True"
+        with self._state_lock:
+            self.started = time.monotonic() if start else None
+        return f"Model {'started' if start else 'stopped'}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--timesteps", type=int, default=60)
+    parser.add_argument("--tick", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=80)
+    args = parser.parse_args()
+    DataHubStub(generate_opal(timesteps=args.timesteps), tick=args.tick).flask.run(
+        port=args.port
+    )
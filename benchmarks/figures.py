@@ -0,0 +1,188 @@
+"""Benchmark of the figure generating functions over synthetic OPAL frames.
+
+Times every generate_*_fig function of app.figures and the SVG overlay helpers
+at several frame sizes, records the size of each figure's JSON payload and
+compares the results with a stored baseline, e.g.
+
+    python -m benchmarks.figures --save-baseline
+    python -m benchmarks.figures --threshold 1.5
+
+The comparison exits with a non-zero status if any figure is slower or larger
+than the baseline by more than the threshold ratio.
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+from app import figures, svg
+
+from .scenario import synthetic_opal, synthetic_wesim
+from .timing import format_table, summarise
+
+SIZES = (10, 1_000, 10_000, 100_000)
+BASELINE = Path(__file__).parent / "figures_baseline.json"
+SOURCES = {  # input of the figures that do not take the OPAL frame
+    "generate_weather_fig": "wesim",
+    "generate_reserve_generation_fig": "wesim",
+    "generate_dsr_fig": "dsr",
+}
+
+FIGURES = {
+    name: func
+    for name, func in vars(figures).items()
+    if name.startswith("generate_") and name.endswith("_fig")
+}
+
+
+def overlays(df: pd.DataFrame) -> dict[str, Callable[[], svg.SVG]]:
+    """SVG overlay helpers with their inputs taken from a frame.
+
+    Args:
+        df (pd.DataFrame): OPAL frame.
+
+    Returns:
+        dict[str, Callable[[], svg.SVG]]: Calls of each overlay helper.
+    """
+    return {
+        "generate_map_location_svg": lambda: svg.generate_map_location_svg(
+            *svg.get_agent_map_coordinates(df)
+        ),
+        "generate_sld_location_svg": lambda: svg.generate_sld_location_svg(
+            svg.get_agent_sld_coordinates(df)
+        ),
+    }
+
+
+def payload_size(result: object) -> int:
+    """Size in bytes of what a callback would send to the browser.
+
+    Args:
+        result (object): A figure or an SVG.
+
+    Returns:
+        int: Length of the figure's JSON or of the SVG's data URI.
+    """
+    if isinstance(result, svg.SVG):
+        return len(result.url)
+    return len(result.to_json())  # type: ignore[attr-defined]
+
+
+def time_call(call: Callable[[], object], repeats: int) -> tuple[dict[str, float], int]:
+    """Time repeated calls of a function after one warm up call.
+
+    Args:
+        call (Callable): Function to time.
+        repeats (int): Number of timed calls.
+
+    Returns:
+        tuple[dict[str, float], int]: Timing summary and payload size of the result.
+    """
+    size = payload_size(call())
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        call()
+        durations.append(time.perf_counter() - start)
+    return summarise(durations), size
+
+
+def run(
+    sizes: tuple[int, ...] = SIZES, repeats: int = 5
+) -> dict[str, dict[str, float]]:
+    """Run the figure benchmark.
+
+    Args:
+        sizes (tuple[int, ...], optional): Numbers of rows of the OPAL frames.
+            Defaults to SIZES.
+        repeats (int, optional): Number of timed calls of each function.
+            Defaults to 5.
+
+    Returns:
+        dict[str, dict[str, float]]: Timing summary and payload size in bytes of
+            each function, keyed by "<function>@<rows>".
+    """
+    wesim = synthetic_wesim()
+    results = {}
+    for rows in sizes:
+        df = synthetic_opal(rows)
+        inputs = {
+            "opal": df,
+            "dsr": df[["Time"]].assign(Cost=df["Dsr Cost"]),
+            "wesim": wesim,
+        }
+        calls: dict[str, Callable[[], object]] = {
+            name: partial(func, inputs[SOURCES.get(name, "opal")])
+            for name, func in FIGURES.items()
+        }
+        calls.update(overlays(df))
+        for name, call in calls.items():
+            summary, size = time_call(call, repeats)
+            results[f"{name}@{rows}"] = summary | {"bytes": size}
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    """Find the results that are worse than the baseline.
+
+    The median duration and the payload size are compared.
+
+    Args:
+        results (dict[str, dict[str, float]]): Results of this run.
+        baseline (dict[str, dict[str, float]]): Results of the baseline run.
+        threshold (float): Largest allowed ratio of a result to the baseline.
+
+    Returns:
+        list[str]: Description of each regression.
+
+    >>> compare({"f@10": {"p50": 3.0, "bytes": 10}},
+    ...         {"f@10": {"p50": 1.0, "bytes": 10}}, 1.5)
+    ['f@10: p50 3.00 vs 1.00 (x3.00)']
+    """
+    regressions = []
+    for name, result in results.items():
+        for key in ("p50", "bytes"):
+            if name not in baseline or not baseline[name].get(key):
+                continue
+            ratio = result[key] / baseline[name][key]
+            if ratio > threshold:
+                regressions.append(
+                    f"{name}: {key} {result[key]:.2f} vs {baseline[name][key]:.2f}"
+                    f" (x{ratio:.2f})"
+                )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    results = run(tuple(args.sizes), args.repeats)
+    print(format_table(results))
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"Saved baseline to {args.baseline}")
+    elif args.baseline.exists():
+        regressions = compare(
+            results, json.loads(args.baseline.read_text()), args.threshold
+        )
+        print("\n".join(regressions) or "No regressions against the baseline")
+        sys.exit(1 if regressions else 0)
+    else:
+        print(f"No baseline at {args.baseline}, run with --save-baseline first")
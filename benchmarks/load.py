@@ -0,0 +1,371 @@
+"""Load test of the Dash callbacks with many simulated clients.
+
+Starts the app with gunicorn in a subprocess against the DataHub stand-in, then
+simulates a control client that advances the data every tick and N page clients,
+like the OVE sections and tablets, that poll the update_figure_interval sync
+callback every 100 ms and update their figures when it changes, e.g.
+
+    python -m benchmarks.load --clients 16 --tick 2 --duration 60
+
+Reports the latency of each callback, the lag from a data tick to the figures
+of each page being updated, the request throughput and the CPU used by the app.
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import requests
+
+from .datahub import DataHubStub
+from .scenario import generate_opal
+
+ROOT = Path(__file__).parent.parent
+SYNC_INTERVAL = 0.1  # seconds, as the sync_interval of app.app
+
+Payload = dict[str, object]
+Callback = tuple[str, str, list[Payload], list[Payload]]  # path, output, inputs, state
+
+
+def payload(output: str, inputs: list[Payload], state: list[Payload]) -> Payload:
+    """Build the body of a request to /_dash-update-component.
+
+    Args:
+        output (str): Output key of the callback in the Dash callback map.
+        inputs (list[Payload]): Inputs with their values.
+        state (list[Payload]): State with its values.
+
+    Returns:
+        Payload: The request body sent by the Dash renderer.
+
+    >>> payload("..a.b..", [{"id": "c", "property": "d", "value": 1}], [])["outputs"]
+    [{'id': 'a', 'property': 'b'}]
+    """
+    outputs = []
+    for item in output.strip(".").split("..."):
+        component, prop = item.split("@")[0].rsplit(".", 1)
+        outputs.append({"id": component, "property": prop})
+    return {
+        "output": output,
+        "outputs": outputs,
+        "inputs": inputs,
+        "state": state,
+        "changedPropIds": [f"{i['id']}.{i['property']}" for i in inputs],
+    }
+
+
+def page_callbacks() -> dict[str, Callback]:
+    """Find the figure callback of each page.
+
+    Returns:
+        dict[str, Callback]: Path of the page, and the output key, inputs and state
+            of its callback driven by figure_interval, keyed by page name.
+    """
+    import dash  # type: ignore
+    from dash._callback import GLOBAL_CALLBACK_MAP  # type: ignore
+
+    import app.app  # noqa: F401
+
+    pages = {page["module"]: page for page in dash.page_registry.values()}
+    return {
+        pages[spec["callback"].__module__]["name"]: (
+            pages[spec["callback"].__module__]["relative_path"],
+            output,
+            spec["inputs"],
+            spec["state"],
+        )
+        for output, spec in GLOBAL_CALLBACK_MAP.items()
+        if spec["inputs"][0] == {"id": "figure_interval", "property": "data"}
+    }
+
+
+def free_port() -> int:
+    """Find a free local port."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return int(s.getsockname()[1])
+
+
+def cpu_seconds(url: str) -> float:
+    """Read the CPU time of the app from its metrics endpoint.
+
+    Args:
+        url (str): Base URL of the app.
+
+    Returns:
+        float: CPU seconds used by the worker process.
+    """
+    for line in requests.get(f"{url}/metrics", timeout=10).text.splitlines():
+        if line.startswith("process_cpu_seconds_total "):
+            return float(line.split()[1])
+    raise ValueError("No process_cpu_seconds_total in the metrics")
+
+
+def start_app(port: int, datahub: str, threads: int) -> subprocess.Popen[bytes]:
+    """Start the app with a single gunicorn worker and wait for it to serve.
+
+    Args:
+        port (int): Port to serve on.
+        datahub (str): URL of the DataHub.
+        threads (int): Number of request threads of the worker.
+
+    Returns:
+        subprocess.Popen: The gunicorn process.
+    """
+    env = os.environ | {
+        "LIVE_MODEL": "1",
+        "PRODUCTION": "1",
+        "DH_URL": datahub,
+        "LOG_LEVEL": "WARNING",
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "-b",
+            f"127.0.0.1:{port}",
+            "-w",
+            "1",
+            "-k",
+            "gthread",
+            "--threads",
+            str(threads),
+            "app.app:server",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/metrics", timeout=1)
+            return server
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("The app did not start in time.")
+
+
+class LoadTest:
+    """Simulated clients of one app instance and their recorded timings."""
+
+    def __init__(self, url: str, pages: dict[str, Callback], tick: float) -> None:
+        """Initialise the load test.
+
+        Args:
+            url (str): Base URL of the app.
+            pages (dict[str, Callback]): Figure callback of each page.
+            tick (float): Seconds between data updates.
+        """
+        self.endpoint = f"{url}/_dash-update-component"
+        self.pages = pages
+        self.tick = tick
+        self.latency: dict[str, list[float]] = defaultdict(list)
+        self.lag: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.tick_times: dict[int, float] = {}
+        self.stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def post(
+        self, session: requests.Session, name: str, body: Payload
+    ) -> requests.Response | None:
+        """Send a callback request and record its latency.
+
+        Args:
+            session (requests.Session): Session of the client.
+            name (str): Name to record the latency under.
+            body (Payload): Request body.
+
+        Returns:
+            requests.Response | None: The response, or None if the request failed.
+        """
+        start = time.perf_counter()
+        try:
+            response = session.post(self.endpoint, json=body, timeout=30)
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            with self._lock:
+                self.errors[name] += 1
+            return None
+        with self._lock:
+            self.latency[name].append(time.perf_counter() - start)
+        return response
+
+    def control(self) -> None:
+        """Advance the data every tick, like the data_interval of the control page."""
+        session = requests.Session()
+        n = 0
+        while not self.stop.wait(self.tick):
+            n += 1
+            trigger = [{"id": "data_interval", "property": "n_intervals", "value": n}]
+            body = payload("..data_interval.disabled..", trigger, [])
+            if self.post(session, "update_data", body) is not None:
+                self.tick_times[n] = time.perf_counter()
+
+    def client(self, page: str) -> None:
+        """Poll the sync callback and update the figures of a page when it changes.
+
+        The client keeps the store of the figure versions it was sent, like a
+        browser, so that only the figures with changed inputs are sent again.
+
+        Args:
+            page (str): Name of the page shown by the client.
+        """
+        session = requests.Session()
+        figure_interval = 0
+        n_sync = 0
+        path, output, callback_inputs, callback_state = self.pages[page]
+        stores: dict[str, object] = {}
+
+        def store(component: str) -> Payload:
+            return {"id": component, "property": "data", "value": stores.get(component)}
+
+        while not self.stop.is_set():
+            start = time.perf_counter()
+            n_sync += 1
+            trigger = [
+                {"id": "sync_interval", "property": "n_intervals", "value": n_sync}
+            ]
+            state: list[Payload] = [
+                {"id": "figure_interval", "property": "data", "value": figure_interval},
+                store("rendered_interval"),
+                store("sync_state"),
+                {"id": "_pages_location", "property": "pathname", "value": path},
+            ]
+            response = self.post(
+                session,
+                "sync",
+                payload("..figure_interval.data...sync_state.data..", trigger, state),
+            )
+            if response is not None and response.status_code == 200:
+                synced = response.json()["response"]
+                figure_interval = synced["figure_interval"]["data"]
+                stores["sync_state"] = synced["sync_state"]["data"]
+                inputs = [
+                    dict(item, value=figure_interval if i == 0 else None)
+                    for i, item in enumerate(callback_inputs)
+                ]
+                body = payload(
+                    output, inputs, [store(str(item["id"])) for item in callback_state]
+                )
+                figures = self.post(session, page, body)
+                if figures is not None:
+                    # Dash responds with no content when no figure has changed
+                    response_json = figures.json() if figures.status_code == 200 else {}
+                    for component, props in response_json.get("response", {}).items():
+                        if "data" in props:
+                            stores[component] = props["data"]
+                    with self._lock:
+                        if figure_interval in self.tick_times:
+                            self.lag[page].append(
+                                time.perf_counter() - self.tick_times[figure_interval]
+                            )
+            time.sleep(max(0.0, SYNC_INTERVAL - (time.perf_counter() - start)))
+
+    def run(self, clients: int, duration: float) -> float:
+        """Run the simulated clients.
+
+        Args:
+            clients (int): Number of page clients, assigned to the pages in turn.
+            duration (float): Seconds to run for.
+
+        Returns:
+            float: Measured duration in seconds.
+        """
+        names = list(self.pages)
+        threads = [threading.Thread(target=self.control)] + [
+            threading.Thread(target=self.client, args=(names[i % len(names)],))
+            for i in range(clients)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        self.stop.set()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start
+
+
+def run(
+    clients: int = 6,
+    tick: float = 2.0,
+    duration: float = 30.0,
+    threads: int = 8,
+    timesteps: int = 1440,
+    pages: list[str] | None = None,
+) -> tuple[dict[str, dict[str, float]], dict[str, float]]:
+    """Run the load test.
+
+    Args:
+        clients (int, optional): Number of page clients. Defaults to 6.
+        tick (float, optional): Seconds between data updates. Defaults to 2.
+        duration (float, optional): Seconds to run for. Defaults to 30.
+        threads (int, optional): Request threads of the app. Defaults to 8.
+        timesteps (int, optional): Number of OPAL rows of the DataHub stand-in.
+            Defaults to 1440.
+        pages (list[str], optional): Pages shown by the clients. Defaults to
+            every page with figures.
+
+    Returns:
+        tuple[dict[str, dict[str, float]], dict[str, float]]: Latency summary of
+            each callback and figure lag of each page, and the totals of the run.
+    """
+    from .timing import summarise
+
+    callbacks = page_callbacks()
+    if pages:
+        callbacks = {page: callbacks[page] for page in pages}
+
+    with DataHubStub(generate_opal(timesteps=timesteps), tick=tick) as datahub:
+        port = free_port()
+        url = f"http://127.0.0.1:{port}"
+        server = start_app(port, datahub.url, threads)
+        try:
+            test = LoadTest(url, callbacks, tick)
+            cpu_start = cpu_seconds(url)
+            elapsed = test.run(clients, duration)
+            cpu = cpu_seconds(url) - cpu_start
+        finally:
+            server.terminate()
+            server.wait()
+
+    rows = {
+        name: summarise(samples) | {"errors": test.errors[name]}
+        for name, samples in test.latency.items()
+    } | {f"lag {page}": summarise(samples) for page, samples in test.lag.items()}
+    requests_total = sum(len(samples) for samples in test.latency.values())
+    totals = {
+        "requests": requests_total,
+        "throughput (req/s)": requests_total / elapsed,
+        "cpu (s)": cpu,
+        "cpu utilisation": cpu / elapsed,
+    }
+    return rows, totals
+
+
+if __name__ == "__main__":
+    from .timing import format_table
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--clients", type=int, default=6)
+    parser.add_argument("--tick", type=float, default=2.0)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--timesteps", type=int, default=1440)
+    parser.add_argument("--pages", nargs="+")
+    args = parser.parse_args()
+    rows, totals = run(
+        args.clients, args.tick, args.duration, args.threads, args.timesteps, args.pages
+    )
+    print(format_table(rows))
+    for name, value in totals.items():
+        print(f"{name}: {value:.2f}")
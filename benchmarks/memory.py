@@ -0,0 +1,85 @@
+"""Benchmark of the memory footprint of the OPAL data held by the app.
+
+Generates a run of the model, by default 24 hours at minute resolution, and
+compares the footprint of the OPAL frame as received from the DataHub, with
+64-bit numbers, with that of the compact dtypes of app.data.opal_dtypes, e.g.
+
+    python -m benchmarks.memory --agents 7700 --timesteps 1440
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.data import COUNT_PREFIXES, OPAL_START_DATE, compact_opal, parse_time
+
+from .scenario import generate_opal
+
+
+def footprint(df: pd.DataFrame) -> dict[str, float]:
+    """Memory used by a frame, in total and by column group.
+
+    Args:
+        df (pd.DataFrame): OPAL data.
+
+    Returns:
+        dict[str, float]: Bytes used in total, per row and by the time, the agent
+            counts and the measurements.
+    """
+    usage = df.memory_usage(deep=True, index=False)
+    counts = usage[[str(c).startswith(COUNT_PREFIXES) for c in usage.index]].sum()
+    total = int(usage.sum())
+    return {
+        "bytes": total,
+        "per row": total / len(df),
+        "time": int(usage["Time"]),
+        "counts": int(counts),
+        "measures": int(total - usage["Time"] - counts),
+    }
+
+
+def run(
+    agents: int = 7700, timesteps: int = 1440, resolution: float = 1.0
+) -> dict[str, dict[str, float]]:
+    """Run the memory benchmark.
+
+    Args:
+        agents (int, optional): Number of agents. Defaults to 7700.
+        timesteps (int, optional): Number of rows. Defaults to 1440.
+        resolution (float, optional): Minutes between rows. Defaults to 1.
+
+    Returns:
+        dict[str, dict[str, float]]: Footprint of the frame before and after the
+            conversion, plus the time taken by the conversion in milliseconds and
+            the largest relative error of the measurements in parts per million.
+    """
+    df = generate_opal(agents, timesteps, resolution)
+    df["Time"] = parse_time(df["Time"], OPAL_START_DATE)
+
+    start = time.perf_counter()
+    compact = compact_opal(df)
+    duration = time.perf_counter() - start
+
+    measures = [c for c, dtype in compact.dtypes.items() if dtype == np.float32]
+    error = (compact[measures] - df[measures]).abs() / df[measures].abs()
+    return {
+        "64-bit": footprint(df),
+        "compact": footprint(compact)
+        | {"ms": duration * 1000, "err ppm": float(error.max().max()) * 1e6},
+    }
+
+
+if __name__ == "__main__":
+    from .timing import format_table
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--agents", type=int, default=7700)
+    parser.add_argument("--timesteps", type=int, default=1440)
+    parser.add_argument("--resolution", type=float, default=1.0)
+    args = parser.parse_args()
+    results = run(args.agents, args.timesteps, args.resolution)
+    print(format_table(results))
+    ratio = results["compact"]["bytes"] / results["64-bit"]["bytes"]
+    print(f"compact/64-bit: {ratio:.2f}")
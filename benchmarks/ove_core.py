@@ -0,0 +1,126 @@
+"""In-process stand-in for the OVE Core API.
+
+Implements the endpoints used by `app.core_api` and keeps the section state in
+memory, seeded with the spaces in `config/Spaces.json`. Run this module to serve
+it on the default API_URL port for local development without OVE.
+"""
+
+import json
+import threading
+from pathlib import Path
+
+from flask import Response, abort, jsonify, request
+
+from .stub import StubServer
+
+SPACES_FILE = Path(__file__).parent.parent / "config" / "Spaces.json"
+
+Section = dict[str, str | int | dict[str, str | dict[str, str]]]
+
+
+class OVECoreStub(StubServer):
+    """Stand-in for the OVE Core API that keeps section state."""
+
+    def __init__(
+        self,
+        spaces_file: Path = SPACES_FILE,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialise the stand-in with the spaces in a Spaces.json file.
+
+        Args:
+            spaces_file (Path, optional): Path to the OVE Spaces.json file.
+                Defaults to config/Spaces.json.
+            latency (float, optional): Delay added to every request in seconds.
+                Defaults to 0.
+            jitter (float, optional): Upper bound of a uniformly distributed extra
+                delay in seconds. Defaults to 0.
+            failure_rate (float, optional): Probability that a request fails with
+                a 500 error. Defaults to 0.
+            seed (int, optional): Seed for the random delays and failures.
+                Defaults to None.
+        """
+        super().__init__(__name__, latency, jitter, failure_rate, seed)
+        with open(spaces_file, "rt", encoding="utf-8") as f:
+            self.spaces: dict[str, list[dict[str, int]]] = json.load(f)
+        self.sections: dict[int, Section] = {}
+        self.refreshes = 0
+        self._next_id = 0
+        self._state_lock = threading.Lock()
+
+        route = self.flask.route
+        route("/app/html")(self.html_app)
+        route("/spaces")(self.get_spaces)
+        route("/section", methods=["POST"])(self.create_section)
+        route("/sections", methods=["GET"])(self.list_sections)
+        route("/sections", methods=["DELETE"])(self.delete_sections)
+        route("/sections/refresh", methods=["POST"])(self.refresh_sections)
+        route("/sections/<int:id_num>", methods=["GET"])(self.get_section)
+        route("/sections/<int:id_num>", methods=["POST"])(self.update_section)
+        route("/sections/<int:id_num>", methods=["DELETE"])(self.delete_section)
+
+    def html_app(self) -> str:
+        """Readiness endpoint of the html app."""
+        return "OK"
+
+    def get_spaces(self) -> Response:
+        """Return the geometry of every space."""
+        return jsonify(self.spaces)
+
+    def create_section(self) -> Response:
+        """Create a section from the request body."""
+        data = request.get_json()
+        if data.get("space") not in self.spaces:
+            abort(400)
+        with self._state_lock:
+            id_num = self._next_id
+            self._next_id += 1
+            self.sections[id_num] = {**data, "id": id_num}
+        return jsonify({"id": id_num})
+
+    def list_sections(self) -> Response:
+        """Return every section."""
+        with self._state_lock:
+            return jsonify(list(self.sections.values()))
+
+    def delete_sections(self) -> Response:
+        """Delete every section."""
+        with self._state_lock:
+            self.sections.clear()
+        return jsonify({})
+
+    def refresh_sections(self) -> Response:
+        """Refresh every section."""
+        with self._state_lock:
+            self.refreshes += 1
+        return jsonify({})
+
+    def get_section(self, id_num: int) -> Response:
+        """Return a section by ID."""
+        with self._state_lock:
+            if id_num not in self.sections:
+                abort(404)
+            return jsonify(self.sections[id_num])
+
+    def update_section(self, id_num: int) -> Response:
+        """Update a section by ID with the request body."""
+        data = request.get_json()
+        with self._state_lock:
+            if id_num not in self.sections:
+                abort(404)
+            self.sections[id_num] = {**self.sections[id_num], **data, "id": id_num}
+        return jsonify({"id": id_num})
+
+    def delete_section(self, id_num: int) -> Response:
+        """Delete a section by ID."""
+        with self._state_lock:
+            if self.sections.pop(id_num, None) is None:
+                abort(404)
+        return jsonify({})
+
+
+if __name__ == "__main__":
+    OVECoreStub().flask.run(port=8080)
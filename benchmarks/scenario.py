@@ -0,0 +1,321 @@
+"""Generator of synthetic OPAL and WESIM scenarios for scale testing.
+
+Writes a scenario with a given number of agents, timesteps and tick resolution
+in the layout read by app.pre_set_data, e.g.
+
+    python -m benchmarks.scenario data/scenarios/day --timesteps 1440
+    PRE_SET_DATA_PATH=data/scenarios/day/opal python -m app.app
+
+With --format binary the OPAL data is written as a single pickled frame
+(opal.pkl) instead of one CSV file per timestep. The WESIM data is written as
+wesim.json in the format served by the DataHub.
+"""
+
+import argparse
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+from app.data import OPAL_START_DATE, WESIM_START_DATE, compact_opal, parse_time
+from app.schema import power_sources
+
+OPAL_HEADERS = Path("data/opal_headers.csv")
+HOUSEHOLD_ACTIVITIES = {  # share of agents during the night and during the day
+    "Work": (0.0, 0.3),
+    "Study": (0.0, 0.05),
+    "Home Care": (0.05, 0.15),
+    "Personal Care": (0.03, 0.1),
+    "Shopping": (0.0, 0.1),
+    "Leisure": (0.02, 0.28),
+    "Sleep": (0.9, 0.02),
+}
+EV_STATUSES = {  # share of EVs during the night and during the day
+    "Charging": (0.85, 0.2),
+    "Travelling": (0.0, 0.3),
+    "Idle": (0.15, 0.5),
+}
+EV_CHARGING_POWER = 0.0074  # MW per charging EV
+AGENT_DEMAND = 0.004  # MW per agent at the peak of the day
+WESIM_REGIONS = ("Sc", "NE", "NW", "EW")
+
+
+def daylight(minutes: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Share of the day's activity at each time, peaking mid-afternoon.
+
+    Args:
+        minutes (NDArray[np.float64]): Minutes since the OPAL start time of 04:00.
+
+    Returns:
+        NDArray[np.float64]: Values from 0 during the night to 1 in the afternoon.
+    """
+    hour = (4 + minutes / 60) % 24
+    return np.clip(np.sin(np.pi * (hour - 6) / 16), 0, 1)
+
+
+def shares(
+    day: NDArray[np.float64], groups: dict[str, tuple[float, float]]
+) -> NDArray[np.float64]:
+    """Probability of each group at each time.
+
+    Args:
+        day (NDArray[np.float64]): Output of daylight.
+        groups (dict[str, tuple[float, float]]): Night and day share of each group.
+
+    Returns:
+        NDArray[np.float64]: Normalised probabilities, one row per time.
+    """
+    night, noon = np.array(list(groups.values())).T
+    p = night + np.outer(day, noon - night) + 1e-3
+    return p / p.sum(axis=1, keepdims=True)
+
+
+def walk(
+    rng: np.random.Generator, start: float, scale: float, steps: int
+) -> NDArray[np.float64]:
+    """Non-negative random walk.
+
+    Args:
+        rng (np.random.Generator): Random number generator.
+        start (float): Initial value.
+        scale (float): Standard deviation of each step.
+        steps (int): Number of values.
+
+    Returns:
+        NDArray[np.float64]: The walk.
+    """
+    return np.clip(start + np.cumsum(rng.normal(0, scale, steps)), 0, None)
+
+
+def generate_opal(
+    agents: int = 7700,
+    timesteps: int = 60,
+    resolution: float = 1.0,
+    evs: int | None = None,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """Generate OPAL data with the columns of data/opal_headers.csv.
+
+    Args:
+        agents (int, optional): Number of agents. Defaults to 7700.
+        timesteps (int, optional): Number of rows. Defaults to 60.
+        resolution (float, optional): Minutes between rows. Defaults to 1.
+        evs (int, optional): Number of EVs. Defaults to 7% of the agents.
+        seed (int, optional): Seed of the random values. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: OPAL data with the time in minutes since the start.
+    """
+    rng = np.random.default_rng(seed)
+    evs = round(agents * 0.07) if evs is None else evs
+    minutes = np.arange(timesteps) * resolution
+    day = daylight(minutes)
+    step = math.sqrt(resolution)
+
+    def noise(scale: float) -> NDArray[np.float64]:
+        return rng.normal(0, scale, timesteps)
+
+    df = pd.DataFrame(
+        0.0, index=range(timesteps), columns=pd.read_csv(OPAL_HEADERS).columns
+    )
+    df["Time"] = minutes
+
+    activities = rng.multinomial(agents, shares(day, HOUSEHOLD_ACTIVITIES))
+    for i, activity in enumerate(HOUSEHOLD_ACTIVITIES):
+        df[f"Household Activity ({activity})"] = activities[:, i]
+    statuses = rng.multinomial(evs, shares(day, EV_STATUSES))
+    for i, status in enumerate(EV_STATUSES):
+        df[f"Ev Status ({status})"] = statuses[:, i]
+
+    df["Expected Gridlington Demand"] = agents * AGENT_DEMAND * (0.6 + 0.4 * day)
+    df["Real Gridlington Demand"] = df["Expected Gridlington Demand"] + noise(0.2)
+    df["Expected Ev Charging Power"] = df["Ev Status (Charging)"] * EV_CHARGING_POWER
+    df["Real Ev Charging Power"] = df["Expected Ev Charging Power"] + noise(0.05)
+
+    df["Expected Demand"] = 28 + 12 * day
+    df["Real Demand"] = df["Expected Demand"] + noise(0.3)
+    df["Offshore Wind Generation"] = walk(rng, 16, 0.05 * step, timesteps)
+    df["Onshore Wind Generation"] = walk(rng, 9, 0.05 * step, timesteps)
+    df["Pv Generation"] = 8 * day
+    df["Nuclear Generation"] = 5.0
+    df["Hydro Generation"] = 0.05 + np.abs(noise(0.01))
+    df["Battery Generation"] = noise(0.5)
+    df["Interconnector Power"] = noise(1)
+    df["Pump Generation"] = noise(1)
+    df["Other Generation"] = 0.3 + np.abs(noise(0.05))
+    others = df[power_sources].sum(axis=1) - df["Gas Generation"]
+    df["Gas Generation"] = np.clip(df["Real Demand"] - others, 0, None)
+    df["Total Generation"] = df[power_sources].sum(axis=1)
+    df["Total Demand"] = df["Real Demand"]
+    df["Total Offshore Generation"] = df["Offshore Wind Generation"]
+    df["Exp. Offshore Wind Generation"] = df["Offshore Wind Generation"] * 1000
+    df["Real Offshore Wind Generation"] = df["Exp. Offshore Wind Generation"] + noise(
+        20
+    )
+
+    for market in ("Intra-Day Market", "Balancing Mechanism"):
+        for side in ("Generation", "Storage", "Demand"):
+            df[f"{market} {side}"] = noise(20)
+    df["Intra-Day Market Value"] = noise(2000)
+    df["Balancing Mechanism Value"] = noise(2000)
+    df["Balancing Mechanism Accepted Power"] = noise(20)
+    for level in ("Most", "More", "Current", "Less", "Least"):
+        df[f"Balancing Market Cost ({level})"] = noise(100)
+        df[f"Balancing Market Power ({level})"] = noise(50)
+    df["Dsr Cost"] = noise(0.5)
+    df["Accepted Dsr Amount"] = noise(0.5)
+    df["Dsr Charging"] = noise(0.5)
+    df["System Frequency"] = 50 + noise(0.05)
+    return df
+
+
+def generate_wesim(hours: int = 24, seed: int = 0) -> dict[str, pd.DataFrame]:
+    """Generate WESIM Regions and Capacity data.
+
+    Args:
+        hours (int, optional): Number of hours from the WESIM start time.
+            Defaults to 24.
+        seed (int, optional): Seed of the random values. Defaults to 0.
+
+    Returns:
+        dict[str, pd.DataFrame]: The Regions and Capacity frames.
+    """
+    rng = np.random.default_rng(seed)
+    regions = list(WESIM_REGIONS)
+    solar_capacity = rng.uniform(2000, 8000, len(regions))
+    wind_capacity = rng.uniform(2000, 8000, len(regions))
+    capacity = pd.DataFrame(
+        {"Code": regions, "Solar PV": solar_capacity, "Onshore wind": wind_capacity}
+    )
+
+    hour = np.arange(hours)
+    sun = np.clip(np.sin(np.pi * ((hour % 24) - 6) / 12), 0, 1)
+    output = [
+        pd.DataFrame(
+            {
+                "Code": code,
+                "Hour": hour,
+                "Solar PV": solar * sun * rng.uniform(0.5, 1, hours),
+                "Onshore wind": wind * rng.uniform(0, 0.2, hours),
+            }
+        )
+        for code, solar, wind in zip(regions, solar_capacity, wind_capacity)
+    ]
+    total = pd.concat(output).groupby("Hour", as_index=False).sum(numeric_only=True)
+    output.append(total.assign(Code="Total"))
+    capacity.loc[len(capacity)] = ["Total", solar_capacity.sum(), wind_capacity.sum()]
+    return {"Regions": pd.concat(output, ignore_index=True), "Capacity": capacity}
+
+
+def synthetic_opal(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Generate an OPAL frame as held by the app, with one row per minute.
+
+    Args:
+        rows (int): Number of rows.
+        seed (int, optional): Seed of the random values. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: Frame with the columns of data/opal_headers.csv.
+    """
+    df = generate_opal(timesteps=rows, seed=seed)
+    df["Time"] = parse_time(df["Time"], OPAL_START_DATE)
+    return compact_opal(df)
+
+
+def synthetic_wesim(seed: int = 0) -> dict[str, pd.DataFrame]:
+    """Generate WESIM data for one day as held by the app.
+
+    Args:
+        seed (int, optional): Seed of the random values. Defaults to 0.
+
+    Returns:
+        dict[str, pd.DataFrame]: The Regions and Capacity frames.
+    """
+    wesim = generate_wesim(24, seed)
+    wesim["Regions"]["Time"] = parse_time(
+        wesim["Regions"]["Hour"], WESIM_START_DATE, unit="h"
+    )
+    return wesim
+
+
+def write_csv(opal: pd.DataFrame, directory: Path) -> None:
+    """Write OPAL data as one CSV file per timestep, like data/opal/example.csv.
+
+    Each file holds the values of one row in the order sent by OPAL: the tick,
+    the first four columns, three unused values and the remaining columns.
+
+    Args:
+        opal (pd.DataFrame): OPAL data from generate_opal.
+        directory (Path): Directory to write the files to.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    values = opal.to_numpy()
+    for i, row in enumerate(values):
+        fields = [i + 1, *row[:4], 0, 0, 0, *row[4:]]
+        lines = "".join(f"{j},{float(v)}\n" for j, v in enumerate(fields))
+        (directory / f"{i:06d}.csv").write_text(",0\n" + lines)
+
+
+def write_wesim(wesim: dict[str, pd.DataFrame], path: Path) -> None:
+    """Write WESIM data in the format served by the DataHub.
+
+    Args:
+        wesim (dict[str, pd.DataFrame]): WESIM data from generate_wesim.
+        path (Path): File to write.
+    """
+    path.write_text(
+        json.dumps(
+            {key: json.loads(df.to_json(orient="split")) for key, df in wesim.items()}
+        )
+    )
+
+
+def write(
+    output: Path,
+    agents: int = 7700,
+    timesteps: int = 60,
+    resolution: float = 1.0,
+    binary: bool = False,
+    seed: int = 0,
+) -> None:
+    """Generate and write a scenario.
+
+    Args:
+        output (Path): Directory of the scenario.
+        agents (int, optional): Number of agents. Defaults to 7700.
+        timesteps (int, optional): Number of OPAL rows. Defaults to 60.
+        resolution (float, optional): Minutes between rows. Defaults to 1.
+        binary (bool, optional): Whether to pickle the OPAL data rather than write
+            CSV files. Defaults to False.
+        seed (int, optional): Seed of the random values. Defaults to 0.
+    """
+    opal = generate_opal(agents, timesteps, resolution, seed=seed)
+    output.mkdir(parents=True, exist_ok=True)
+    if binary:
+        opal.to_pickle(output / "opal.pkl")
+    else:
+        write_csv(opal, output / "opal")
+    hours = math.ceil(4 + timesteps * resolution / 60) + 1
+    write_wesim(generate_wesim(hours, seed), output / "wesim.json")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--agents", type=int, default=7700)
+    parser.add_argument("--timesteps", type=int, default=60)
+    parser.add_argument("--resolution", type=float, default=1.0)
+    parser.add_argument("--format", choices=["csv", "binary"], default="csv")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write(
+        args.output,
+        args.agents,
+        args.timesteps,
+        args.resolution,
+        args.format == "binary",
+        args.seed,
+    )
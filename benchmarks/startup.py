@@ -0,0 +1,161 @@
+"""Benchmark of worker startup time.
+
+Each run imports the Dash app in a fresh interpreter, as a new gunicorn worker
+would, then builds the layout of every page and finally loads the deferred
+resources and figures on first use. The import time of each module is taken from
+`python -X importtime`, e.g.
+
+    python -m benchmarks.startup --runs 5 --lazy
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from importlib import import_module
+from pathlib import Path
+
+# The timing helpers are imported where they are used so that their dependencies
+# are not counted as part of the startup of the probed interpreter
+ROOT = Path(__file__).parent.parent
+
+
+def probe() -> dict[str, float]:
+    """Time the startup of the app in the current interpreter.
+
+    Returns:
+        dict[str, float]: Durations in seconds keyed by stage, plus the peak
+            resident memory in MiB under "maxrss".
+    """
+    timings = {}
+    start = time.perf_counter()
+    import dash  # type: ignore
+
+    import app.app  # noqa: F401
+
+    timings["import app.app"] = time.perf_counter() - start
+
+    for page in dash.page_registry.values():
+        start = time.perf_counter()
+        layout = page["layout"]() if callable(page["layout"]) else page["layout"]
+        layout.to_plotly_json()
+        timings[f"layout {page['path']}"] = time.perf_counter() - start
+
+    from app.data import load_wesim
+    from app.svg import load_svg
+
+    start = time.perf_counter()
+    load_wesim()
+    timings["first use WESIM"] = time.perf_counter() - start
+    for name in ("map", "sld"):
+        start = time.perf_counter()
+        load_svg(name).static_url
+        timings[f"first use {name}.svg"] = time.perf_counter() - start
+    start = time.perf_counter()
+    import_module("app.pre_set_data")
+    timings["first use pre-set data"] = time.perf_counter() - start
+
+    for page in dash.page_registry.values():
+        module = import_module(page["module"])
+        if hasattr(module, "SCHEDULE"):
+            start = time.perf_counter()
+            module.SCHEDULE.update(None)
+            timings[f"first update {page['path']}"] = time.perf_counter() - start
+
+    timings["maxrss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return timings
+
+
+def parse_importtime(stderr: str) -> dict[str, float]:
+    r"""Parse the output of `python -X importtime`.
+
+    Args:
+        stderr (str): Standard error of the interpreter.
+
+    Returns:
+        dict[str, float]: Cumulative import time in seconds of each top level
+            import and self time of each module of the app.
+
+    >>> parse_importtime(
+    ...     "import time: self [us] | cumulative | imported package\n"
+    ...     "import time:       100 |        100 |   app.svg\n"
+    ...     "import time:       500 |       1500 | app\n"
+    ... )
+    {'import app.svg (self)': 0.0001, 'import app': 0.0015}
+    """
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        module = name.strip()
+        if not name.startswith("  "):
+            times[f"import {module}"] = int(cumulative_us) / 1e6
+        elif module.startswith("app."):
+            times[f"import {module} (self)"] = int(self_us) / 1e6
+    return times
+
+
+def run(
+    runs: int = 5, lazy: bool = False, top: int = 15
+) -> dict[str, dict[str, float]]:
+    """Probe the startup time in fresh interpreters.
+
+    Args:
+        runs (int, optional): Number of interpreters to start. Defaults to 5.
+        lazy (bool, optional): Whether to start the app with LAZY_STARTUP.
+            Defaults to False.
+        top (int, optional): Number of slowest module imports to report.
+            Defaults to 15.
+
+    Returns:
+        dict[str, dict[str, float]]: Timing summary for each startup stage and
+            the slowest module imports.
+    """
+    from .timing import summarise
+
+    env = os.environ.copy()
+    env.pop("LAZY_STARTUP", None)
+    if lazy:
+        env["LAZY_STARTUP"] = "true"
+    stages: dict[str, list[float]] = {}
+    imports: dict[str, list[float]] = {}
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "benchmarks.startup", "--probe"],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        for stage, value in json.loads(output.stdout.splitlines()[-1]).items():
+            stages.setdefault(stage, []).append(value)
+        for module, value in parse_importtime(output.stderr).items():
+            imports.setdefault(module, []).append(value)
+
+    maxrss = stages.pop("maxrss")
+    slowest = sorted(imports, key=lambda m: -sum(imports[m]))[:top]
+    return (
+        {stage: summarise(values) for stage, values in stages.items()}
+        | {module: summarise(imports[module]) for module in slowest}
+        | {"maxrss (MiB)": {"count": len(maxrss), "mean": sum(maxrss) / len(maxrss)}}
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--lazy", action="store_true", help="set LAZY_STARTUP")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.probe:
+        print(json.dumps(probe()))
+    else:
+        from .timing import format_table
+
+        print(format_table(run(args.runs, args.lazy, args.top)))
@@ -0,0 +1,107 @@
+"""Runs a Flask app in a background thread as a local stand-in for a service."""
+
+import random
+import threading
+import time
+from typing import TypeVar
+
+from flask import Flask, Response, abort
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler, make_server
+
+_Stub = TypeVar("_Stub", bound="StubServer")
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    """Request handler that does not log every request."""
+
+    def log_request(self, code: int | str = "-", size: int | str = "-") -> None:
+        """Skip request logging."""
+
+
+class StubServer:
+    """Base class for in-process stand-ins with latency and failure injection."""
+
+    def __init__(
+        self,
+        name: str,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialise the stand-in.
+
+        Args:
+            name (str): Name of the Flask app.
+            latency (float, optional): Delay added to every request in seconds.
+                Defaults to 0.
+            jitter (float, optional): Upper bound of a uniformly distributed extra
+                delay in seconds. Defaults to 0.
+            failure_rate (float, optional): Probability that a request fails with
+                a 500 error. Defaults to 0.
+            seed (int, optional): Seed for the random delays and failures.
+                Defaults to None.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: BaseWSGIServer | None = None
+        self._thread: threading.Thread | None = None
+
+        self.flask = Flask(name)
+        self.flask.before_request(self._inject)
+
+    def _inject(self) -> Response | None:
+        """Apply the configured latency and failures to an incoming request."""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            fail = self._rng.random() < self.failure_rate
+        if delay:
+            time.sleep(delay)
+        if fail:
+            abort(500)
+        return None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running stand-in."""
+        if self._server is None:
+            raise RuntimeError("Stand-in is not running.")
+        return f"http://{self._server.host}:{self._server.port}"
+
+    def start(self: _Stub, host: str = "127.0.0.1", port: int = 0) -> _Stub:
+        """Start serving in a daemon thread.
+
+        Args:
+            host (str, optional): Host to bind to. Defaults to "127.0.0.1".
+            port (int, optional): Port to bind to. Defaults to 0, which picks a
+                free port.
+
+        Returns:
+            StubServer: The running stand-in.
+        """
+        self._server = make_server(
+            host, port, self.flask, threaded=True, request_handler=_QuietRequestHandler
+        )
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self: _Stub) -> _Stub:
+        """Start the stand-in as a context manager."""
+        return self.start()
+
+    def __exit__(self, *args: object) -> None:
+        """Stop the stand-in when leaving the context."""
+        self.stop()
@@ -0,0 +1,56 @@
+"""Helpers for summarising and reporting benchmark timings."""
+
+import numpy as np
+
+
+def summarise(samples: list[float]) -> dict[str, float]:
+    """Summarise a list of timings.
+
+    Args:
+        samples (list[float]): Durations in seconds.
+
+    Returns:
+        dict[str, float]: Count, mean, p50, p95, p99 and max of the samples in
+            milliseconds (count is unitless).
+    """
+    if not samples:
+        return {"count": 0}
+    ms = np.asarray(samples) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "count": len(samples),
+        "mean": float(ms.mean()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "max": float(ms.max()),
+    }
+
+
+def format_table(rows: dict[str, dict[str, float]]) -> str:
+    """Format summaries as a fixed-width table.
+
+    Args:
+        rows (dict[str, dict[str, float]]): Summaries keyed by row label.
+
+    Returns:
+        str: The table, one row per label.
+
+    >>> print(format_table({"a": {"count": 2, "mean": 1.5}}))
+    name      count     mean
+    a             2     1.50
+    """
+    columns = list(dict.fromkeys(key for row in rows.values() for key in row))
+    width = max([len(label) for label in rows] + [4]) + 2
+    lines = ["name".ljust(width) + "".join(f"{c:>9}" for c in columns)]
+    for label, row in rows.items():
+        cells = [
+            (
+                " " * 9
+                if c not in row
+                else f"{row[c]:>9d}" if isinstance(row[c], int) else f"{row[c]:>9.2f}"
+            )
+            for c in columns
+        ]
+        lines.append(label.ljust(width) + "".join(cells))
+    return "\n".join(lines)
@@ -0,0 +1,39 @@
+import dash  # type: ignore
+
+from app import metrics
+from app.app import RENDER_TIMEOUT, update_figure_interval
+
+
+def test_sync_up_to_date(mocker):
+    """Test that the sync does nothing when the figures show the latest data."""
+    mocker.patch("app.data.N_INTERVALS_DATA", 3)
+    assert update_figure_interval(1, 3, 3, None, "/agent") is dash.no_update
+
+
+def test_sync_waits_for_render(mocker):
+    """Test that the sync waits until the figures of a page have been rendered."""
+    mocker.patch("app.data.N_INTERVALS_DATA", 5)
+    mocker.patch("app.app.time.time", return_value=100.0)
+    state = {"client": "abc", "time": 99.0}
+    assert update_figure_interval(1, 3, 2, state, "/agent") is dash.no_update
+
+    # Pages without figures and stalled renders do not hold the sync back
+    assert update_figure_interval(1, 3, 2, state, "/control")[0] == 5
+    state["time"] = 100.0 - RENDER_TIMEOUT
+    assert update_figure_interval(1, 3, 2, state, "/agent")[0] == 5
+
+
+def test_sync_coalesces(mocker):
+    """Test that the sync skips to the latest data and counts the dropped frames."""
+    mocker.patch("app.data.N_INTERVALS_DATA", 7)
+    mocker.patch("app.app.time.time", return_value=100.0)
+    inc = mocker.patch.object(metrics.DROPPED_FRAMES, "inc")
+
+    n_intervals, state = update_figure_interval(1, 3, 3, None, "/agent")
+    assert n_intervals == 7
+    assert state["time"] == 100.0
+    inc.assert_not_called()  # a new client has not dropped any frames
+
+    n_intervals, state = update_figure_interval(2, 3, 3, state, "/agent")
+    assert n_intervals == 7
+    inc.assert_called_once_with(3, client=state["client"])
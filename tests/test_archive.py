@@ -0,0 +1,103 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from app.archive import ArchiveReader, ArchiveWriter
+
+
+def opal(rows: int) -> pd.DataFrame:
+    """OPAL-like frame with one row per minute."""
+    return pd.DataFrame(
+        {
+            "Time": pd.date_range("2035-01-22 04:00", periods=rows, freq="min"),
+            "Ev Status (Idle)": np.arange(rows, dtype="uint16"),
+            "Total Demand": np.linspace(0, 1, rows, dtype="float32"),
+        }
+    )
+
+
+def test_archive_writer(tmp_path):
+    """Test that only new rows are appended and the chunks are indexed."""
+    writer = ArchiveWriter(tmp_path / "run", chunk_rows=2)
+    df = opal(5)
+    writer.append(df.iloc[:3])
+    writer.append(df.iloc[:3])
+    writer.append(df)
+    writer.close()
+
+    meta = json.loads((tmp_path / "run" / "meta.json").read_text())
+    assert meta["columns"] == ["Time", "Ev Status (Idle)", "Total Demand"]
+    assert meta["rows"] == 5
+    counts = np.fromfile(tmp_path / "run" / "1.bin", dtype=meta["dtypes"][1])
+    assert counts.tolist() == [0, 1, 2, 3, 4]
+    index = np.fromfile(tmp_path / "run" / "index.bin", dtype="datetime64[ns]")
+    assert (index == df["Time"].iloc[[0, 2, 4]].to_numpy()).all()
+
+
+def test_archive_writer_rejects_other_columns(tmp_path, mocker):
+    """Test that a frame with different columns is logged and not written."""
+    error = mocker.patch("app.archive.log.error")
+    writer = ArchiveWriter(tmp_path / "run")
+    writer.append(opal(2))
+    writer.append(opal(3).rename(columns={"Total Demand": "Other"}))
+    writer.close()
+
+    error.assert_called_once()
+    assert json.loads((tmp_path / "run" / "meta.json").read_text())["rows"] == 2
+
+
+def test_archive_reader(tmp_path):
+    """Test that snapshots map the archived rows and times are found by row."""
+    df = opal(5)
+    ArchiveWriter(tmp_path / "run", chunk_rows=2).write(df)
+    reader = ArchiveReader(tmp_path / "run")
+
+    snapshot = reader.snapshot(3)
+    assert snapshot.equals(df.iloc[:3])
+    assert isinstance(snapshot["Total Demand"].to_numpy().base, np.memmap)
+    assert reader.row(df["Time"].iloc[3] + pd.Timedelta("30s")) == 3
+    assert reader.row(df["Time"].iloc[0] - pd.Timedelta("1min")) == -1
+
+
+def test_update_data_replays_archive(tmp_path, mocker):
+    """Test that the data jumps to any timestep of a replayed run."""
+    from app import data
+    from app.archive import replay_reader
+    from app.playback import Playback
+
+    ArchiveWriter(tmp_path / "run").write(opal(5))
+    mocker.patch("app.archive.REPLAY_RUN", str(tmp_path / "run"))
+    playback = mocker.patch("app.data.PLAYBACK", Playback())
+    mocker.patch("app.scheduler.prerender")
+    replay_reader.cache_clear()
+
+    playback.seek(3)
+    assert data.update_data(1) == (False,)
+    assert len(data.DF_OPAL) == 4
+    playback.seek(7)
+    assert data.update_data(2) == (True,)
+    assert len(data.DF_OPAL) == 5
+    assert data.data_rows() == 5
+    replay_reader.cache_clear()
+
+
+def test_reference_overlay(tmp_path, mocker):
+    """Test that the reference run is aligned on the time since its start."""
+    from app import figures
+    from app.archive import reference, reference_reader
+
+    ArchiveWriter(tmp_path / "run").write(opal(5))
+    mocker.patch("app.archive.REFERENCE_RUN", str(tmp_path / "run"))
+    reference_reader.cache_clear()
+    df = opal(3).assign(Time=lambda df: df["Time"] + pd.Timedelta("1D"))
+
+    ref = reference(df)
+    assert ref is not None
+    assert ref["Time"].tolist() == df["Time"].tolist()
+    fig = figures.generate_total_dem_fig(df)
+    half = len(fig.data) // 2
+    assert fig.data[0].name == "Total Demand"
+    assert fig.data[half].name == "Total Demand (reference)"
+    assert all(trace.line.dash == "dash" for trace in fig.data[half:])
+    reference_reader.cache_clear()
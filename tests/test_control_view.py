@@ -1,6 +1,9 @@
 from app.pages.control import (
     default_button_click,
+    profile_button_click,
     restart_button_click,
+    seek_slider_change,
+    speed_dropdown_change,
     start_button_click,
     stop_button_click,
     update_button_click,
@@ -48,3 +51,32 @@ def test_data_interval_slider_callback():
     """Test Interval Slider."""
     output = update_data_interval(2)
     assert output[0] == 2000
+
+
+def test_profile_button_callback(mocker):
+    """Test Profile Button."""
+    patched_arm = mocker.patch("app.profiling.arm")
+    output = profile_button_click(0)
+    patched_arm.assert_called_once_with(10)
+    assert output[0] == "Profiling the next 10 updates to logs/"
+
+
+def test_seek_slider_callback():
+    """Test Seek Slider."""
+    output = seek_slider_change(42)
+    assert output == ("Jumped to timestep 42", 42)
+
+
+def test_playback_controls(mocker):
+    """Test that the playback is paused, resumed, sped up and jumped."""
+    playback = mocker.patch("app.pages.control.PLAYBACK")
+    stop_button_click(0)
+    playback.pause.assert_called_once()
+    start_button_click(0)
+    playback.play.assert_called_once()
+    assert speed_dropdown_change(60) == ["Playback speed set to 60×"]
+    playback.set_speed.assert_called_once_with(60)
+    seek_slider_change(42)
+    playback.seek.assert_called_once_with(42)
+    update_data_interval(2)
+    playback.set_interval.assert_called_once_with(2)
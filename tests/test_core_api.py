@@ -0,0 +1,41 @@
+import pytest
+import requests
+
+from app import core_api as core
+
+
+def test_wait_for_ove_backoff(mocker):
+    """Test that polling backs off exponentially until OVE is ready."""
+    not_ready = mocker.Mock(status_code=503)
+    ready = mocker.Mock(status_code=requests.codes.OK)
+    mocker.patch(
+        "app.core_api.requests.get",
+        side_effect=[requests.exceptions.ConnectionError(), not_ready, ready],
+    )
+    patched_sleep = mocker.patch("app.core_api.time.sleep")
+    core.wait_for_ove(initial_delay=1, max_delay=8)
+    assert [c.args[0] for c in patched_sleep.call_args_list] == [1, 2]
+
+
+def test_wait_for_ove_timeout(mocker):
+    """Test that waiting gives up once the deadline has passed."""
+    mocker.patch(
+        "app.core_api.requests.get", side_effect=requests.exceptions.ConnectionError()
+    )
+    mocker.patch("app.core_api.time.sleep")
+    mocker.patch("app.core_api.time.monotonic", side_effect=[0, 5, 11])
+    with pytest.raises(core.OVETimeoutError):
+        core.wait_for_ove(timeout=10)
+
+
+def test_create_all(mocker):
+    """Test that a section is created for every initial section."""
+    mocker.patch("app.core_api.wait_for_ove")
+    spaces = {
+        space: [{"x": 0, "y": 0, "w": 1, "h": 1}]
+        for space in {str(s["space"]) for s in core.INIT_SECTIONS.values()}
+    }
+    mocker.patch("app.core_api.requests.get").return_value.json.return_value = spaces
+    patched_post = mocker.patch("app.core_api.requests.post")
+    core.create_all()
+    assert patched_post.call_count == len(core.INIT_SECTIONS)
@@ -0,0 +1,24 @@
+import pandas as pd
+import pytest
+
+from app.data import compact_opal
+
+
+def test_compact_opal():
+    """Test that counts become compact integers and measurements float32."""
+    df = pd.DataFrame(
+        {
+            "Time": pd.to_datetime(["2035-01-22 04:00", "2035-01-22 04:01"]),
+            "Household Activity (Work)": [10, 20],
+            "Ev Status (Idle)": [1.0, None],
+            "System Frequency": [50.01, 49.99],
+        }
+    )
+    compact = compact_opal(df)
+    assert compact.dtypes.astype(str).tolist() == [
+        "datetime64[ns]",
+        "uint16",
+        "float32",
+        "float32",
+    ]
+    assert compact["System Frequency"].iloc[0] == pytest.approx(50.01)
@@ -0,0 +1,25 @@
+import pandas as pd
+
+from app import datahub_api
+from benchmarks.datahub import DataHubStub
+from benchmarks.scenario import generate_opal
+
+
+def test_datahub_stand_in(mocker):
+    """Test that the app reads the OPAL and WESIM data of the stand-in."""
+    with DataHubStub(generate_opal(timesteps=10)) as datahub:
+        mocker.patch("app.datahub_api.DH_URL", datahub.url)
+        opal = pd.DataFrame(**datahub_api.get_opal_data())
+        assert opal.shape == (10, 55)
+        assert len(datahub_api.get_opal_data(start=2, end=5)["data"]) == 3
+        assert set(datahub_api.get_wesim_data()) == {"Regions", "Capacity"}
+        assert datahub_api.stop_model() == "Model stopped"
+        assert datahub_api.start_model() == "Model started"
+
+
+def test_datahub_stand_in_ticks(mocker):
+    """Test that the model of the stand-in produces one row per tick."""
+    with DataHubStub(generate_opal(timesteps=10), tick=2) as datahub:
+        datahub.started = 0
+        mocker.patch("benchmarks.datahub.time.monotonic", return_value=5)
+        assert datahub.rows == 3
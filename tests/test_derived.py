@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from app.derived import DerivedColumns, column
+
+
+def opal(rows: int, offset: float = 0.0) -> pd.DataFrame:
+    """OPAL-like frame with the inputs of the derived columns."""
+    values = np.arange(rows, dtype="float32") + offset
+    return pd.DataFrame(
+        {
+            "Time": pd.date_range("2035-01-22 04:00", periods=rows, freq="min"),
+            "Total Generation": values,
+            "Total Demand": values,
+            "Exp. Offshore Wind Generation": 2 * values,
+            "Real Offshore Wind Generation": values,
+            "Expected Gridlington Demand": values,
+            "Real Gridlington Demand": values,
+            "Expected Ev Charging Power": values,
+            "Real Ev Charging Power": values,
+        }
+    )
+
+
+def test_extend_computes_new_rows(mocker):
+    """Test that only the new rows are computed and the raw columns are shared."""
+    derived = DerivedColumns()
+    derived.extend(opal(3))
+    spy = mocker.patch.dict(
+        "app.derived.DERIVED",
+        {"Energy Deficit": lambda df: df.iloc[:, 1] * 0 + len(df)},
+    )
+    df = opal(5)
+    extended = derived.extend(df)
+    assert spy["Energy Deficit"] is not None
+    assert extended["Energy Deficit"].tolist() == [0, 1, 2, 2, 2]
+    assert np.shares_memory(
+        extended["Real Ev Charging Power"].to_numpy(),
+        df["Real Ev Charging Power"].to_numpy(),
+    )
+
+
+def test_extend_restarts_on_fewer_rows():
+    """Test that data with fewer rows is computed again from the start."""
+    derived = DerivedColumns()
+    derived.extend(opal(5))
+    extended = derived.extend(opal(2, offset=10))
+    assert extended["Energy Deficit"].tolist() == [10, 11]
+
+
+def test_column_fallback():
+    """Test that derived columns are computed for data without them."""
+    assert column(opal(2), "Energy Deficit").tolist() == [0, 1]
+    assert column(DerivedColumns().extend(opal(2)), "Ev Demand Delta").tolist() == [
+        0,
+        0,
+    ]
+    assert DerivedColumns().extend(pd.DataFrame({"Col": [0]})).columns == ["Col"]
+
+
+def test_rolling_columns_match_pandas():
+    """Test that the streamed aggregates equal pandas rolling over the history."""
+    from app.derived import ROLLING
+
+    df = opal(40).assign(
+        **{
+            "Total Generation": np.sin(np.arange(40)).astype("float32"),
+            "Total Demand": np.cos(np.arange(40)).astype("float32"),
+        }
+    )
+    derived = DerivedColumns()
+    derived.extend(df.iloc[:25])
+    extended = derived.extend(df)
+    for name, func in ROLLING.items():
+        np.testing.assert_allclose(extended[name], func(df), rtol=1e-6)
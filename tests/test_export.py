@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+
+from app.archive import ArchiveWriter
+
+
+@pytest.fixture
+def client(mocker):
+    """Test client of the app with some OPAL data."""
+    from app.app import server
+
+    df = pd.DataFrame(
+        {
+            "Time": pd.date_range("2035-01-22 04:00", periods=5, freq="min"),
+            "Total Demand": [1.0, 2.0, 3.0, 4.0, 5.0],
+            "Total Generation": [5.0, 4.0, 3.0, 2.0, 1.0],
+        }
+    )
+    mocker.patch("app.data.DF_OPAL", df)
+    mocker.patch("app.export.EXPORT_CHUNK_ROWS", 2)
+    return server.test_client()
+
+
+def test_export_csv(client):
+    """Test that a selection of the OPAL data is exported as CSV."""
+    response = client.get(
+        "/export/opal?columns=Time,Total Demand"
+        "&start=2035-01-22 04:01&end=2035-01-22 04:03"
+    )
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.get_data(as_text=True).splitlines() == [
+        "Time,Total Demand",
+        "2035-01-22 04:01:00,2.0",
+        "2035-01-22 04:02:00,3.0",
+        "2035-01-22 04:03:00,4.0",
+    ]
+
+
+def test_export_archived_run(client, mocker, tmp_path):
+    """Test that an archived run is exported in chunks."""
+    from app.data import DF_OPAL
+
+    ArchiveWriter(tmp_path / "run").write(DF_OPAL)
+    mocker.patch("app.export.ARCHIVE_DIR", tmp_path)
+    response = client.get("/export/opal?run=run&columns=Total Generation")
+    assert response.get_data(as_text=True).splitlines() == [
+        "Total Generation",
+        "5.0",
+        "4.0",
+        "3.0",
+        "2.0",
+        "1.0",
+    ]
+    assert client.get("/export/opal?run=../run").status_code == 404
+
+
+@pytest.mark.parametrize(
+    "query,status",
+    [
+        ("opal?columns=Nope", 400),
+        ("opal?format=xlsx", 400),
+        ("opal?start=soon", 400),
+        ("dsr", 404),
+        ("other", 404),
+    ],
+)
+def test_export_errors(client, query, status):
+    """Test that bad requests are rejected before streaming."""
+    assert client.get(f"/export/{query}").status_code == status
+
+
+def test_export_parquet_requires_pyarrow(client, mocker):
+    """Test that Parquet exports are refused without pyarrow."""
+    mocker.patch("app.export.find_spec", return_value=None)
+    assert client.get("/export/opal?format=parquet").status_code == 501
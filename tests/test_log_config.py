@@ -0,0 +1,30 @@
+import logging
+
+from app.log_config import RateLimitFilter
+
+
+def make_record(level=logging.DEBUG, lineno=1):
+    """Make a record logged from a given line."""
+    return logging.LogRecord("test", level, "test.py", lineno, "tick %d", (1,), None)
+
+
+def test_rate_limit_filter(mocker):
+    """Test that records from a call site are limited to one per interval."""
+    mocker.patch("app.log_config.time.monotonic", side_effect=[0, 1, 2, 11])
+    rate_limit = RateLimitFilter(interval=10)
+    assert rate_limit.filter(make_record())
+    assert not rate_limit.filter(make_record())
+    assert not rate_limit.filter(make_record())
+
+    record = make_record()
+    assert rate_limit.filter(record)
+    assert record.getMessage() == "tick 1 (2 similar messages dropped)"
+
+
+def test_rate_limit_filter_levels_and_sites(mocker):
+    """Test that warnings and other call sites are not limited."""
+    mocker.patch("app.log_config.time.monotonic", return_value=0)
+    rate_limit = RateLimitFilter(interval=10)
+    assert rate_limit.filter(make_record())
+    assert rate_limit.filter(make_record(lineno=2))
+    assert rate_limit.filter(make_record(level=logging.WARNING))
@@ -0,0 +1,57 @@
+from app import metrics
+from app.app import server
+
+
+def test_histogram_render():
+    """Test that observations are counted in cumulative buckets."""
+    histogram = metrics.Histogram("test_seconds", "Test histogram.", (0.1, 1))
+    metrics.REGISTRY.remove(histogram)
+    histogram.observe(0.05, page="map")
+    histogram.observe(0.5, page="map")
+    histogram.observe(5, page="map")
+    assert histogram.render().splitlines() == [
+        "# HELP test_seconds Test histogram.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{page="map",le="0.1"} 1',
+        'test_seconds_bucket{page="map",le="1"} 2',
+        'test_seconds_bucket{page="map",le="+Inf"} 3',
+        'test_seconds_sum{page="map"} 5.55',
+        'test_seconds_count{page="map"} 3',
+    ]
+
+
+def test_timed_callback(mocker):
+    """Test that page callbacks record their duration and the tick lag."""
+    mocker.patch("app.data.N_INTERVALS_DATA", 3)
+    mocker.patch("app.data.TICK_TIME", 0.0)
+    patched_duration = mocker.patch.object(metrics.CALLBACK_DURATION, "observe")
+    patched_lag = mocker.patch.object(metrics.TICK_LAG, "observe")
+    callback = metrics.timed_callback("test")(lambda n: n * 2)
+    assert callback(3) == 6
+    assert patched_duration.call_args.kwargs == {"callback": "test"}
+    assert patched_lag.call_args.kwargs == {"callback": "test"}
+
+
+def test_metrics_endpoint():
+    """Test that the metrics endpoint serves all metrics as text."""
+    response = server.test_client().get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    text = response.get_data(as_text=True)
+    assert "# TYPE vis_callback_duration_seconds histogram" in text
+    assert "process_cpu_seconds_total" in text
+
+
+def test_counter_render():
+    """Test that events are counted per series."""
+    counter = metrics.Counter("test_total", "Test counter.")
+    metrics.REGISTRY.remove(counter)
+    counter.inc(client="a")
+    counter.inc(2, client="a")
+    counter.inc(client="b")
+    assert counter.render().splitlines() == [
+        "# HELP test_total Test counter.",
+        "# TYPE test_total counter",
+        'test_total{client="a"} 3',
+        'test_total{client="b"} 1',
+    ]
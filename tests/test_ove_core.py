@@ -0,0 +1,42 @@
+import pytest
+
+from app import core_api as core
+from benchmarks.ove_core import OVECoreStub
+
+
+@pytest.fixture
+def ove(mocker):
+    """OVE Core stand-in with core_api pointed at it."""
+    with OVECoreStub() as stub:
+        mocker.patch("app.core_api.API_URL", stub.url)
+        yield stub
+
+
+def test_create_and_assign_sections(ove):
+    """Test creating the initial sections and assigning a new view."""
+    core.create_all(timeout=1)
+    assert len(ove.sections) == len(core.INIT_SECTIONS)
+
+    new_sections = {str(s["space"]): name for name, s in core.INIT_SECTIONS.items()} | {
+        "Hub01": "Agent"
+    }
+    assert core.assign_sections(new_sections) == "Sections updated successfully!"
+    hub01 = next(s for s in ove.sections.values() if s["space"] == "Hub01")
+    assert hub01["app"] == core.INIT_SECTIONS["Agent"]["app"]
+
+
+def test_swap_sections(ove):
+    """Test swapping the spaces of two sections."""
+    core.create_all(timeout=1)
+    space_a, space_b = ove.sections[1]["space"], ove.sections[2]["space"]
+    core.swap_sections(1, 2)
+    assert (ove.sections[1]["space"], ove.sections[2]["space"]) == (space_b, space_a)
+
+
+def test_failure_injection(ove):
+    """Test that injected failures are reported by core_api."""
+    ove.failure_rate = 1.0
+    assert (
+        core.assign_sections({})
+        == "Unable to get OVE Sections. Might need to restart the OVE back-end."
+    )
@@ -0,0 +1,29 @@
+import dash  # type: ignore
+import pytest
+from dash import dcc  # type: ignore
+
+import app.app  # noqa: F401
+
+
+def graphs(component):
+    """Recursively find all graphs in a layout."""
+    if isinstance(component, dcc.Graph):
+        yield component
+    children = getattr(component, "children", None)
+    if isinstance(children, list):
+        for child in children:
+            yield from graphs(child)
+    elif children is not None:
+        yield from graphs(children)
+
+
+@pytest.mark.parametrize(
+    "module", ["agent", "map", "market", "marketsreserve", "supplydemand"]
+)
+def test_layout_is_empty_skeleton(module):
+    """Test that figure pages build their layout without any figures."""
+    page = dash.page_registry[f"app.pages.{module}"]
+    assert callable(page["layout"])
+    page_graphs = list(graphs(page["layout"]()))
+    assert page_graphs
+    assert all(getattr(graph, "figure", None) is None for graph in page_graphs)
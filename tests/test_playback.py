@@ -0,0 +1,40 @@
+from app.playback import Playback
+
+
+def test_playback_follows_wall_clock(mocker):
+    """Test that the row advances with the wall clock times the speed."""
+    clock = mocker.patch("app.playback.time.monotonic", return_value=0.0)
+    playback = Playback(interval=2.0)
+    assert playback.advance(1000) == 0
+
+    clock.return_value = 2.1
+    assert playback.advance(1000) == 1
+
+    # A late update skips the rows in between
+    clock.return_value = 8.0
+    assert playback.advance(1000) == 4
+
+    playback.set_speed(60)
+    clock.return_value = 10.0
+    assert playback.advance(1000) == 64
+
+
+def test_playback_pause_and_seek(mocker):
+    """Test that the position holds while paused and jumps on a seek."""
+    clock = mocker.patch("app.playback.time.monotonic", return_value=0.0)
+    playback = Playback(interval=1.0)
+    playback.advance(100)
+
+    clock.return_value = 5.0
+    playback.pause()
+    clock.return_value = 50.0
+    assert playback.advance(100) == 5
+
+    playback.play()
+    clock.return_value = 52.0
+    assert playback.advance(100) == 7
+
+    playback.seek(90)
+    clock.return_value = 70.0
+    assert playback.advance(100) == 99
+    assert not playback.playing
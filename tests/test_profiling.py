@@ -0,0 +1,17 @@
+import pstats
+
+from app import profiling
+
+
+def test_profiled(mocker, tmp_path):
+    """Test that only the armed number of invocations are profiled."""
+    mocker.patch("app.profiling.PROFILE_DIR", tmp_path)
+    callback = profiling.profiled("test")(lambda n: n + 1)
+    assert callback(1) == 2
+    assert not list(tmp_path.iterdir())
+
+    profiling.arm(2)
+    assert [callback(n) for n in range(3)] == [1, 2, 3]
+    profiles = list(tmp_path.glob("profile_test_*.prof"))
+    assert len(profiles) == 2
+    assert pstats.Stats(str(profiles[0])).total_calls > 0
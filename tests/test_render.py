@@ -0,0 +1,57 @@
+import plotly.graph_objects as go  # type: ignore
+import pytest
+
+from app.render import RenderCache
+
+
+def titled(data):
+    """Figure titled with the data, rendered by the pool."""
+    return go.Figure(layout={"title": {"text": data}})
+
+
+def test_figure_rendered_once_per_version(mocker):
+    """Test that each version of a figure is only rendered once."""
+    cache = RenderCache(workers=0)
+    func = mocker.Mock(side_effect=lambda data: f"figure of {data}")
+
+    assert cache.figure(func, "a", "v1") == "figure of a"
+    assert cache.figure(func, "a", "v1") == "figure of a"
+    assert cache.figure(func, "b", "v2") == "figure of b"
+    assert func.call_count == 2
+
+
+def test_submit_renders_in_background():
+    """Test that submitted figures are rendered by the pool as plotly JSON."""
+    cache = RenderCache(workers=1)
+    cache.submit(titled, "a", "v1")
+    future = cache._entries[titled][2]
+    cache.submit(titled, "a", "v1")
+    assert cache._entries[titled][2] is future
+
+    figure = cache.figure(titled, "a", "v1")
+    assert figure["layout"]["title"]["text"] == "a"
+    assert go.Figure(figure) == titled("a")
+
+
+def test_submit_min_interval(mocker):
+    """Test that a figure is not rendered in the background too often."""
+    clock = mocker.patch("app.render.time.monotonic", return_value=0.0)
+    cache = RenderCache(workers=1)
+    cache.submit(titled, "a", "v1", min_interval=5)
+    cache.figure(titled, "a", "v1")
+
+    clock.return_value = 1.0
+    cache.submit(titled, "b", "v2", min_interval=5)
+    assert cache._entries[titled][0] == "v1"
+
+    clock.return_value = 5.0
+    cache.submit(titled, "b", "v2", min_interval=5)
+    assert cache.figure(titled, "b", "v2")["layout"]["title"]["text"] == "b"
+
+
+def test_figure_error(mocker):
+    """Test that an error rendering a figure is raised to the callback."""
+    cache = RenderCache(workers=0)
+    func = mocker.Mock(side_effect=ValueError("no data"))
+    with pytest.raises(ValueError, match="no data"):
+        cache.figure(func, "a", "v1")
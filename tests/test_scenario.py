@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+
+from benchmarks import scenario
+
+
+def test_generate_opal():
+    """Test that every agent and EV has exactly one activity or status."""
+    opal = scenario.generate_opal(agents=100, timesteps=30, resolution=5, evs=10)
+    activities = opal.filter(like="Household Activity").sum(axis=1)
+    statuses = opal.filter(like="Ev Status").sum(axis=1)
+    assert (activities == 100).all()
+    assert (statuses == 10).all()
+    assert opal["Time"].iloc[-1] == 145
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_write_is_read_by_pre_set_data(tmp_path, mocker, binary):
+    """Test that both formats are read back as the same pre-set data."""
+    from app.pre_set_data import read_opal_data
+
+    mocker.patch("app.pre_set_data.get_opal_data", side_effect=ConnectionError)
+    mocker.patch("app.pre_set_data.DataHubConnectionError", ConnectionError)
+    scenario.write(tmp_path, agents=100, timesteps=20, binary=binary)
+    opal = read_opal_data(tmp_path / ("opal.pkl" if binary else "opal"))
+    assert opal.shape == (20, 55)
+    assert opal["Time"].iloc[1] == pd.Timestamp("2035-01-22 04:01:00")
+    assert (tmp_path / "wesim.json").exists()
@@ -0,0 +1,86 @@
+import dash  # type: ignore
+import pandas as pd
+
+from app.scheduler import Refresh, Schedule
+
+
+def opal(rows):
+    """OPAL data with some rows and a constant count."""
+    return pd.DataFrame(
+        {
+            "Time": pd.date_range("2035-01-22 04:00", periods=rows, freq="min"),
+            "Total Demand": range(rows),
+            "Ev Status (Idle)": [3] * rows,
+        }
+    )
+
+
+def schedule(mocker, **kwargs):
+    """Schedule of a time series, a latest value and a WESIM figure."""
+    mocker.patch("app.data.WESIM", {"Regions": pd.DataFrame({"Code": ["Total"]})})
+    return Schedule(
+        "test",
+        Refresh(mocker.Mock(__name__="series"), columns=("Time", "Total"), **kwargs),
+        Refresh(mocker.Mock(__name__="latest"), columns=("Ev Status",), history=False),
+        Refresh(mocker.Mock(__name__="weather"), source="wesim"),
+    )
+
+
+def test_update_unchanged_inputs(mocker):
+    """Test that figures are only refreshed when their inputs change."""
+    mocker.patch("app.data.DF_OPAL", opal(2))
+    sched = schedule(mocker)
+
+    figures, refreshed = sched.update(None)
+    assert dash.no_update not in figures
+    assert set(refreshed) == {"series", "latest", "weather"}
+
+    figures, unchanged = sched.update(refreshed)
+    assert figures == [dash.no_update] * 3
+    assert unchanged is dash.no_update
+
+    mocker.patch("app.data.DF_OPAL", opal(3))
+    figures, new = sched.update(refreshed)
+    assert figures[0] is not dash.no_update
+    assert figures[1:] == [dash.no_update] * 2
+    assert new["series"] != refreshed["series"]
+    assert new["latest"] == refreshed["latest"]
+    for refresh in sched.refreshes:
+        assert refresh.func.call_count == (2 if refresh.name == "series" else 1)
+
+
+def test_update_is_per_client(mocker):
+    """Test that a new client is sent every figure."""
+    mocker.patch("app.data.DF_OPAL", opal(2))
+    sched = schedule(mocker)
+    sched.update(None)
+
+    figures, _ = sched.update({})
+    assert dash.no_update not in figures
+
+
+def test_update_rate_limit(mocker):
+    """Test that a rate limited figure is refreshed at most once per interval."""
+    mocker.patch("app.data.DF_OPAL", opal(2))
+    clock = mocker.patch("app.scheduler.time.time", return_value=100.0)
+    sched = schedule(mocker, min_interval=5)
+    _, refreshed = sched.update(None)
+
+    mocker.patch("app.data.DF_OPAL", opal(3))
+    clock.return_value = 102.0
+    figures, _ = sched.update(refreshed)
+    assert figures[0] is dash.no_update
+
+    clock.return_value = 105.0
+    figures, refreshed = sched.update(refreshed)
+    assert figures[0] is not dash.no_update
+    assert refreshed["series"][1] == 105.0
+
+
+def test_components(mocker):
+    """Test that the refresh interval is only added for rate limited figures."""
+    assert len(schedule(mocker).components()) == 1
+    store, interval = schedule(mocker, min_interval=5).components()
+    assert store.id == "test-refreshed"
+    assert interval.id == "test-refresh-interval"
+    assert interval.interval == 5000
@@ -0,0 +1,17 @@
+from app.schema import get_schema, power_sources
+
+
+def test_get_schema():
+    """Test that the column groups are found once per set of columns."""
+    import pandas as pd
+
+    df = pd.DataFrame(
+        [[0, 1, 2, 3]],
+        columns=["Time", "Ev Status (Idle)", "Household Activity (Work)", "X"],
+    ).assign(**{source: 1.0 for source in power_sources})
+    schema = get_schema(df)
+    assert get_schema(df.copy()) is schema
+    assert schema.ev_statuses.labels == ["Idle"]
+    assert schema.household_activities.names == ["Household Activity (Work)"]
+    assert schema.household_activities.last(df) == [2]
+    assert schema.power_sources.last(df) == [1.0] * len(power_sources)
@@ -0,0 +1,36 @@
+from app.svg import CACHE_CONTROL, SVG, load_svg
+
+
+def test_static_url():
+    """Test that an SVG is published at a URL named by the hash of its content."""
+    svg = SVG('<svg width="10px" height="10px" ></svg>')
+    same = SVG('<svg width="10px" height="10px" ></svg>')
+    other = SVG('<svg width="20px" height="10px" ></svg>')
+
+    assert svg.static_url == same.static_url == f"/svg/{svg.digest}.svg"
+    assert other.static_url != svg.static_url
+
+
+def test_svg_endpoint():
+    """Test that published SVGs are served with long-lived cache headers."""
+    from app.app import server
+
+    client = server.test_client()
+    background = load_svg("map")
+    response = client.get(background.static_url)
+    assert response.status_code == 200
+    assert response.mimetype == "image/svg+xml"
+    assert response.headers["Cache-Control"] == CACHE_CONTROL
+    assert response.get_data(as_text=True) == background.raw
+
+    assert client.get("/svg/unknown.svg").status_code == 404
+
+
+def test_map_fig_references_background(mocker):
+    """Test that the map figure references the background instead of inlining it."""
+    from app.figures import generate_map_fig
+
+    fig = generate_map_fig.__wrapped__(mocker.MagicMock())
+    sources = [image.source for image in fig.layout.images]
+    assert sources[0] == load_svg("map").static_url
+    assert all(source.startswith("data:") for source in sources[1:])